@@ -0,0 +1,340 @@
+# benchmarks/mock_server.py
+"""
+Local stand-in for the Geoapify and Foursquare APIs, for offline benchmarks.
+
+Responses are built from the recorded samples in benchmarks/fixtures: Places pages are that
+sample repeated at deterministic positions inside the requested circle, routes are
+interpolated between the waypoints, and the rest are replayed as recorded. Every request can
+be delayed and can fail at a configurable rate (HTTP 500, or 429 with Retry-After).
+
+Point the app at it with GEOAPIFY_BASE_URL / FOURSQUARE_BASE_URL (see MockServer.env()).
+"""
+import argparse
+import copy
+import json
+import math
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+EARTH_RADIUS_M = 6371008.8
+
+
+def load_fixture(name: str) -> dict:
+    """Load one recorded response from the fixtures directory."""
+    with open(os.path.join(FIXTURES_DIR, f"{name}.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def offset_point(lat: float, lon: float, distance_m: float, bearing: float) -> tuple:
+    """Point distance_m away from (lat, lon) on the given bearing (radians), flat-earth approximation."""
+    dlat = distance_m * math.cos(bearing) / EARTH_RADIUS_M
+    dlon = distance_m * math.sin(bearing) / (EARTH_RADIUS_M * math.cos(math.radians(lat)))
+    return lat + math.degrees(dlat), lon + math.degrees(dlon)
+
+
+def flat_distance(a: tuple, b: tuple) -> float:
+    """Approximate distance in meters between two nearby (lat, lon) points."""
+    x = math.radians(b[1] - a[1]) * math.cos(math.radians((a[0] + b[0]) / 2))
+    y = math.radians(b[0] - a[0])
+    return math.hypot(x, y) * EARTH_RADIUS_M
+
+
+class MockState:
+    """Settings and counters shared by all request handlers."""
+
+    def __init__(self, latency_ms: float = 50.0, jitter_ms: float = 10.0, error_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0, places_available: int = 200, route_points: int = 400,
+                 seed: int = 42) -> None:
+        """
+        Args:
+            latency_ms (float): Mean delay added to every response.
+            jitter_ms (float): Uniform +/- variation of that delay.
+            error_rate (float): Fraction of requests answered with HTTP 500.
+            rate_limit_rate (float): Fraction of requests answered with 429 + Retry-After.
+            places_available (int): Places that exist around any search center (per category).
+            route_points (int): Points in each synthesized route geometry.
+            seed (int): Seed for latency/errors (places are deterministic regardless).
+        """
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.places_available = places_available
+        self.route_points = route_points
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = {}  # path -> count
+        self.area_venues = None  # [(name, lat, lon, kind)] served by Foursquare area searches; None = synthesized
+
+        self.fixtures = {name: load_fixture(name) for name in
+                         ("geocode", "place", "routing", "ipinfo", "fsq_search", "fsq_details")}
+
+    def count(self, path: str) -> None:
+        with self.lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+
+    def draw(self) -> tuple:
+        """Pick this request's delay (seconds) and outcome ("ok", "error" or "rate_limited")."""
+        with self.lock:
+            delay = max(0.0, self.latency_ms + self.random.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+            roll = self.random.random()
+        if roll < self.error_rate:
+            return delay, "error"
+        if roll < self.error_rate + self.rate_limit_rate:
+            return delay, "rate_limited"
+        return delay, "ok"
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    """Routes requests by path to the recorded responses."""
+
+    server_version = "MockGeoAPI/1.0"
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real APIs
+
+    def log_message(self, format, *args) -> None:
+        pass  # Keep benchmark output clean
+
+    @property
+    def state(self) -> MockState:
+        return self.server.state
+
+    def do_GET(self) -> None:
+        self._handle()
+
+    def do_POST(self) -> None:
+        self._handle()
+
+    def _handle(self) -> None:
+        parsed = urlparse(self.path)
+        params = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        self.state.count(parsed.path)
+
+        delay, outcome = self.state.draw()
+        time.sleep(delay)
+        if outcome == "error":
+            return self._send(500, {"error": "Internal Server Error", "message": "Injected failure"})
+        if outcome == "rate_limited":
+            return self._send(429, {"error": "Too Many Requests"}, {"Retry-After": "1"})
+
+        path = parsed.path.rstrip("/")
+        try:
+            if path == "/v1/geocode/search":
+                payload = self.state.fixtures["geocode"]
+            elif path == "/v2/places":
+                payload = self._places(params)
+            elif path == "/v1/routing":
+                payload = self._routing(params)
+            elif path == "/v1/routematrix":
+                payload = self._routematrix(body or {})
+            elif path == "/v1/ipinfo":
+                payload = self.state.fixtures["ipinfo"]
+            elif path == "/v3/places/search" and ("radius" in params or "cursor" in params):
+                payload, headers = self._fsq_area(params)
+                return self._send(200, payload, headers)
+            elif path == "/v3/places/search":
+                payload = self.state.fixtures["fsq_search"]
+            elif path.startswith("/v3/places/"):
+                payload = self.state.fixtures["fsq_details"]
+            else:
+                return self._send(404, {"error": "Not Found"})
+        except (KeyError, ValueError) as e:
+            return self._send(400, {"error": "Bad Request", "message": str(e)})
+        self._send(200, payload)
+
+    def _send(self, status: int, payload: dict, headers: dict | None = None) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _places(self, params: dict) -> dict:
+        """A page of places at deterministic positions inside the requested circle, nearest first."""
+        kind, _, values = params["filter"].partition(":")
+        numbers = [float(v) for v in values.split(",")]
+        if kind == "circle":
+            lon, lat, radius = numbers
+        else:  # rect:lon1,lat1,lon2,lat2
+            lon, lat = (numbers[0] + numbers[2]) / 2, (numbers[1] + numbers[3]) / 2
+            radius = flat_distance((numbers[1], numbers[0]), (numbers[3], numbers[2])) / 2
+
+        category = params.get("categories", "unknown")
+        places = random.Random(f"{category}|{lat:.4f}|{lon:.4f}|{radius:.0f}")
+        template = self.state.fixtures["place"]
+        features = []
+        for i in range(self.state.places_available):
+            distance = radius * math.sqrt(places.random())
+            p_lat, p_lon = offset_point(lat, lon, distance, places.uniform(0, 2 * math.pi))
+            feature = copy.deepcopy(template)
+            properties = feature["properties"]
+            properties.update({
+                "name": f"{category.rsplit('.', 1)[-1].title()} {i + 1}",
+                "lat": p_lat,
+                "lon": p_lon,
+                "distance": round(distance),
+                "categories": [category.split(".")[0], category],
+                "place_id": f"mock-{category}-{lat:.4f}-{lon:.4f}-{i}",
+            })
+            feature["geometry"]["coordinates"] = [p_lon, p_lat]
+            features.append(feature)
+
+        features.sort(key=lambda f: f["properties"]["distance"])
+        offset = int(params.get("offset", 0))
+        limit = int(params.get("limit", 20))
+        return {"type": "FeatureCollection", "features": features[offset:offset + limit]}
+
+    def _fsq_area(self, params: dict) -> tuple:
+        """
+        A page of rated venues around "ll", nearest first, with a cursor Link header while more remain.
+
+        A "query" keeps only the listed venues whose kind contains it, as Foursquare matches it
+        against venue categories.
+        """
+        if "cursor" in params:
+            lat, lon, radius, offset, query = params["cursor"].split(":", 4)
+            lat, lon, radius, offset = float(lat), float(lon), float(radius), int(offset)
+        else:
+            lat, lon = (float(v) for v in params["ll"].split(","))
+            radius, offset, query = float(params.get("radius", 1000)), 0, params.get("query", "")
+        limit = int(params.get("limit", 10))
+
+        venues = random.Random(f"fsq|{lat:.4f}|{lon:.4f}|{radius:.0f}")
+        listed = self.state.area_venues
+        if listed is None:
+            listed = []
+            for i in range(self.state.places_available):
+                v_lat, v_lon = offset_point(lat, lon, radius * math.sqrt(venues.random()), venues.uniform(0, 2 * math.pi))
+                listed.append((f"Venue {i + 1}", v_lat, v_lon, query))
+
+        template = self.state.fixtures["fsq_search"]["results"][0]
+        results = []
+        for i, (name, v_lat, v_lon, kind) in enumerate(listed):
+            distance = flat_distance((lat, lon), (v_lat, v_lon))
+            if distance > radius or query.casefold() not in kind.casefold():
+                continue
+            venue = copy.deepcopy(template)
+            venue.update({"fsq_id": f"mock-fsq-{i}", "name": name, "distance": round(distance),
+                          "rating": round(5 + 5 * venues.random(), 1),
+                          "geocodes": {"main": {"latitude": v_lat, "longitude": v_lon}}})
+            results.append(venue)
+        results.sort(key=lambda venue: venue["distance"])
+
+        headers = {}
+        if offset + limit < len(results):
+            host, port = self.server.server_address[:2]
+            cursor = f"{lat}:{lon}:{radius}:{offset + limit}:{quote(query)}"
+            headers["Link"] = f'<http://{host}:{port}/v3/places/search?cursor={cursor}&limit={limit}>; rel="next"'
+        return {"results": results[offset:offset + limit]}, headers
+
+    def _routing(self, params: dict) -> dict:
+        """The recorded route, with geometry interpolated (with a small zigzag) between the waypoints."""
+        (lat1, lon1), (lat2, lon2) = [tuple(float(v) for v in point.split(","))
+                                      for point in params["waypoints"].split("|")[:2]]
+        count = max(2, self.state.route_points)
+        coordinates = []
+        for i in range(count):
+            t = i / (count - 1)
+            wiggle = 0.00005 * math.sin(i / 3) if 0 < i < count - 1 else 0.0
+            coordinates.append([lon1 + (lon2 - lon1) * t + wiggle, lat1 + (lat2 - lat1) * t + wiggle])
+
+        route = copy.deepcopy(self.state.fixtures["routing"])
+        feature = route["features"][0]
+        feature["geometry"]["coordinates"] = [coordinates]
+
+        distance = flat_distance((lat1, lon1), (lat2, lon2)) * 1.3
+        speed = 8.3 if params.get("mode") == "drive" else 1.4
+        properties = feature["properties"]
+        properties.update({"mode": params.get("mode", "walk"), "distance": distance, "time": distance / speed})
+        steps = properties["legs"][0]["steps"]
+        properties["legs"][0].update({"distance": distance, "time": distance / speed})
+        for j, step in enumerate(steps):
+            step["from_index"] = j * (count - 1) // len(steps)
+            step["to_index"] = (j + 1) * (count - 1) // len(steps)
+            step["distance"] = distance / len(steps)
+            step["time"] = distance / speed / len(steps)
+        return route
+
+    def _routematrix(self, body: dict) -> dict:
+        """Travel times estimated from straight-line distance (road factor 1.3)."""
+        speed = 8.3 if body.get("mode") == "drive" else 1.4
+        rows = []
+        for s, source in enumerate(body["sources"]):
+            s_lon, s_lat = source["location"]
+            row = []
+            for t, target in enumerate(body["targets"]):
+                t_lon, t_lat = target["location"]
+                distance = flat_distance((s_lat, s_lon), (t_lat, t_lon)) * 1.3
+                row.append({"distance": distance, "time": distance / speed, "source_index": s, "target_index": t})
+            rows.append(row)
+        return {"sources": body["sources"], "targets": body["targets"], "sources_to_targets": rows}
+
+
+class MockServer:
+    """Runs the mock API on a background thread. Use as a context manager."""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, **settings) -> None:
+        """
+        Args:
+            host (str): Interface to bind.
+            port (int): Port (0 picks a free one).
+            **settings: MockState settings (latency_ms, error_rate, ...).
+        """
+        self.httpd = ThreadingHTTPServer((host, port), MockHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.state = MockState(**settings)
+        self._thread = None
+
+    @property
+    def state(self) -> MockState:
+        return self.httpd.state
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def env(self) -> dict:
+        """Environment variables that point the app at this server."""
+        return {"GEOAPIFY_BASE_URL": self.url, "FOURSQUARE_BASE_URL": self.url}
+
+    def start(self) -> "MockServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="mock-api", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "MockServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve recorded Geoapify/Foursquare responses locally.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = MockServer(port=args.port, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                        error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate)
+    print(f"Mock API on {server.url}; run the app with:")
+    for key, value in server.env().items():
+        print(f"  export {key}={value}")
+    server.httpd.serve_forever()
@@ -0,0 +1,281 @@
+# benchmarks/run_benchmarks.py
+"""
+Offline benchmark suite: runs the app's hot paths against the local mock API.
+
+    python -m benchmarks.run_benchmarks                      # writes benchmarks/results/<timestamp>.json
+    python -m benchmarks.run_benchmarks --latency-ms 200 --error-rate 0.05
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/<earlier>.json
+
+Measures end-to-end search latency (geocode + paged Places search), parse_results throughput,
+rating enrichment fan-out, and results map rendering time and memory.
+"""
+import argparse
+import copy
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from benchmarks.mock_server import MockServer, load_fixture, offset_point
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+API_KEY = "0" * 32  # Passes validate_api_key; the mock server ignores it
+CENTER = (9.0579, 7.4951)  # Abuja
+
+
+def summarize(samples: list) -> dict:
+    """Latency statistics in milliseconds for a list of durations in seconds."""
+    ms = sorted(s * 1000 for s in samples)
+    return {
+        "n": len(ms),
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "p50_ms": round(ms[len(ms) // 2], 3),
+        "p95_ms": round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 3),
+        "min_ms": round(ms[0], 3),
+        "max_ms": round(ms[-1], 3),
+    }
+
+
+def synthetic_features(count: int) -> list:
+    """Places features around CENTER, built from the recorded sample (no server needed)."""
+    template = load_fixture("place")
+    features = []
+    for i in range(count):
+        lat, lon = offset_point(CENTER[0], CENTER[1], 50 + (i * 37) % 5000, i * 0.61)
+        feature = copy.deepcopy(template)
+        feature["properties"].update({"name": f"Place {i}", "place_id": f"synthetic-{i}", "lat": lat, "lon": lon})
+        feature["properties"].pop("distance", None)  # Exercise the vectorized fallback distances
+        feature["geometry"]["coordinates"] = [lon, lat]
+        features.append(feature)
+    return features
+
+
+def bench_search(server: MockServer, iterations: int, max_results: int, page_size: int) -> dict:
+    """Geocode an address and run a paged Places search, with every cache cold."""
+    from core.business_finder import BusinessFinder
+    from core.location_manager import LocationManager
+
+    finder = BusinessFinder(API_KEY)  # No Places cache: every search goes to the server
+    geocode_cache = LocationManager.get_cache()
+    samples, found, before = [], [], sum(server.state.requests.values())
+
+    for i in range(iterations):
+        geocode_cache.clear()
+        start = time.perf_counter()
+        location = LocationManager.geocode_address(f"Wuye, Abuja {i}", API_KEY)
+        origin = (location["lat"], location["lon"] + i * 0.001) if location else CENTER
+        businesses = finder.search_businesses(origin, "healthcare.pharmacy", radius=5000,
+                                              max_results=max_results, page_size=page_size)
+        finder.sort_by_distance(businesses)
+        samples.append(time.perf_counter() - start)
+        found.append(len(businesses))
+
+    return {
+        **summarize(samples),
+        "businesses_per_search": statistics.fmean(found) if found else 0,
+        "requests_per_search": (sum(server.state.requests.values()) - before) / max(1, iterations),
+    }
+
+
+def bench_parse(sizes: list, repeats: int) -> dict:
+    """parse_results throughput, per-object list versus columnar table."""
+    from core.business_finder import BusinessFinder
+
+    finder = BusinessFinder(API_KEY)
+    results = {}
+    for size in sizes:
+        data = {"features": synthetic_features(size)}
+        for label, as_table in (("list", False), ("table", True)):
+            samples = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                finder.parse_results(data, CENTER, as_table=as_table)
+                samples.append(time.perf_counter() - start)
+
+            tracemalloc.start()
+            parsed = finder.parse_results(data, CENTER, as_table=as_table)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del parsed
+
+            best = min(samples)
+            results[f"{label}_{size}"] = {
+                **summarize(samples),
+                "features_per_s": round(size / best) if best else None,
+                "peak_kib": round(peak / 1024, 1),
+            }
+    return results
+
+
+def bench_enrichment(server: MockServer, count: int, worker_counts: list) -> dict:
+    """
+    Rating enrichment of a result list, per business for several pool sizes and by area, with the rating cache cold.
+
+    The area also holds ten unrelated venues per business, as a real city does, so the area run only
+    stays at a request or two if its category query keeps them out of the listing.
+    """
+    from core.business import Business
+    from core.enrichment import AreaRatingEnricher, RatingEnricher
+
+    runs = [(f"workers_{workers}", RatingEnricher(API_KEY, max_workers=workers, timeout=10.0))
+            for workers in worker_counts]
+    runs.append(("area", AreaRatingEnricher(API_KEY, timeout=10.0)))
+
+    results = {}
+    for label, enricher in runs:
+        Business.get_rating_cache().clear()
+        businesses = [Business(f"Place {i}", "Abuja", offset_point(CENTER[0], CENTER[1], 100 * i, i), 100.0 * i,
+                               "healthcare.pharmacy", place_id=f"enrich-{label}-{i}") for i in range(count)]
+        # Area searches list every business as a venue, a few meters off and spelled differently
+        server.state.area_venues = [(f"{b.name} Ltd", *offset_point(b.latitude, b.longitude, 15, i), "pharmacy")
+                                    for i, b in enumerate(businesses)]
+        server.state.area_venues += [(f"Eatery {i}", *offset_point(CENTER[0], CENTER[1], (i * 13) % (100 * count), i * 0.37),
+                                      "restaurant") for i in range(10 * count)]
+        before = sum(server.state.requests.values())
+        start = time.perf_counter()
+        rated = enricher.enrich(businesses)
+        elapsed = time.perf_counter() - start
+        enricher.shutdown()
+        results[label] = {
+            "total_ms": round(elapsed * 1000, 3),
+            "per_business_ms": round(elapsed * 1000 / count, 3),
+            "requests": sum(server.state.requests.values()) - before,
+            "rated": rated,
+        }
+    server.state.area_venues = None
+    return results
+
+
+def bench_map(sizes: list) -> dict:
+    """Results map: cold render time, HTML size, peak memory, and cached render time."""
+    from core.business import Business
+    from core.map_renderer import MapRenderer
+
+    results = {}
+    for size in sizes:
+        renderer = MapRenderer()
+        businesses = [Business(f"Place {i}", "Abuja", offset_point(CENTER[0], CENTER[1], 20 + (i * 37) % 5000, i * 0.61),
+                               0.0, "healthcare.pharmacy") for i in range(size)]
+        tracemalloc.start()
+        start = time.perf_counter()
+        html = renderer.render_html(CENTER, businesses)
+        cold = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        renderer.render_html(CENTER, businesses)
+        cached = time.perf_counter() - start
+
+        results[f"businesses_{size}"] = {
+            "cold_ms": round(cold * 1000, 3),
+            "cached_ms": round(cached * 1000, 3),
+            "html_kib": round(len(html) / 1024, 1),
+            "peak_kib": round(peak / 1024, 1),
+        }
+    return results
+
+
+def git_revision() -> str | None:
+    """Current commit, so results can be matched to code."""
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True,
+                                       stderr=subprocess.DEVNULL).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def flatten(results: dict, prefix: str = "") -> dict:
+    """{"a": {"b": 1}} -> {"a.b": 1}, numbers only."""
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}.{key}" if prefix else key
+        if isinstance(value, dict):
+            flat.update(flatten(value, name))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(current: dict, previous_path: str) -> None:
+    """Print every metric next to the same metric from an earlier run."""
+    with open(previous_path, encoding="utf-8") as f:
+        previous = json.load(f)
+    old, new = flatten(previous["benchmarks"]), flatten(current["benchmarks"])
+    print(f"\nCompared with {previous_path} ({previous['meta'].get('git_revision')}):")
+    for name in sorted(new):
+        if name in old and old[name]:
+            change = (new[name] - old[name]) / old[name] * 100
+            print(f"  {name:<55} {old[name]:>12} -> {new[name]:>12}  ({change:+.1f}%)")
+
+
+def main(argv: list | None = None) -> dict:
+    parser = argparse.ArgumentParser(description="Offline benchmarks against a local mock Geoapify/Foursquare API.")
+    parser.add_argument("--iterations", type=int, default=10, help="End-to-end searches to time")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Mock server delay per request")
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests failing with HTTP 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of requests answered with 429")
+    parser.add_argument("--client-rate-limits", action="store_true",
+                        help="Keep the app's per-provider rate limits (off by default so app code is measured)")
+    parser.add_argument("--enrich-count", type=int, default=40, help="Businesses per enrichment run")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/<timestamp>.json)")
+    parser.add_argument("--compare", help="Earlier result file to compare against")
+    args = parser.parse_args(argv)
+
+    settings = {"latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "error_rate": args.error_rate,
+                "rate_limit_rate": args.rate_limit_rate}
+    with MockServer(**settings) as server, tempfile.TemporaryDirectory() as cache_dir:
+        # Must be set before the app modules are imported: endpoints are read from Config at import time
+        os.environ.update(server.env())
+        os.environ["BUSINESS_FINDER_CACHE"] = os.path.join(cache_dir, "bench.sqlite3")
+        if not args.client_rate_limits:
+            os.environ["GEOAPIFY_RATE_LIMIT"] = os.environ["FOURSQUARE_RATE_LIMIT"] = "100000"
+
+        benchmarks = {}
+        print("search_end_to_end ...")
+        benchmarks["search_end_to_end"] = bench_search(server, args.iterations, max_results=60, page_size=20)
+        print("parse_results ...")
+        benchmarks["parse_results"] = bench_parse([100, 1000, 10000], repeats=5)
+        print("enrichment ...")
+        benchmarks["enrichment"] = bench_enrichment(server, args.enrich_count, [1, 8, 16])
+        print("map_render ...")
+        benchmarks["map_render"] = bench_map([20, 200, 2000])
+        requests_served = dict(server.state.requests)
+
+        from config.metrics import get_metrics
+        client_metrics = get_metrics().to_json()
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "mock": settings,
+            "requests_served": requests_served,
+        },
+        "client_metrics": client_metrics,
+        "benchmarks": benchmarks,
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, datetime.now().strftime("%Y%m%d-%H%M%S") + ".json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    print(json.dumps(benchmarks, indent=2))
+    print(f"\nResults written to {output}")
+    if args.compare:
+        compare(results, args.compare)
+    return results
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,261 @@
+# config/cache.py
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Any, Callable
+
+from config.metrics import get_metrics
+
+
+# Sentinel returned by SQLiteTTLCache.get when nothing usable is stored for a key.
+# We can't use None because None is a perfectly valid cached value (e.g. "no results").
+MISS = object()
+
+
+def normalize_address(address: str) -> str:
+    """
+    Normalize a free-text address so that trivial variations share one cache key.
+
+    "Wuye,Abuja", "  wuye ,  ABUJA. " and "Wuye, Abuja" all become "wuye, abuja".
+
+    Args:
+        address (str): Address as typed by the user.
+
+    Returns:
+        str: Normalized address string.
+    """
+    text = unicodedata.normalize("NFKC", address or "").casefold()
+    text = re.sub(r"[^\w\s,]", " ", text)  # Drop punctuation but keep the comma separators
+    parts = [" ".join(part.split()) for part in text.split(",")]
+    return ", ".join(part for part in parts if part)
+
+
+class SQLiteTTLCache:
+    """
+    A small disk-backed key/value cache with expiry, negative entries and size-bounded eviction.
+
+    Several caches can share one SQLite file; each one lives in its own namespace.
+    Values are stored as JSON so only plain data (dicts, lists, numbers, strings, None) should go in.
+    """
+
+    def __init__(self, path: str, namespace: str, ttl: float = 7 * 24 * 3600,
+                 negative_ttl: float = 24 * 3600, max_entries: int = 5000) -> None:
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path (str): SQLite file path, or ":memory:" for a throwaway cache.
+            namespace (str): Logical name of this cache inside the file (e.g. "geocode").
+            ttl (float): Lifetime in seconds of normal entries.
+            negative_ttl (float): Lifetime in seconds of negative entries ("no results").
+            max_entries (int): Maximum entries kept in this namespace before the least recently used are evicted.
+        """
+        self.path = path
+        self.namespace = namespace
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+
+        # Counters so we can tell how well the cache is doing
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        if path != ":memory:" and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        # One connection shared between threads, guarded by a lock (Streamlit serves sessions from threads)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")  # Lets other processes read while we write
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " namespace TEXT NOT NULL,"
+            " key TEXT NOT NULL,"
+            " value TEXT,"
+            " negative INTEGER NOT NULL DEFAULT 0,"
+            " expires_at REAL NOT NULL,"
+            " last_access REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_lru ON cache (namespace, last_access)")
+        self._conn.commit()
+
+        # Last access times of hits not yet written to disk (key -> time), flushed by the next write,
+        # so reads never commit. Guarded by _lock.
+        self._touched = {}
+
+        # Per-key locks used by get_or_load so concurrent misses for the same key only load once
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+
+        get_metrics().register_cache(f"sqlite.{namespace}", self.stats)
+
+    def get(self, key: str) -> Any:
+        """
+        Look up a key.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            The cached value (which may be None for a negative entry), or MISS if absent or expired.
+        """
+        return self._lookup(key, count=True)
+
+    def set(self, key: str, value: Any, negative: bool = False, ttl: float | None = None) -> None:
+        """
+        Store a value, evicting the least recently used entries if the namespace is full.
+
+        Args:
+            key (str): Cache key.
+            value: JSON-serializable value.
+            negative (bool): Mark the entry as a negative result (uses negative_ttl).
+            ttl (float, optional): Override the lifetime in seconds for this entry.
+        """
+        now = time.time()
+        if ttl is None:
+            ttl = self.negative_ttl if negative else self.ttl
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, negative, expires_at, last_access)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value), int(negative), now + ttl, now)
+            )
+            self._touched.pop(key, None)
+            self._flush_touches()
+            self._evict(now)
+            self._conn.commit()
+
+    def get_or_load(self, key: str, loader: Callable[[], Any],
+                    is_negative: Callable[[Any], bool] = lambda value: value is None) -> Any:
+        """
+        Return the cached value for key, calling loader (once, even under concurrency) on a miss.
+
+        If loader raises, nothing is cached and the exception propagates to the caller,
+        so temporary failures such as network errors are retried on the next call.
+
+        Args:
+            key (str): Cache key.
+            loader (Callable): Zero-argument function producing the value.
+            is_negative (Callable): Decides whether a loaded value should be stored as a negative entry.
+
+        Returns:
+            The cached or freshly loaded value.
+        """
+        value = self.get(key)
+        if value is not MISS:
+            return value
+
+        with self._inflight_lock:
+            key_lock = self._inflight.setdefault(key, threading.Lock())
+
+        with key_lock:
+            try:
+                # Another thread may have loaded it while we were waiting for the lock
+                value = self._lookup(key, count=False)
+                if value is not MISS:
+                    return value
+
+                value = loader()
+                self.set(key, value, negative=is_negative(value))
+                return value
+            finally:
+                with self._inflight_lock:
+                    self._inflight.pop(key, None)
+
+    def delete(self, key: str) -> None:
+        """Remove a single key from the cache."""
+        with self._lock:
+            self._touched.pop(key, None)
+            self._conn.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (self.namespace, key))
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove every entry in this namespace and reset the counters."""
+        with self._lock:
+            self._touched.clear()
+            self._conn.execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+            self._conn.commit()
+        self.hits = self.negative_hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.namespace,)
+            ).fetchone()[0]
+
+    def stats(self) -> dict:
+        """
+        Return hit/miss counters for this cache.
+
+        Returns:
+            dict: hits, negative_hits, misses, evictions, size and hit_ratio.
+        """
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "namespace": self.namespace,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self),
+            "hit_ratio": (self.hits + self.negative_hits) / lookups if lookups else 0.0,
+        }
+
+    def _lookup(self, key: str, count: bool) -> Any:
+        """Read a key, noting its last access time for the next flush; only updates the counters when count is True."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, negative, expires_at FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            ).fetchone()
+
+            if row is None or row[2] < now:
+                if count:
+                    self.misses += 1
+                return MISS
+
+            self._touched[key] = now
+
+            if count and row[1]:
+                self.negative_hits += 1
+            elif count:
+                self.hits += 1
+            return json.loads(row[0])
+
+    def _flush_touches(self) -> None:
+        """Write the pending last access times in one statement, before eviction reads them. Caller holds the lock."""
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE cache SET last_access = ? WHERE namespace = ? AND key = ?",
+                [(accessed, self.namespace, key) for key, accessed in self._touched.items()]
+            )
+            self._touched.clear()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then the least recently used ones beyond max_entries. Caller holds the lock."""
+        cursor = self._conn.execute(
+            "DELETE FROM cache WHERE namespace = ? AND expires_at < ?", (self.namespace, now)
+        )
+        self.evictions += cursor.rowcount
+
+        size = self._conn.execute(
+            "SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.namespace,)
+        ).fetchone()[0]
+        overflow = size - self.max_entries
+        if overflow > 0:
+            cursor = self._conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND key IN ("
+                " SELECT key FROM cache WHERE namespace = ? ORDER BY last_access LIMIT ?)",
+                (self.namespace, self.namespace, overflow)
+            )
+            self.evictions += cursor.rowcount
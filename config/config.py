@@ -1,4 +1,5 @@
 import os # to be able to interact with environment Variables
+import threading
 from dotenv import load_dotenv # to load Variables from .env file into the environment
 
 
@@ -16,16 +17,95 @@ class Config:
         self.foursquare_key = os.getenv("FOURSQUARE_API_KEY")
         #self.google_key = os.getenv("GOOGLE_API_KEY")
 
+        # Provider base URLs (point these at a local mock server to run offline, e.g. the benchmarks)
+        self.geoapify_base_url = os.getenv("GEOAPIFY_BASE_URL", "https://api.geoapify.com").rstrip("/")
+        self.foursquare_base_url = os.getenv("FOURSQUARE_BASE_URL", "https://api.foursquare.com").rstrip("/")
+
         # Default search setting for business finder
         self.default_radius  = 5000 # Radius in meters
         self.default_category = "restaurant" # Default type of business to search for
+        self.page_size = 20 # Results requested per Geoapify page
+        self.max_results = 60 # Total results fetched across pages for one search
+
+        # Where Places searches are answered: "geoapify" (live API), "local" (offline POI index only),
+        # or "auto" (the index where an imported region covers the search, Geoapify elsewhere and when the index
+        # can't help, and the index again if Geoapify fails)
+        self.places_backend = os.getenv("PLACES_BACKEND", "geoapify")
+        self.poi_index_path = os.getenv("POI_INDEX", "cache/poi_index.sqlite3") # Built with `python main.py import-poi`
+
+        # Searches covering several categories ("food"): "batched" sends them all in one Geoapify request,
+        # "parallel" runs one search per category (each with its own max_results) and merges them
+        self.multi_category_strategy = os.getenv("MULTI_CATEGORY_STRATEGY", "batched")
+        self.multi_category_workers = 4 # Category searches running at the same time ("parallel" only)
 
         # Default map settings for folium
         self.zoom_level = 15 # Ideal for the business location and navigation
         self.map_tile = "OpenStreetMap" # Using the default OpenstreetMap for simplicity and reliability
         self.map_output_file = "business_results_map.html" # Output HTML file name
         self.marker_color = "green" # using this as my default color for business markers
+        self.map_cluster_threshold = 50 # Above this many results, markers are clustered
+        self.map_fast_cluster_threshold = 300 # Above this many, one FastMarkerCluster layer is used
+        self.map_cache_size = 16 # Rendered result maps kept in memory
+
+        # Shared HTTP connection pools (see config/http.py)
+        self.http_pool_connections = int(os.getenv("HTTP_POOL_CONNECTIONS", 10)) # Number of hosts kept pooled
+        self.http_pool_maxsize = int(os.getenv("HTTP_POOL_MAXSIZE", 20)) # Kept-alive connections per host
+
+        # Client-side rate limits (token buckets), per provider or per "provider.endpoint"
+        self.rate_limits = {
+            "geoapify": {"rate": float(os.getenv("GEOAPIFY_RATE_LIMIT", 5)), "burst": 10}, # Free plan: 5 requests/second
+            "foursquare": {"rate": float(os.getenv("FOURSQUARE_RATE_LIMIT", 10)), "burst": 20},
+        }
+
+        # Concurrent Foursquare rating enrichment
+        self.enrichment_workers = 8 # Rating lookups running at the same time
+        self.enrichment_timeout = 5.0 # Seconds allowed for each Foursquare request
+
+        # "area": fetch the venues around the results in a few paged searches and match them locally;
+        # "per_business": one search plus one details call per business
+        self.enrichment_mode = os.getenv("ENRICHMENT_MODE", "area")
+        self.area_page_limit = 50 # Venues per Foursquare page (the API maximum)
+        self.area_max_pages = 3 # Area searches per result list at most
+        self.area_match_distance_m = 150.0 # Furthest a venue can be from the business it matches
+        self.area_min_similarity = 0.6 # Name similarity (0-1) needed for a match
+        self.area_truncated_ttl = 3600.0 # Seconds a "no match" from a truncated area search is cached
+
+        # In-memory Places cache that answers searches inside an earlier, larger search circle
+        self.places_cache_ttl = 15 * 60 # Seconds before a cached search is considered stale
+        self.places_cache_size = 200 # Cached searches kept in memory
+
+        # Background route prefetching for the nearest results
+        self.prefetch_routes = os.getenv("PREFETCH_ROUTES", "1") == "1" # Set PREFETCH_ROUTES=0 to turn off
+        self.prefetch_nearest = 3 # Businesses whose walk and drive routes are prefetched
+        self.prefetch_workers = 4
+
+        # Live tracking: progress is followed locally; re-route only when this far off the route
+        self.off_route_threshold_m = float(os.getenv("OFF_ROUTE_THRESHOLD_M", 40))
+        self.arrival_distance_m = 20.0 # Remaining distance that counts as arrived
+
+        # Travel-time ranking: "geoapify" (Route Matrix API) or "local" (offline estimate, for tests)
+        self.travel_matrix_provider = os.getenv("TRAVEL_MATRIX", "geoapify")
 
+        # Progressive results page: details that arrive in the background after the list is shown
+        self.display_travel_mode = os.getenv("DISPLAY_TRAVEL_MODE", "walk") # Travel time shown per result ("" to hide)
+        self.display_wait_timeout = 15.0 # Seconds the page keeps polling for lookups still running
+        self.display_poll_interval = 0.5 # Seconds between reruns that pick up finished lookups
+
+        # Debug panel with per-rerun timings and provider/cache metrics (DEBUG_PANEL=1 to open it by default)
+        self.debug_panel = os.getenv("DEBUG_PANEL", "0") == "1"
+
+        # Local SQLite cache shared by the API caches (one namespace per cache)
+        self.cache_path = os.getenv("BUSINESS_FINDER_CACHE", "cache/business_finder.sqlite3")
+        self.cache_settings = {
+            # Addresses rarely move, so keep them for a month; retry "not found" after a day
+            "geocode": {"ttl": 30 * 24 * 3600, "negative_ttl": 24 * 3600, "max_entries": 5000},
+            # Ratings change slowly; "no match" / "no rating" answers are retried after a day
+            "ratings": {"ttl": 7 * 24 * 3600, "negative_ttl": 24 * 3600, "max_entries": 20000},
+            # Roads and traffic change, so routes are kept for a few hours; "no route" for ten minutes
+            "routes": {"ttl": 6 * 3600, "negative_ttl": 10 * 60, "max_entries": 2000},
+            # Travel times move with traffic, so matrix cells expire after half an hour
+            "matrix": {"ttl": 30 * 60, "negative_ttl": 10 * 60, "max_entries": 20000},
+        }
 
 
     def get_api_key(self, service:str) -> str:
@@ -40,6 +120,19 @@ class Config:
         else:
             raise ValueError("Unsupported services: it is either 'geoapify' or 'google'")
 
+    def get_endpoint(self, service: str, path: str) -> str:
+        """Return the full URL of a provider endpoint.
+        :param service: either "geoapify" or "foursquare"
+        :param path: endpoint path, e.g. "/v2/places"
+        :return: URL on the configured base URL"""
+
+        if service == "geoapify":
+            return self.geoapify_base_url + path
+        elif service == "foursquare":
+            return self.foursquare_base_url + path
+        else:
+            raise ValueError("Unsupported services: it is either 'geoapify' or 'foursquare'")
+
     def get_default_settings(self) -> dict:
 
         """
@@ -49,7 +142,31 @@ class Config:
 
         return {
             "radius": self.default_radius,
-            "category": self.default_category
+            "category": self.default_category,
+            "page_size": self.page_size,
+            "max_results": self.max_results
+        }
+
+    def get_multi_category_settings(self) -> dict:
+        """
+        Return the settings for searches that cover several categories.
+
+        :return: dictionary with strategy and max_workers
+        """
+        return {
+            "strategy": self.multi_category_strategy,
+            "max_workers": self.multi_category_workers
+        }
+
+    def get_places_backend_settings(self) -> dict:
+        """
+        Return where Places searches are answered.
+
+        :return: dictionary with backend ("geoapify", "local" or "auto") and index_path
+        """
+        return {
+            "backend": self.places_backend,
+            "index_path": self.poi_index_path
         }
 
     def get_map_settings(self) -> dict:
@@ -65,4 +182,138 @@ class Config:
             "marker_color": self.marker_color
         }
 
+    def get_map_render_settings(self) -> dict:
+        """
+        Return the settings for the cached results map renderer.
+
+        :return: dictionary with tiles, cluster_threshold, fast_cluster_threshold and cache_size
+        """
+        return {
+            "tiles": self.map_tile,
+            "cluster_threshold": self.map_cluster_threshold,
+            "fast_cluster_threshold": self.map_fast_cluster_threshold,
+            "cache_size": self.map_cache_size
+        }
+
+    def get_http_settings(self) -> dict:
+        """
+        Return the connection pool settings for the shared HTTP session.
+
+        :return: dictionary with pool_connections and pool_maxsize
+        """
+        return {
+            "pool_connections": self.http_pool_connections,
+            "pool_maxsize": self.http_pool_maxsize
+        }
+
+    def get_rate_limits(self) -> dict:
+        """
+        Return the token-bucket settings used by the rate limiter.
+
+        :return: dictionary of {"provider" or "provider.endpoint": {"rate": ..., "burst": ...}}
+        """
+        return self.rate_limits
+
+    def get_enrichment_settings(self) -> dict:
+        """
+        Return the settings used by the rating enricher.
+
+        :return: dictionary with max_workers and timeout
+        """
+        return {
+            "max_workers": self.enrichment_workers,
+            "timeout": self.enrichment_timeout
+        }
+
+    def get_area_enrichment_settings(self) -> dict:
+        """
+        Return the settings for area-level Foursquare matching.
+
+        :return: dictionary with page_limit, max_pages, max_distance_m, min_similarity and truncated_ttl
+        """
+        return {
+            "page_limit": self.area_page_limit,
+            "max_pages": self.area_max_pages,
+            "max_distance_m": self.area_match_distance_m,
+            "min_similarity": self.area_min_similarity,
+            "truncated_ttl": self.area_truncated_ttl
+        }
+
+    def get_places_cache_settings(self) -> dict:
+        """
+        Return the settings for the in-memory Places cache.
+
+        :return: dictionary with ttl and max_entries
+        """
+        return {
+            "ttl": self.places_cache_ttl,
+            "max_entries": self.places_cache_size
+        }
+
+    def get_prefetch_settings(self) -> dict:
+        """
+        Return the background route prefetch settings.
+
+        :return: dictionary with enabled, nearest and max_workers
+        """
+        return {
+            "enabled": self.prefetch_routes,
+            "nearest": self.prefetch_nearest,
+            "max_workers": self.prefetch_workers
+        }
+
+    def get_tracking_settings(self) -> dict:
+        """
+        Return the live tracking settings for RouteTracker.
+
+        :return: dictionary with off_route_threshold_m and arrival_m
+        """
+        return {
+            "off_route_threshold_m": self.off_route_threshold_m,
+            "arrival_m": self.arrival_distance_m
+        }
+
+    def get_display_settings(self) -> dict:
+        """
+        Return the settings for progressively filling in the results page.
+
+        :return: dictionary with travel_mode, wait_timeout and poll_interval
+        """
+        return {
+            "travel_mode": self.display_travel_mode,
+            "wait_timeout": self.display_wait_timeout,
+            "poll_interval": self.display_poll_interval
+        }
+
+    def get_cache_settings(self, name: str) -> dict:
+        """
+        Return the settings for one of the local API caches.
+
+        :param name: cache name, e.g. "geocode"
+        :return: dictionary with path, namespace, ttl, negative_ttl and max_entries
+        """
+        if name not in self.cache_settings:
+            raise ValueError(f"Unknown cache: {name}")
+
+        return {"path": self.cache_path, "namespace": name, **self.cache_settings[name]}
+
+
+# Shared configuration for the whole process (Streamlit reruns the script on every interaction)
+_config = None
+_config_lock = threading.Lock()
+
+
+def get_config() -> Config:
+    """
+    Return the process-wide Config, loading .env and the environment only on first use.
+
+    Build a Config() directly instead when the environment was changed on purpose and must be re-read.
 
+    :return: shared Config instance
+    """
+    global _config
+    if _config is None:
+        with _config_lock:
+            if _config is None:
+                _config = Config()
+    return _config
@@ -0,0 +1,131 @@
+# config/http.py
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config.config import get_config
+from config.metrics import get_metrics
+from config.rate_limit import classify_url, get_rate_limiter, parse_retry_after
+
+
+# One shared session for the whole process, so every provider call reuses kept-alive connections
+_session = None
+_session_lock = threading.Lock()
+
+
+def create_session(pool_connections: int = 10, pool_maxsize: int = 20) -> requests.Session:
+    """
+    Build a requests Session with per-host keep-alive connection pools and gzip negotiation.
+
+    Args:
+        pool_connections (int): Number of hosts to keep a connection pool for.
+        pool_maxsize (int): Maximum open connections kept per host (raise it for concurrent enrichment).
+
+    Returns:
+        requests.Session: Configured session.
+    """
+    session = requests.Session()
+
+    # Retries are handled by retry_api_call, so the adapter itself never retries
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    session.headers.update({
+        "Accept-Encoding": "gzip, deflate",  # Geoapify and Foursquare both compress JSON responses
+        "Connection": "keep-alive",
+    })
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Return the process-wide HTTP session, creating it from the Config pool settings on first use.
+
+    Returns:
+        requests.Session: Shared session.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session(**get_config().get_http_settings())
+    return _session
+
+
+def configure_session(pool_connections: int, pool_maxsize: int) -> requests.Session:
+    """
+    Replace the shared session with one using different pool sizes.
+
+    Args:
+        pool_connections (int): Number of hosts to keep a connection pool for.
+        pool_maxsize (int): Maximum open connections kept per host.
+
+    Returns:
+        requests.Session: The new shared session.
+    """
+    global _session
+    with _session_lock:
+        old_session, _session = _session, create_session(pool_connections, pool_maxsize)
+    if old_session is not None:
+        old_session.close()
+    return _session
+
+
+def http_get(url: str, params: dict | None = None, headers: dict | None = None,
+             timeout: float = 10.0) -> requests.Response:
+    """
+    Send a GET request through the shared pooled session.
+
+    The request first waits for a token from the provider's rate limiter; a 429 response
+    pauses that provider endpoint for the Retry-After time, for every thread in the process.
+
+    Args:
+        url (str): Endpoint URL
+        params (dict, optional): Query string parameters
+        headers (dict, optional): Extra request headers (e.g. Foursquare Authorization)
+        timeout (float): Request timeout in seconds
+
+    Returns:
+        requests.Response: API response
+    """
+    return _send("GET", url, params=params, headers=headers, timeout=timeout)
+
+
+def http_post(url: str, payload: dict, params: dict | None = None, headers: dict | None = None,
+              timeout: float = 10.0) -> requests.Response:
+    """
+    Send a JSON POST request through the shared pooled session (rate limited like http_get).
+
+    Args:
+        url (str): Endpoint URL
+        payload (dict): JSON request body
+        params (dict, optional): Query string parameters (e.g. apiKey)
+        headers (dict, optional): Extra request headers
+        timeout (float): Request timeout in seconds
+
+    Returns:
+        requests.Response: API response
+    """
+    return _send("POST", url, json=payload, params=params, headers=headers, timeout=timeout)
+
+
+def _send(method: str, url: str, **kwargs) -> requests.Response:
+    """Rate-limit, send and measure one request (latency and status go to the metrics registry)."""
+    provider, endpoint = classify_url(url)
+    limiter = get_rate_limiter()
+    limiter.acquire(provider, endpoint)
+
+    start = time.perf_counter()
+    try:
+        response = get_session().request(method, url, **kwargs)
+    except requests.exceptions.RequestException:
+        get_metrics().observe_request(provider, endpoint, "error", time.perf_counter() - start)
+        raise
+    get_metrics().observe_request(provider, endpoint, response.status_code, time.perf_counter() - start)
+
+    if response.status_code == 429:
+        limiter.pause(provider, endpoint, parse_retry_after(response.headers.get("Retry-After")))
+    return response
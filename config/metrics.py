@@ -0,0 +1,279 @@
+# config/metrics.py
+import contextvars
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Dict, List, Tuple
+
+# Latency histogram bucket upper bounds, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Event list of the trace active in the current context: one Streamlit script run, or a task bound to it
+_current_trace: contextvars.ContextVar = contextvars.ContextVar("metrics_trace", default=None)
+
+
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus style). Not thread-safe on its own; the registry locks."""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """[(le, cumulative count), ...] including "+Inf"."""
+        total, rows = 0, []
+        for bound, count in zip((*map(str, self.buckets), "+Inf"), self.counts):
+            total += count
+            rows.append((bound, total))
+        return rows
+
+    def quantile(self, q: float) -> float | None:
+        """Approximate quantile: the upper bound of the bucket holding it."""
+        if not self.count:
+            return None
+        target, total = q * self.count, 0
+        for bound, count in zip((*self.buckets, float("inf")), self.counts):
+            total += count
+            if total >= target:
+                return bound
+        return float("inf")
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum_s": round(self.sum, 6),
+            "mean_ms": round(self.sum / self.count * 1000, 3) if self.count else None,
+            "p50_le_s": self.quantile(0.5),
+            "p95_le_s": self.quantile(0.95),
+            "buckets": dict(self.cumulative()),
+        }
+
+
+class MetricsRegistry:
+    """
+    Process-wide metrics for provider calls, retries, caches and page timing.
+
+    - Every provider request (through http_get / http_post / the async client) records its
+      latency and status code under (provider, endpoint), e.g. ("geoapify", "places").
+    - retry_api_call and the async client count their retries per operation.
+    - Caches register a stats() callable and are read when metrics are exported.
+    - A "trace" collects the stages and requests of one Streamlit rerun for the debug panel.
+      It lives in a context variable, so each session's script thread has its own, and
+      background tasks only add to it when submitted through bind_trace.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.latency: Dict[Tuple[str, str], Histogram] = {}
+        self.statuses: Dict[Tuple[str, str, str], int] = {}
+        self.retries: Dict[str, int] = {}
+        self.stages: Dict[str, Histogram] = {}
+        self._caches: Dict[str, Callable[[], dict]] = {}
+
+    def observe_request(self, provider: str, endpoint: str, status: int | str, seconds: float) -> None:
+        """
+        Record one provider request.
+
+        Args:
+            provider (str): e.g. "geoapify".
+            endpoint (str): e.g. "places".
+            status (int or str): HTTP status code, or "error" if no response arrived.
+            seconds (float): Wall time of the request.
+        """
+        with self._lock:
+            self.latency.setdefault((provider, endpoint), Histogram()).observe(seconds)
+            key = (provider, endpoint, str(status))
+            self.statuses[key] = self.statuses.get(key, 0) + 1
+            self._record({"kind": "request", "name": f"{provider}.{endpoint}", "status": str(status),
+                          "ms": round(seconds * 1000, 2), "thread": threading.current_thread().name})
+
+    def count_retry(self, operation: str) -> None:
+        """Record one retry of an operation (function or endpoint name)."""
+        with self._lock:
+            self.retries[operation] = self.retries.get(operation, 0) + 1
+
+    def observe_stage(self, name: str, seconds: float) -> None:
+        """Record the duration of an application stage (search, render, ...)."""
+        with self._lock:
+            self.stages.setdefault(name, Histogram()).observe(seconds)
+            self._record({"kind": "stage", "name": name, "status": "",
+                          "ms": round(seconds * 1000, 2), "thread": threading.current_thread().name})
+
+    @contextmanager
+    def timer(self, name: str):
+        """Time a block as a stage: `with get_metrics().timer("search"): ...`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe_stage(name, time.perf_counter() - start)
+
+    def register_cache(self, name: str, stats: Callable[[], dict]) -> None:
+        """
+        Include a cache in the exported metrics.
+
+        Args:
+            name (str): Cache name, e.g. "sqlite.geocode".
+            stats (callable): Returns a dict with at least "hits" and "misses".
+        """
+        with self._lock:
+            self._caches[name] = stats
+
+    @staticmethod
+    def _record(event: dict) -> None:
+        """Add an event to the current context's trace, if any (caller holds the lock)."""
+        events = _current_trace.get()
+        if events is not None:
+            events.append(event)
+
+    def start_trace(self, events: List[dict] | None = None) -> List[dict]:
+        """
+        Start collecting the stages and requests of one page run in the current context.
+
+        Other threads (another session's script run, an executor worker) are not affected.
+
+        Args:
+            events (list, optional): Trace to continue, e.g. one kept in st.session_state across a rerun.
+
+        Returns:
+            list: The trace's event list (keep it to continue the trace later).
+        """
+        events = [] if events is None else events
+        _current_trace.set(events)
+        return events
+
+    def trace(self) -> List[dict]:
+        """Events recorded in the current context's trace (empty if no trace is active)."""
+        events = _current_trace.get()
+        with self._lock:
+            return list(events or [])
+
+    def bind_trace(self, func: Callable) -> Callable:
+        """
+        Wrap a callable so it records into the caller's trace when run on another thread.
+
+        Usage: `executor.submit(get_metrics().bind_trace(fetch), *args)`.
+
+        Args:
+            func (callable): Task to run.
+
+        Returns:
+            callable: func itself if no trace is active here, otherwise a wrapper that activates it.
+        """
+        events = _current_trace.get()
+        if events is None:
+            return func
+
+        @wraps(func)
+        def run(*args, **kwargs):
+            token = _current_trace.set(events)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                _current_trace.reset(token)
+
+        return run
+
+    def cache_stats(self) -> Dict[str, dict]:
+        """Current stats of every registered cache, with a hit ratio."""
+        with self._lock:
+            caches = dict(self._caches)
+        result = {}
+        for name, stats in sorted(caches.items()):
+            try:
+                values = dict(stats())
+            except Exception as e:  # A closed cache must not break the export
+                values = {"error": str(e)}
+            hits, misses = values.get("hits", 0), values.get("misses", 0)
+            values.setdefault("hit_ratio", round(hits / (hits + misses), 3) if hits + misses else 0.0)
+            result[name] = values
+        return result
+
+    def to_json(self) -> dict:
+        """All metrics as a JSON-serializable dict."""
+        with self._lock:
+            requests = {f"{p}.{e}": h.to_dict() for (p, e), h in sorted(self.latency.items())}
+            statuses = {}
+            for (p, e, status), count in sorted(self.statuses.items()):
+                statuses.setdefault(f"{p}.{e}", {})[status] = count
+            retries = dict(sorted(self.retries.items()))
+            stages = {name: h.to_dict() for name, h in sorted(self.stages.items())}
+        return {"requests": requests, "status_codes": statuses, "retries": retries,
+                "stages": stages, "caches": self.cache_stats()}
+
+    def to_json_text(self) -> str:
+        return json.dumps(self.to_json(), indent=2)
+
+    def to_prometheus(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            lines += ["# HELP provider_request_duration_seconds Provider API request latency.",
+                      "# TYPE provider_request_duration_seconds histogram"]
+            for (provider, endpoint), histogram in sorted(self.latency.items()):
+                labels = f'provider="{provider}",endpoint="{endpoint}"'
+                lines += self._histogram_lines("provider_request_duration_seconds", labels, histogram)
+
+            lines += ["# HELP provider_requests_total Provider API requests by status code.",
+                      "# TYPE provider_requests_total counter"]
+            for (provider, endpoint, status), count in sorted(self.statuses.items()):
+                lines.append(f'provider_requests_total{{provider="{provider}",endpoint="{endpoint}",'
+                             f'status="{status}"}} {count}')
+
+            lines += ["# HELP retries_total Retried attempts by operation.", "# TYPE retries_total counter"]
+            for operation, count in sorted(self.retries.items()):
+                lines.append(f'retries_total{{operation="{operation}"}} {count}')
+
+            lines += ["# HELP stage_duration_seconds Application stage duration.",
+                      "# TYPE stage_duration_seconds histogram"]
+            for name, histogram in sorted(self.stages.items()):
+                lines += self._histogram_lines("stage_duration_seconds", f'stage="{name}"', histogram)
+
+        caches = self.cache_stats()
+        for metric, key, kind in (("cache_hits_total", "hits", "counter"), ("cache_misses_total", "misses", "counter"),
+                                  ("cache_hit_ratio", "hit_ratio", "gauge")):
+            lines += [f"# TYPE {metric} {kind}"]
+            for name, values in caches.items():
+                if isinstance(values.get(key), (int, float)):
+                    lines.append(f'{metric}{{cache="{name}"}} {values[key]}')
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def _histogram_lines(metric: str, labels: str, histogram: Histogram) -> List[str]:
+        lines = [f'{metric}_bucket{{{labels},le="{le}"}} {count}' for le, count in histogram.cumulative()]
+        lines.append(f"{metric}_sum{{{labels}}} {histogram.sum:.6f}")
+        lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+        return lines
+
+    def reset(self) -> None:
+        """Forget all recorded values (registered caches stay registered)."""
+        with self._lock:
+            self.latency.clear()
+            self.statuses.clear()
+            self.retries.clear()
+            self.stages.clear()
+        _current_trace.set(None)
+
+
+# Shared registry for the whole process
+_metrics = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    """
+    Return the process-wide metrics registry.
+
+    Returns:
+        MetricsRegistry: Shared registry.
+    """
+    return _metrics
@@ -0,0 +1,121 @@
+# config/profiling.py
+import subprocess
+import sys
+import time
+from typing import Dict, List, NamedTuple
+
+# Modules that should only be imported when a code path needs them
+LAZY_MODULES = ("folium", "streamlit_folium")
+
+
+class ImportCost(NamedTuple):
+    """One line of `python -X importtime` output."""
+    module: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int
+
+
+def parse_importtime(output: str) -> List[ImportCost]:
+    """
+    Parse the stderr of `python -X importtime`.
+
+    Args:
+        output (str): Lines like "import time:       802 |     117373 | requests".
+
+    Returns:
+        list: ImportCost per imported module, in import order.
+    """
+    costs = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        try:
+            self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+            costs.append(ImportCost(
+                module=name.strip(),
+                self_ms=int(self_us) / 1000,
+                cumulative_ms=int(cumulative_us) / 1000,
+                depth=(len(name) - len(name.lstrip())) // 2,
+            ))
+        except ValueError:
+            continue  # Interleaved warnings or other output
+    return costs
+
+
+def import_costs(module: str) -> List[ImportCost]:
+    """
+    Import a module in a fresh interpreter (nothing cached in sys.modules) and time every import.
+
+    Args:
+        module (str): Module to import, e.g. "core.gui_manager".
+
+    Returns:
+        list: ImportCost per module imported on the way.
+
+    Raises:
+        RuntimeError: If the import fails.
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def cost_by_package(costs: List[ImportCost]) -> Dict[str, float]:
+    """Self import time (ms) summed per top-level package, most expensive first."""
+    totals = {}
+    for cost in costs:
+        package = cost.module.split(".", 1)[0]
+        totals[package] = totals.get(package, 0.0) + cost.self_ms
+    return dict(sorted(totals.items(), key=lambda item: -item[1]))
+
+
+def profile_startup(module: str = "core.gui_manager", top: int = 15) -> dict:
+    """
+    Measure what starting the app costs: a cold import of the GUI module, then building the
+    shared services in this process, then getting them again (the cost every rerun pays).
+
+    Args:
+        module (str): Entry module to import.
+        top (int): Packages and modules listed in the report.
+
+    Returns:
+        dict: import_ms, packages, modules, init_ms, rerun_ms, lazy_loaded.
+    """
+    costs = import_costs(module)
+    entry = next((cost for cost in costs if cost.module == module), None)
+
+    start = time.perf_counter()
+    from core.gui_manager import get_gui_manager  # Warm import: the subprocess above measured the cold one
+    imported = time.perf_counter()
+    get_gui_manager()
+    initialized = time.perf_counter()
+    get_gui_manager()
+    rerun = time.perf_counter()
+
+    return {
+        "import_ms": entry.cumulative_ms if entry else sum(cost.self_ms for cost in costs),
+        "packages": list(cost_by_package(costs).items())[:top],
+        "modules": sorted(((cost.module, cost.cumulative_ms) for cost in costs), key=lambda item: -item[1])[:top],
+        "warm_import_ms": (imported - start) * 1000,
+        "init_ms": (initialized - imported) * 1000,
+        "rerun_ms": (rerun - initialized) * 1000,
+        "lazy_loaded": [name for name in LAZY_MODULES if name in sys.modules],
+    }
+
+
+def format_report(report: dict) -> str:
+    """Human-readable startup profile."""
+    lines = [f"Cold import of the app:  {report['import_ms']:9.1f} ms", "", "Self import time by package:"]
+    lines += [f"  {package:<30} {ms:9.1f} ms" for package, ms in report["packages"]]
+    lines += ["", "Slowest imports (including what they import):"]
+    lines += [f"  {module:<58} {ms:9.1f} ms" for module, ms in report["modules"]]
+    lines += [
+        "",
+        f"GUIManager and services, first build: {report['init_ms']:9.2f} ms",
+        f"Reused on each rerun:                 {report['rerun_ms']:9.3f} ms",
+        "Lazy modules loaded at startup:       " + (", ".join(report["lazy_loaded"]) or "none"),
+    ]
+    return "\n".join(lines)
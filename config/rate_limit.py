@@ -0,0 +1,243 @@
+# config/rate_limit.py
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlparse
+
+from config.config import get_config
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: `rate` requests per second on average, bursts of up to `burst`.
+
+    Implemented as a "virtual scheduling" bucket: every caller reserves the next free slot and
+    is told how long to wait for it, so waiting callers queue fairly instead of polling.
+    The bucket can also be paused (e.g. after a 429 with Retry-After).
+    """
+
+    def __init__(self, rate: float, burst: int = 1) -> None:
+        """
+        Args:
+            rate (float): Sustained requests per second.
+            burst (int): Requests allowed back to back after a quiet period.
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._interval = 1.0 / rate
+        self._tolerance = (self.burst - 1) * self._interval
+        self._next_slot = 0.0  # Theoretical arrival time of the next request (monotonic clock)
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+        # Queue wait metrics
+        self.acquired = 0
+        self.waited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.throttled = 0
+
+    def reserve(self) -> float:
+        """
+        Reserve a slot and return how many seconds the caller must wait before using it.
+
+        Returns:
+            float: Seconds to wait (0 if a token is available now).
+        """
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._paused_until)
+            slot = max(self._next_slot, start)
+            allowed_at = max(slot - self._tolerance, start)
+            self._next_slot = slot + self._interval
+
+            wait = max(0.0, allowed_at - now)
+            self.acquired += 1
+            if wait > 0:
+                self.waited += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+            return wait
+
+    def acquire(self) -> float:
+        """
+        Block the current thread until a token is available.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self) -> float:
+        """
+        Wait (without blocking the event loop) until a token is available.
+
+        Returns:
+            float: Seconds spent waiting.
+        """
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def pause(self, seconds: float) -> None:
+        """
+        Stop handing out tokens for the given time (used when the provider says Retry-After).
+
+        Args:
+            seconds (float): How long to pause.
+        """
+        with self._lock:
+            self.throttled += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    def stats(self) -> dict:
+        """Queue wait metrics for this bucket."""
+        return {
+            "rate": self.rate,
+            "burst": self.burst,
+            "acquired": self.acquired,
+            "waited": self.waited,
+            "total_wait_s": round(self.total_wait, 4),
+            "max_wait_s": round(self.max_wait, 4),
+            "avg_wait_s": round(self.total_wait / self.acquired, 4) if self.acquired else 0.0,
+            "throttled": self.throttled,
+        }
+
+
+class RateLimiter:
+    """
+    Process-wide registry of token buckets, one per provider endpoint (e.g. "geoapify.places").
+
+    Limits are looked up as "provider.endpoint" first, then "provider"; unknown providers are not limited.
+    """
+
+    def __init__(self, limits: dict) -> None:
+        """
+        Args:
+            limits (dict): {"geoapify": {"rate": 5, "burst": 10}, "geoapify.routing": {...}, ...}
+        """
+        self.limits = limits
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, provider: str, endpoint: str) -> TokenBucket | None:
+        """
+        Return the bucket for a provider endpoint, creating it on first use.
+
+        Args:
+            provider (str): e.g. "geoapify" or "foursquare".
+            endpoint (str): e.g. "places", "routing", "search".
+
+        Returns:
+            TokenBucket or None: None if no limit is configured for this provider.
+        """
+        name = f"{provider}.{endpoint}"
+        bucket = self._buckets.get(name)
+        if bucket is None:
+            settings = self.limits.get(name) or self.limits.get(provider)
+            if settings is None:
+                return None
+            with self._lock:
+                bucket = self._buckets.setdefault(name, TokenBucket(settings["rate"], settings.get("burst", 1)))
+        return bucket
+
+    def acquire(self, provider: str, endpoint: str) -> float:
+        """Blocking acquire for a provider endpoint. Returns seconds waited."""
+        bucket = self.bucket(provider, endpoint)
+        return bucket.acquire() if bucket else 0.0
+
+    async def acquire_async(self, provider: str, endpoint: str) -> float:
+        """Async acquire for a provider endpoint. Returns seconds waited."""
+        bucket = self.bucket(provider, endpoint)
+        return await bucket.acquire_async() if bucket else 0.0
+
+    def pause(self, provider: str, endpoint: str, seconds: float) -> None:
+        """Pause a provider endpoint after a 429 / Retry-After."""
+        bucket = self.bucket(provider, endpoint)
+        if bucket:
+            bucket.pause(seconds)
+
+    def stats(self) -> dict:
+        """
+        Queue wait metrics for every bucket used so far.
+
+        Returns:
+            dict: {"geoapify.places": {...}, ...}
+        """
+        return {name: bucket.stats() for name, bucket in sorted(self._buckets.items())}
+
+
+def classify_url(url: str) -> tuple:
+    """
+    Work out which provider and endpoint a URL belongs to.
+
+    Args:
+        url (str): Request URL.
+
+    Returns:
+        tuple: (provider, endpoint), e.g. ("geoapify", "places") or ("foursquare", "details").
+    """
+    parsed = urlparse(url)
+    host = parsed.hostname or ""
+    path = parsed.path.strip("/").split("/")
+
+    # Base URLs may be overridden (e.g. one local mock server for both): tell them apart by API version
+    config = get_config()
+    if url.startswith((config.geoapify_base_url + "/", config.foursquare_base_url + "/")):
+        host = "foursquare" if path[0] == "v3" else "geoapify"
+
+    if "foursquare" in host:
+        # /v3/places/search or /v3/places/{fsq_id}
+        return "foursquare", "search" if path[-1] == "search" else "details"
+    if "geoapify" in host:
+        # /v2/places, /v1/routing, /v1/routematrix, /v1/geocode/search, /v1/ipinfo ...
+        return "geoapify", path[1] if len(path) > 1 else (path[0] or "unknown")
+    return host or "unknown", path[-1] or "unknown"
+
+
+def parse_retry_after(value: str | None, default: float = 1.0) -> float:
+    """
+    Parse a Retry-After header (either seconds or an HTTP date).
+
+    Args:
+        value (str): Header value, or None.
+        default (float): Seconds to use when the header is missing or unreadable.
+
+    Returns:
+        float: Seconds to wait.
+    """
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+# Shared limiter for the whole process, created on first use
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Return the process-wide rate limiter, creating it from the Config settings on first use.
+
+    Returns:
+        RateLimiter: Shared limiter.
+    """
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = RateLimiter(get_config().get_rate_limits())
+    return _rate_limiter
@@ -5,26 +5,39 @@ import requests
 import logging
 from functools import wraps
 import time
-import requests
 from typing import Callable, Optional, Tuple, Any
+from config.config import get_config
+from config.http import http_get, http_post
+from config.metrics import get_metrics
+from config.rate_limit import parse_retry_after
 # from business_finder_2.config.config import API_KEY
 
 
-def configure_logging(log_file: str = 'business_finder.log', level: int = logging.INFO):
+_logging_configured = False
+
+
+def configure_logging(log_file: str = 'business_finder.log', level: int = logging.INFO, force: bool = False):
     """
-    Configure logging for the application.
+    Configure logging for the application (once per process; later calls are no-ops).
 
     Args:
         log_file (str): Path to log file
         level (int): Logging level (e.g., logging.INFO, logging.DEBUG)
+        force (bool): Replace the existing handlers instead of keeping them
     """
+    global _logging_configured
+    if _logging_configured and not force:
+        return
+    _logging_configured = True
+
     logging.basicConfig(
         level=level,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         handlers=[
             logging.FileHandler(log_file),
             logging.StreamHandler()
-        ]
+        ],
+        force=force
     )
     logging.getLogger('requests').setLevel(logging.WARNING)
 
@@ -132,11 +145,22 @@ def validate_api_key(key: Any) -> Tuple[bool, str]:
     return True, ""
 
 
+class RateLimitedError(requests.exceptions.HTTPError):
+    """Raised when a provider answers 429 Too Many Requests; carries the Retry-After delay in seconds."""
+
+    def __init__(self, message: str, retry_after: float = 1.0, response=None):
+        super().__init__(message, response=response)
+        self.retry_after = retry_after
+
+
 def retry_api_call(max_retries: int = 3, delay: float = 1.0,
                    backoff: float = 2.0, exceptions: tuple = (requests.exceptions.RequestException,)):
     """
     Decorator for retrying API calls.
 
+    If the exception carries a `retry_after` (see RateLimitedError), the wait before the next
+    attempt is at least that long, so we never retry before the provider allows it.
+
     Args:
         max_retries (int): Maximum number of retries
         delay (float): Initial delay between retries in seconds
@@ -159,8 +183,10 @@ def retry_api_call(max_retries: int = 3, delay: float = 1.0,
                     if retries == max_retries:
                         logging.error(f"Max retries ({max_retries}) exceeded for {func.__name__}")
                         raise
-                    logging.warning(f"Retry {retries}/{max_retries} for {func.__name__} after {current_delay}s")
-                    time.sleep(current_delay)
+                    wait = max(current_delay, getattr(e, "retry_after", 0) or 0)
+                    get_metrics().count_retry(func.__name__)
+                    logging.warning(f"Retry {retries}/{max_retries} for {func.__name__} after {wait}s")
+                    time.sleep(wait)
                     current_delay *= backoff
             return None
 
@@ -177,7 +203,7 @@ def retry_api_call(max_retries: int = 3, delay: float = 1.0,
 @api_error_handler
 def make_api_request(url: str, params: dict, timeout: float = 10.0) -> requests.Response:
     """
-    Make an API request with retry and error handling.
+    Make an API request with retry and error handling, over the shared pooled session.
 
     Args:
         url (str): API endpoint URL
@@ -186,8 +212,40 @@ def make_api_request(url: str, params: dict, timeout: float = 10.0) -> requests.
 
     Returns:
         requests.Response: API response
+
+    Raises:
+        RateLimitedError: On HTTP 429, so retry_api_call waits for Retry-After before trying again.
+    """
+    response = http_get(url, params=params, timeout=timeout)
+    if response.status_code == 429:
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        raise RateLimitedError(f"Rate limited by {url} (retry after {retry_after}s)", retry_after, response)
+    return response
+
+
+@retry_api_call(max_retries=3, delay=1.0)
+@api_error_handler
+def make_api_post_request(url: str, params: dict, payload: dict, timeout: float = 10.0) -> requests.Response:
+    """
+    POST a JSON body to an API with retry and error handling, over the shared pooled session.
+
+    Args:
+        url (str): API endpoint URL
+        params (dict): Query string parameters
+        payload (dict): JSON request body
+        timeout (float): Request timeout in seconds
+
+    Returns:
+        requests.Response: API response
+
+    Raises:
+        RateLimitedError: On HTTP 429, so retry_api_call waits for Retry-After before trying again.
     """
-    return requests.get(url, params=params, timeout=timeout)
+    response = http_post(url, payload, params=params, timeout=timeout)
+    if response.status_code == 429:
+        retry_after = parse_retry_after(response.headers.get("Retry-After"))
+        raise RateLimitedError(f"Rate limited by {url} (retry after {retry_after}s)", retry_after, response)
+    return response
 
 
 def open_in_browser(url: str):
@@ -248,6 +306,8 @@ def time_function(func: Callable) -> Callable:
     """
     Decorator to measure and log function execution time.
 
+    The time is also recorded as a stage in the metrics registry (and the debug panel trace).
+
     Args:
         func (Callable): Function to time
 
@@ -257,11 +317,13 @@ def time_function(func: Callable) -> Callable:
 
     @wraps(func)
     def wrapper(*args, **kwargs):
-        start_time = time.time()
-        result = func(*args, **kwargs)
-        end_time = time.time()
-        logging.debug(f"{func.__name__} executed in {end_time - start_time:.4f} seconds")
-        return result
+        start_time = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start_time
+            get_metrics().observe_stage(func.__qualname__, elapsed)
+            logging.debug(f"{func.__name__} executed in {elapsed:.4f} seconds")
 
     return wrapper
 
@@ -273,11 +335,11 @@ def get_location_from_ip(api_key: str) -> tuple|None:
     Returns:
         tuple or None: (latitude, longitude) if successful, else None.
     """
-    url = "https://api.geoapify.com/v1/ipinfo"
+    url = get_config().get_endpoint("geoapify", "/v1/ipinfo")
     params = {"apiKey": api_key}
 
     try:
-        response = requests.get(url, params=params)
+        response = http_get(url, params=params)
         if response.status_code == 200:
             data = response.json()
             lat = data.get("location", {}).get("latitude")
@@ -0,0 +1,321 @@
+# core/async_client.py
+import asyncio
+import logging
+import time
+from typing import List, Tuple
+
+import aiohttp
+
+from config.cache import MISS, normalize_address
+from config.config import get_config
+from config.metrics import get_metrics
+from config.rate_limit import classify_url, get_rate_limiter, parse_retry_after
+from core.business import Business
+from core.business_finder import BusinessFinder
+from core.location_manager import LocationManager
+from core.places_cache import get_places_cache
+from core.poi_index import get_poi_index
+from core.routing import ROUTING_ENDPOINT, get_route_cache, route_key, route_params
+
+
+def is_retryable(error: Exception) -> bool:
+    """
+    Whether a failed request is worth repeating: rate limits, server errors and network failures are,
+    other 4xx answers (bad API key, not found) are not.
+
+    Args:
+        error (Exception): What the request raised.
+
+    Returns:
+        bool: True to retry.
+    """
+    if isinstance(error, aiohttp.ClientResponseError):
+        return error.status == 429 or error.status >= 500
+    return True
+
+
+class AsyncGeoClient:
+    """
+    Asynchronous counterpart of the provider calls (geocoding, places, routing, ratings).
+
+    One client owns one aiohttp session, so every request made through it shares the same
+    connection limits. Request parameters and response parsing are the same helpers the
+    synchronous code uses, and the geocode, rating, route and Places caches (and the Places
+    backend) are shared with it too. The SQLite-backed caches and the POI index are read and
+    written in worker threads (asyncio.to_thread), never on the event loop.
+    Cancelling the task awaiting any method cancels the requests it started.
+
+    Usage:
+        async with AsyncGeoClient(geoapify_key, foursquare_key) as client:
+            coords = await client.geocode("Wuye, Abuja")
+    """
+
+    def __init__(self, geoapify_key: str, foursquare_key: str | None = None, max_connections: int = 100,
+                 max_per_host: int = 20, timeout: float = 10.0, max_retries: int = 3,
+                 finder: BusinessFinder | None = None) -> None:
+        """
+        Initialize the client (the HTTP session is opened by `async with` or `open()`).
+
+        Args:
+            geoapify_key (str): Geoapify API key.
+            foursquare_key (str, optional): Foursquare API key, needed for ratings.
+            max_connections (int): Total simultaneous connections across all hosts.
+            max_per_host (int): Simultaneous connections to a single host.
+            timeout (float): Timeout in seconds for each request.
+            max_retries (int): Attempts per request on rate limits, server and network errors.
+            finder (BusinessFinder, optional): Finder whose Places cache and backend searches use;
+                defaults to one set up from Config, like the GUI's.
+        """
+        self.geoapify_key = geoapify_key
+        self.foursquare_key = foursquare_key
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.max_retries = max_retries
+
+        # Reuse the sync finder for request parameters, result parsing, the Places cache and the backend choice
+        if finder is None:
+            backend = get_config().get_places_backend_settings()["backend"]
+            finder = BusinessFinder(geoapify_key, places_cache=get_places_cache(),
+                                    poi_index=get_poi_index() if backend != "geoapify" else None, backend=backend)
+        self._finder = finder
+        self._session = None
+
+    async def open(self) -> "AsyncGeoClient":
+        """Open the shared HTTP session."""
+        if self._session is None:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=self.max_per_host)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"Accept-Encoding": "gzip, deflate"}
+            )
+        return self
+
+    async def close(self) -> None:
+        """Close the HTTP session and its connections."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self) -> "AsyncGeoClient":
+        return await self.open()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def get_json(self, url: str, params: dict | None = None, headers: dict | None = None) -> dict:
+        """
+        GET a JSON document, retrying rate limits, server and network errors with exponential backoff.
+
+        Each attempt waits for a token from the shared rate limiter (the same buckets the
+        synchronous path uses). A 429 pauses the endpoint for its Retry-After time and retries.
+        Other 4xx answers (bad API key, unknown place) are raised at once.
+
+        Args:
+            url (str): Endpoint URL
+            params (dict, optional): Query string parameters
+            headers (dict, optional): Extra request headers
+
+        Returns:
+            dict: Parsed JSON body.
+
+        Raises:
+            aiohttp.ClientError: If the request keeps failing or returns an error status.
+        """
+        await self.open()
+        provider, endpoint = classify_url(url)
+        limiter = get_rate_limiter()
+
+        metrics = get_metrics()
+        delay = 1.0
+        for attempt in range(1, self.max_retries + 1):
+            wait = delay
+            status = "error"
+            try:
+                await limiter.acquire_async(provider, endpoint)
+                start = time.perf_counter()
+                try:
+                    async with self._session.get(url, params=params, headers=headers) as response:
+                        status = response.status
+                        if response.status == 429:
+                            wait = max(delay, parse_retry_after(response.headers.get("Retry-After")))
+                            limiter.pause(provider, endpoint, wait)
+                        response.raise_for_status()
+                        return await response.json(content_type=None)
+                finally:
+                    metrics.observe_request(provider, endpoint, status, time.perf_counter() - start)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                if not is_retryable(e):
+                    raise
+                if attempt == self.max_retries:
+                    logging.error(f"Max retries ({self.max_retries}) exceeded for GET {url}")
+                    raise
+                metrics.count_retry(f"{provider}.{endpoint}")
+                logging.warning(f"Retry {attempt}/{self.max_retries} for GET {url} after {wait}s: {e}")
+                await asyncio.sleep(wait)
+                delay *= 2
+
+    async def geocode(self, address: str) -> dict | None:
+        """
+        Async version of LocationManager.geocode_address (same cache, same result format).
+
+        Args:
+            address (str): The address to geocode.
+
+        Returns:
+            dict or None: {'lat', 'lon', 'address'}, or None if not found or on network failure.
+        """
+        cache_key = normalize_address(address)
+        if not cache_key:
+            return None
+
+        cache = LocationManager.get_cache()
+        cached = await asyncio.to_thread(cache.get, cache_key)
+        if cached is not MISS:
+            return cached
+
+        try:
+            data = await self.get_json(LocationManager.GEOCODE_ENDPOINT,
+                                       LocationManager.geocode_params(address, self.geoapify_key))
+            result = LocationManager.parse_geocode(data)
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            print(f"Network error during geocoding: {e}")
+            return None
+
+        await asyncio.to_thread(cache.set, cache_key, result, negative=result is None)
+        return result
+
+    async def search_businesses(self, coords: Tuple[float, float], business_type: str, radius: int = 10000,
+                                max_results: int = 20, page_size: int = 20) -> List[Business]:
+        """
+        Async version of BusinessFinder.search_businesses (pages are fetched one after another).
+
+        Uses the finder's Places cache and backend the same way: the POI index answers what it
+        can, the Places cache what it holds, and only the rest goes to Geoapify.
+
+        Args:
+            coords (tuple): (latitude, longitude) of the search center.
+            business_type (str): Geoapify category.
+            radius (int): Search radius in meters.
+            max_results (int): Maximum number of businesses to return.
+            page_size (int): Features requested per page.
+
+        Returns:
+            list: Business objects.
+        """
+        finder = self._finder
+        local = await asyncio.to_thread(finder.local_features, coords, business_type, radius, max_results)
+        if local is not None:
+            return finder.parse_results({"features": local}, coords)
+
+        if finder.places_cache is not None:
+            cached = finder.places_cache.lookup(business_type, coords, radius, max_results, page_size)
+            if cached is not None:
+                return finder.parse_results({"features": cached}, coords)
+
+        lat, lon = coords
+        features = []
+        try:
+            while len(features) < max_results:
+                limit = min(page_size, max_results - len(features))
+                params = finder.places_params(business_type, f"circle:{lon},{lat},{radius}",
+                                              f"proximity:{lon},{lat}", limit, len(features))
+                page = (await self.get_json(BusinessFinder.PLACES_ENDPOINT, params)).get("features") or []
+                features.extend(page)
+                if len(page) < limit:
+                    break
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logging.error(f"Failed, to search businesses from Geoapify: {e}")
+            if finder.backend == "auto":
+                # Offline fallback, as in the sync path
+                features = await asyncio.to_thread(finder.poi_index.search, business_type, coords, radius,
+                                                   max_results) or features
+        else:
+            # Only complete searches are cached, as in the sync path
+            if finder.places_cache is not None:
+                finder.places_cache.store(business_type, coords, radius, max_results, features)
+
+        return finder.parse_results({"features": features}, coords)
+
+    async def get_directions(self, business: Business, start_coords: Tuple[float, float],
+                             mode: str = "walk") -> list | str:
+        """
+        Async version of Business.get_directions (same route cache).
+
+        Args:
+            business (Business): Destination.
+            start_coords (tuple): Starting (latitude, longitude).
+            mode (str): Travel mode ('walk', 'drive', 'bike').
+
+        Returns:
+            list or str: Step instructions, or an error message.
+        """
+        end = (business.latitude, business.longitude)
+        cache = get_route_cache()
+        key = route_key(start_coords, end, mode)
+
+        feature = await asyncio.to_thread(cache.get, key)
+        if feature is MISS:
+            try:
+                data = await self.get_json(ROUTING_ENDPOINT, route_params(start_coords, end, mode, self.geoapify_key))
+            except Exception as e:
+                return f"Error while fetching directions: {str(e)}"
+            features = data.get("features") or []
+            feature = features[0] if features else None
+            await asyncio.to_thread(cache.set, key, feature, negative=feature is None)
+
+        if feature is None:
+            return ["Directions aren't available."]
+        return Business.parse_directions({"features": [feature]})
+
+    async def fetch_rating(self, business: Business) -> float | None:
+        """
+        Async version of Business.fetch_rating_from_foursquare (same rating cache).
+
+        Args:
+            business (Business): Business to rate; its rating is set in place when found.
+
+        Returns:
+            float or None: Rating, or None if unavailable.
+        """
+        if business.rating is not None:
+            return business.rating
+        if await asyncio.to_thread(business.load_cached_rating) or not self.foursquare_key:
+            return business.rating
+
+        headers = Business.foursquare_headers(self.foursquare_key)
+        try:
+            search = await self.get_json(Business.FSQ_SEARCH_ENDPOINT, business.foursquare_search_params(), headers)
+            results = search.get("results", [])
+            if not results:
+                return await asyncio.to_thread(business.store_rating, None, "no_match")
+
+            details = await self.get_json(Business.FSQ_DETAILS_ENDPOINT.format(fsq_id=results[0]["fsq_id"]),
+                                          headers=headers)
+            rating = details.get("rating")
+            return await asyncio.to_thread(business.store_rating, rating or None, "rated" if rating else "no_rating")
+        except (aiohttp.ClientError, asyncio.TimeoutError, KeyError, IndexError) as e:
+            print(f"API request failed: {e}")
+            return None
+
+    async def enrich_ratings(self, businesses: List[Business], max_concurrency: int = 16) -> int:
+        """
+        Fetch ratings for many businesses concurrently on this event loop.
+
+        Args:
+            businesses (list): Business objects, updated in place.
+            max_concurrency (int): Maximum rating lookups in flight at once.
+
+        Returns:
+            int: Number of businesses that have a rating afterwards.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def rate(business):
+            async with semaphore:
+                return await self.fetch_rating(business)
+
+        # If the caller is cancelled, gather cancels every lookup still in flight
+        results = await asyncio.gather(*(rate(b) for b in businesses))
+        return sum(1 for rating in results if rating is not None)
@@ -0,0 +1,295 @@
+# core/batch.py
+import csv
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Iterable, Iterator, List, NamedTuple
+
+from config.config import get_config
+from core.business import Business
+from core.business_finder import BusinessFinder
+from core.constant import match_category
+from core.enrichment import create_rating_enricher
+from core.location_manager import LocationManager
+from core.poi_index import get_poi_index
+
+# Columns written for every business found (CSV header / JSONL keys)
+OUTPUT_FIELDS = ["task_id", "location", "category", "name", "address", "latitude", "longitude",
+                 "distance_m", "rating", "phone", "email", "website", "place_id"]
+
+
+class BatchTask(NamedTuple):
+    """One search of the sweep: a location (address or "lat,lon") and a category."""
+    location: str
+    category: str
+
+    @property
+    def task_id(self) -> str:
+        """Stable identity used in the checkpoint file."""
+        return f"{self.location.strip().casefold()}|{self.category.strip().casefold()}"
+
+
+def read_tasks(path: str, categories: Iterable[str] = ()) -> List[BatchTask]:
+    """
+    Read the sweep definition from a CSV or JSONL file.
+
+    Each row needs a `location` (an address, or "lat,lon") or `lat`/`lon` columns. Its
+    categories come from a `category` column or a `categories` column ("hotel;clinic" in CSV,
+    a list in JSONL); the `categories` argument is crossed with every location as well.
+
+    Args:
+        path (str): Input file (.csv or .jsonl).
+        categories (iterable): Categories to search at every location.
+
+    Returns:
+        list: BatchTask objects, duplicates removed, in file order.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.lower().endswith((".jsonl", ".ndjson")):
+            rows = [json.loads(line) for line in f if line.strip()]
+        else:
+            rows = list(csv.DictReader(f))
+
+    tasks = {}
+    for row in rows:
+        location = row.get("location") or ""
+        if not location and row.get("lat") not in (None, "") and row.get("lon") not in (None, ""):
+            location = f"{row['lat']},{row['lon']}"
+        if not location:
+            logging.warning(f"Skipping input row without a location: {row}")
+            continue
+
+        row_categories = row.get("categories") or []
+        if isinstance(row_categories, str):
+            row_categories = row_categories.split(";")
+        if row.get("category"):
+            row_categories = [row["category"], *row_categories]
+
+        for category in [*row_categories, *categories]:
+            if category and category.strip():
+                task = BatchTask(str(location).strip(), category.strip())
+                tasks.setdefault(task.task_id, task)
+    return list(tasks.values())
+
+
+def parse_coordinates(location: str) -> tuple | None:
+    """Return (lat, lon) if the location is written as "lat,lon", else None."""
+    parts = location.split(",")
+    if len(parts) != 2:
+        return None
+    try:
+        lat, lon = float(parts[0]), float(parts[1])
+    except ValueError:
+        return None
+    return (lat, lon) if -90 <= lat <= 90 and -180 <= lon <= 180 else None
+
+
+class ResultWriter:
+    """Appends result rows to a JSONL or CSV file as tasks complete (flushed after every task)."""
+
+    def __init__(self, path: str) -> None:
+        """
+        Args:
+            path (str): Output file; .csv writes CSV, anything else writes JSONL. Existing rows are kept.
+        """
+        self.path = path
+        self.is_csv = path.lower().endswith(".csv")
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        write_header = self.is_csv and (not os.path.exists(path) or os.path.getsize(path) == 0)
+        self._file = open(path, "a", newline="", encoding="utf-8")
+        self._csv = csv.DictWriter(self._file, fieldnames=OUTPUT_FIELDS) if self.is_csv else None
+        if write_header:
+            self._csv.writeheader()
+
+    def write(self, rows: List[dict]) -> None:
+        """Append rows and flush them to disk."""
+        for row in rows:
+            if self._csv:
+                self._csv.writerow(row)
+            else:
+                self._file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class Checkpoint:
+    """Append-only list of finished task ids, so an interrupted sweep can resume where it stopped."""
+
+    def __init__(self, path: str) -> None:
+        """
+        Args:
+            path (str): Checkpoint file (created if missing).
+        """
+        self.path = path
+        self.done = set()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.done = {line.rstrip("\n") for line in f if line.strip()}
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+
+    def mark_done(self, task_id: str) -> None:
+        """Record a finished task (call only after its results were written)."""
+        self._file.write(task_id + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.done.add(task_id)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class BatchRunner:
+    """
+    Runs a location x category sweep without the GUI.
+
+    Each task goes through LocationManager -> BusinessFinder -> rating enricher on a worker pool.
+    Results are written by the calling thread as tasks finish, and a task is checkpointed only
+    after its rows are on disk, so a crash can at worst repeat the tasks that were in flight.
+    """
+
+    def __init__(self, geoapify_key: str, foursquare_key: str | None = None, workers: int = 4,
+                 radius: int | None = None, max_results: int | None = None, ratings: bool = True) -> None:
+        """
+        Args:
+            geoapify_key (str): Geoapify API key.
+            foursquare_key (str, optional): Foursquare API key (ratings are skipped without it).
+            workers (int): Tasks processed at the same time.
+            radius (int, optional): Search radius in meters (Config default if None).
+            max_results (int, optional): Businesses per task (Config default if None).
+            ratings (bool): Fetch Foursquare ratings for the results.
+        """
+        self.config = get_config()
+        settings = self.config.get_default_settings()
+
+        self.geoapify_key = geoapify_key
+        self.workers = workers
+        self.radius = radius or settings["radius"]
+        self.max_results = max_results or settings["max_results"]
+        self.page_size = settings["page_size"]
+
+        backend = self.config.get_places_backend_settings()["backend"]
+        self.finder = BusinessFinder(geoapify_key, poi_index=get_poi_index() if backend != "geoapify" else None,
+                                     backend=backend)
+        self.enricher = create_rating_enricher(foursquare_key) if ratings and foursquare_key else None
+        self.stats = {"tasks": 0, "skipped": 0, "completed": 0, "failed": 0, "businesses": 0}
+
+    def run_task(self, task: BatchTask) -> List[dict]:
+        """
+        Run one search.
+
+        Args:
+            task (BatchTask): Location and category.
+
+        Returns:
+            list: One output row per business found.
+
+        Raises:
+            ValueError: If the location cannot be geocoded or the category is not recognized.
+        """
+        coords = parse_coordinates(task.location)
+        if coords is None:
+            result = LocationManager.geocode_address(task.location, self.geoapify_key)
+            if not result:
+                raise ValueError(f"Location not found: {task.location}")
+            coords = (result["lat"], result["lon"])
+
+        category = match_category(task.category)
+        if not category:
+            raise ValueError(f"Business type not recognized: {task.category}")
+
+        businesses = self.finder.search_businesses(coords, category, radius=self.radius,
+                                                   max_results=self.max_results, page_size=self.page_size)
+        businesses = self.finder.sort_by_distance(businesses)
+        if self.enricher:
+            self.enricher.enrich(businesses)
+        return [self.to_row(task, category, business) for business in businesses]
+
+    @staticmethod
+    def to_row(task: BatchTask, category: str, business: Business) -> dict:
+        """Flatten a business into an output row."""
+        return {
+            "task_id": task.task_id,
+            "location": task.location,
+            "category": category,
+            "name": business.name,
+            "address": business.address,
+            "latitude": business.latitude,
+            "longitude": business.longitude,
+            "distance_m": business.distance_m,
+            "rating": business.rating,
+            "phone": business.phone,
+            "email": business.email,
+            "website": business.website,
+            "place_id": business.place_id,
+        }
+
+    def iter_results(self, tasks: List[BatchTask], checkpoint: Checkpoint | None = None) -> Iterator[tuple]:
+        """
+        Run tasks on the worker pool and yield (task, rows, error) as each one finishes.
+
+        Args:
+            tasks (list): Tasks to run.
+            checkpoint (Checkpoint, optional): Tasks already marked done there are skipped.
+
+        Yields:
+            tuple: (BatchTask, list of rows, Exception or None)
+        """
+        pending = [task for task in tasks if not checkpoint or task.task_id not in checkpoint.done]
+        self.stats["tasks"] += len(tasks)
+        self.stats["skipped"] += len(tasks) - len(pending)
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="batch") as executor:
+            futures = {executor.submit(self.run_task, task): task for task in pending}
+            for future in as_completed(futures):
+                task = futures[future]
+                try:
+                    yield task, future.result(), None
+                except Exception as e:
+                    yield task, [], e
+
+    def run(self, tasks: List[BatchTask], output_path: str, checkpoint_path: str | None = None) -> dict:
+        """
+        Run a sweep, streaming rows to output_path and recording progress in checkpoint_path.
+
+        Failed tasks are logged and not checkpointed, so a rerun retries them.
+
+        Args:
+            tasks (list): Tasks to run.
+            output_path (str): JSONL or CSV output file (appended to).
+            checkpoint_path (str, optional): Checkpoint file; resume by running again with the same one.
+
+        Returns:
+            dict: Counts of tasks, skipped, completed, failed and businesses written.
+        """
+        writer = ResultWriter(output_path)
+        checkpoint = Checkpoint(checkpoint_path) if checkpoint_path else None
+        try:
+            for task, rows, error in self.iter_results(tasks, checkpoint):
+                if error is not None:
+                    self.stats["failed"] += 1
+                    logging.error(f"Batch task {task.task_id} failed: {error}")
+                    continue
+
+                writer.write(rows)
+                if checkpoint:
+                    checkpoint.mark_done(task.task_id)
+                self.stats["completed"] += 1
+                self.stats["businesses"] += len(rows)
+                logging.info(f"Batch task {task.task_id}: {len(rows)} businesses "
+                             f"({self.stats['completed'] + self.stats['failed']}/{self.stats['tasks'] - self.stats['skipped']})")
+        finally:
+            writer.close()
+            if checkpoint:
+                checkpoint.close()
+            if self.enricher:
+                self.enricher.shutdown()
+        return dict(self.stats)
@@ -1,13 +1,33 @@
 import requests #Used to make HTTP requsets to our API
+import threading
 from unicodedata import category
 from haversine import haversine
 from typing import Tuple, Optional
+from config.cache import MISS, SQLiteTTLCache
+from config.config import get_config
+from config.http import http_get
+from core.routing import fetch_route
+
+# Guards creation of the shared rating cache (enrichment, prefetch and batch threads all use it)
+_rating_cache_lock = threading.Lock()
 
 
 class Business:
     """Represents a single business entity with details like name, address, and coordinates."""
 
-    def __init__(self, name, address, coordinates,distance_m, category, rating=None, phone = None, email = None, website  = None):
+    # Fixed attribute layout: no per-instance __dict__, which matters once we hold thousands of businesses
+    __slots__ = ("name", "address", "latitude", "longitude", "distance_m", "category", "rating",
+                 "phone", "email", "website", "place_id", "travel_time_s", "travel_distance_m", "travel_mode")
+
+    # Provider endpoints
+    FSQ_SEARCH_ENDPOINT = get_config().get_endpoint("foursquare", "/v3/places/search")
+    FSQ_DETAILS_ENDPOINT = get_config().get_endpoint("foursquare", "/v3/places/{fsq_id}")
+
+    # Shared Foursquare rating cache, created on first use (see get_rating_cache)
+    rating_cache = None
+
+    def __init__(self, name, address, coordinates,distance_m, category, rating=None, phone = None, email = None, website  = None,
+                 place_id = None):
         """Initialize a business object with provided details.
 
         Args:
@@ -21,6 +41,7 @@ class Business:
             phone (str, optional): Phone number of the business.
             email (str, optional): Email address of the business.
             website (str, optional): Website URL of the business.
+            place_id (str, optional): Geoapify place_id, used as a stable identity for caching.
         """
         self.name  = name
         self.address = address
@@ -31,6 +52,52 @@ class Business:
         self.phone = phone
         self.email = email
         self.website = website
+        self.place_id = place_id
+
+        # Filled in by BusinessFinder.sort_by_travel_time (road time/distance for travel_mode)
+        self.travel_time_s = None
+        self.travel_distance_m = None
+        self.travel_mode = None
+
+    @classmethod
+    def get_rating_cache(cls) -> SQLiteTTLCache:
+        """
+        Return the process-wide Foursquare rating cache, creating it from the Config settings on first use.
+
+        Returns:
+            SQLiteTTLCache: Cache of place key -> {"status": ..., "rating": ...}.
+        """
+        if cls.rating_cache is None:
+            with _rating_cache_lock:
+                if cls.rating_cache is None:
+                    cls.rating_cache = SQLiteTTLCache(**get_config().get_cache_settings("ratings"))
+        return cls.rating_cache
+
+    def place_key(self) -> str:
+        """
+        Stable identity of this place, used as the rating cache key.
+
+        Returns:
+            str: The Geoapify place_id if known, otherwise the lower-cased name plus coordinates rounded to ~11 m.
+        """
+        if self.place_id:
+            return f"geoapify:{self.place_id}"
+        return f"name:{self.name.casefold().strip()}@{self.latitude:.4f},{self.longitude:.4f}"
+
+    def load_cached_rating(self) -> bool:
+        """
+        Fill in the rating from the rating cache, without touching the network.
+
+        Returns:
+            bool: True if the cache had an answer (a rating, or an explicit "no match"/"no rating").
+        """
+        cached = Business.get_rating_cache().get(self.place_key())
+        if cached is MISS:
+            return False
+
+        if cached["rating"] is not None:
+            self.set_rating(cached["rating"])
+        return True
 
     def set_rating(self, rating) -> None:
         """
@@ -71,86 +138,78 @@ class Business:
         Returns:
             list or string: List of step instruction strings, or a list with a single error message.
         """
-        # API endpoint for Geoapify routing
-        url = "https://api.geoapify.com/v1/routing"
-
-        # Made a query parameters variable to include the start and destination coordinates, mode of travel, and API key
-        query_param ={
-            # this defines our
-            "waypoints": f"{start_cords[0]},{start_cords[1]}|{self.latitude},{self.longitude}",
-            "mode" : mode,
-            "apiKey": api_key
-        }
-
         try:
-            # Use Get request to ask Geoapify for directions
-            response  = requests.get(url, params=query_param)
+            # Routes come from the shared route cache when this trip (snapped to ~11 m) was fetched recently
+            feature = fetch_route(start_cords, (self.latitude, self.longitude), mode, api_key)
+        except requests.exceptions.HTTPError as e:
+            return [f"Error: Received status code {e.response.status_code} from Geoapify"]
+        except Exception as e:
+            return f"Error while fetching directions: {str(e)}"
 
-            # Check if the request was successful
-            if response.status_code != 200:
-                return [f"Error: Received status code {response.status_code} from Geoapify"]
+        if feature is None:
+            return ["Directions aren't available."]
+        return Business.parse_directions({"features": [feature]})
 
-            data = response.json() # Parse the JSON (make it in a format python will understand)
+    @staticmethod
+    def parse_directions(data: dict) -> list:
+        """Turn a Geoapify routing response into a list of step instructions.
 
-            # Checking if the response contains valid directions
-            if "features" in data and data["features"]:
-                steps = data["features"][0]["properties"]["legs"][0].get("steps", [])
-                if not steps:
-                    return ["No route steps found."]
+        Args:
+            data (dict): Parsed routing response.
 
-                return [step.get("instruction", {}).get("text", "No instruction") for step in steps]
+        Returns:
+            list: Step instruction strings, or a list with a single message if there is no route.
+        """
+        # Checking if the response contains valid directions
+        if "features" in data and data["features"]:
+            steps = data["features"][0]["properties"]["legs"][0].get("steps", [])
+            if not steps:
+                return ["No route steps found."]
 
-            return ["Directions aren't available."]
-        except Exception as e:
-            return f"Error while fetching directions: {str(e)}"
+            return [step.get("instruction", {}).get("text", "No instruction") for step in steps]
+
+        return ["Directions aren't available."]
 
-    def fetch_rating_from_foursquare(self, fsq_api_key) -> float|None:
+    def fetch_rating_from_foursquare(self, fsq_api_key, timeout: float = 10.0) -> float|None:
         """
         Using Foursquare API to search for this business and fetch its user rating (if available).
 
+        The rating cache is checked first. Ratings, "no match" and "no rating" answers are all cached;
+        network and HTTP errors are not.
+
         Args:
             fsq_api_key (str): Foursquare API key
+            timeout (float): Timeout in seconds for each of the two HTTP requests
 
         Returns:
             float or None: Rating value or None if not found.
         """
-        # Searching for the business on FOURSQUARE by name and location
-        search_url = "https://api.foursquare.com/v3/places/search"
-        headers = {
-            "Accept": "application/json",
-            "Authorization": fsq_api_key # API key for authentication
-        }
+        cached = Business.get_rating_cache().get(self.place_key())
+        if cached is not MISS:
+            if cached["rating"] is not None:
+                self.set_rating(cached["rating"])
+            return cached["rating"]
 
-        params = {
-            "query": self.name, # Search by business name
-            "ll": f"{self.latitude}, {self.longitude}", # Lat/Lon Location for precise matching
-            "limit": 1 # TO get the closest match
-        }
+        headers = Business.foursquare_headers(fsq_api_key)
 
         try:
-            # Send search request to Foursquare
-            search_response = requests.get(search_url, headers=headers, params= params)
-            search_data = search_response.json()
-            results = search_data.get("results", [])
+            # Searching for the business on FOURSQUARE by name and location
+            search_response = http_get(Business.FSQ_SEARCH_ENDPOINT, headers=headers,
+                                       params=self.foursquare_search_params(), timeout=timeout)
+            search_response.raise_for_status() # Don't cache auth or quota errors as "no match"
+            results = search_response.json().get("results", [])
 
             if not results:
-                return None # When there's no matching business found
-
-            # Extract the Foursquare ID of the matched business
-            fsq_id = results[0]["fsq_id"]
+                return self.store_rating(None, "no_match") # When there's no matching business found
 
-            # Using the fdq_id to fetch the business details
-            details_urls = f"https://api.foursquare.com/v3/places/{fsq_id}"
-            details_response = requests.get(details_urls, headers=headers)
-            details_data = details_response.json()
+            # Using the fsq_id of the matched business to fetch its details
+            details_url = Business.FSQ_DETAILS_ENDPOINT.format(fsq_id=results[0]["fsq_id"])
+            details_response = http_get(details_url, headers=headers, timeout=timeout)
+            details_response.raise_for_status()
 
             # Extract the ratings field if it exists
-            rating = details_data.get("rating")
-            if rating:
-                self.set_rating(rating) # Update the business Object with the fetched rating
-                return rating
-
-            return None # No rating in the response
+            rating = details_response.json().get("rating")
+            return self.store_rating(rating or None, "rated" if rating else "no_rating")
         except requests.exceptions.RequestException as e:
             print(f"API request failed: {e}")
         except KeyError as e:
@@ -161,17 +220,90 @@ class Business:
             print(f"Unexpected error: {e}")
         return None
 
+    @staticmethod
+    def foursquare_headers(fsq_api_key) -> dict:
+        """Request headers for the Foursquare Places API."""
+        return {
+            "Accept": "application/json",
+            "Authorization": fsq_api_key # API key for authentication
+        }
+
+    def foursquare_search_params(self) -> dict:
+        """Query parameters for finding this business on Foursquare."""
+        return {
+            "query": self.name, # Search by business name
+            "ll": f"{self.latitude}, {self.longitude}", # Lat/Lon Location for precise matching
+            "limit": 1 # TO get the closest match
+        }
+
+    def store_rating(self, rating, status: str, ttl: float | None = None) -> float|None:
+        """
+        Record the outcome of a rating lookup on this business and in the rating cache.
+
+        Args:
+            rating (float or None): Rating found, or None.
+            status (str): "rated", "no_match" or "no_rating".
+            ttl (float, optional): Seconds to cache it, instead of the cache's (negative) TTL.
+
+        Returns:
+            float or None: The rating, for convenient returning.
+        """
+        Business.get_rating_cache().set(self.place_key(), {"status": status, "rating": rating}, negative=rating is None,
+                                        ttl=ttl)
+        if rating is not None:
+            self.set_rating(rating) # Update the business Object with the fetched rating
+        return rating
+
     @classmethod # showing that this method belongs the class not just an individual object
-    def from_geoapify(cls, data:dict, user_coords:Optional[Tuple[float, float]] = None):
+    def from_geoapify(cls, data:dict, user_coords:Optional[Tuple[float, float]] = None,
+                      fallback_distance:Optional[float] = None):
         """
         Factory method to create a Business object directly from Geoapify API response.
 
         Args:
             data (dict): A single Geoapify result (from features list).
             user_coords (tuple, optional): User's (lat, lon) for distance calculation fallback.
+            fallback_distance (float, optional): Precomputed distance in meters to use if the response has none.
         Returns:
             Business: A new Business instance.
         """
+        return cls(**cls.geoapify_fields(data, user_coords, fallback_distance))
+
+    @staticmethod
+    def most_specific_category(categories: list) -> str:
+        """
+        Pick the deepest category in the family of the first one.
+
+        Geoapify lists a place's categories broadest first (["healthcare", "healthcare.pharmacy"]),
+        so the first entry alone says "healthcare" where the search was for pharmacies.
+
+        Args:
+            categories (list): Category strings of one Geoapify feature.
+        Returns:
+            str: The most specific category (the first one wins ties), or "unknown" if there are none.
+        """
+        if not categories:
+            return "unknown"
+        family = categories[0].split(".")[0]
+        related = [c for c in categories if c.split(".")[0] == family]
+        return max(related, key=lambda c: c.count("."))
+
+    @staticmethod
+    def geoapify_fields(data:dict, user_coords:Optional[Tuple[float, float]] = None,
+                        fallback_distance:Optional[float] = None) -> dict:
+        """
+        Extract the Business fields from a single Geoapify feature.
+
+        Shared by from_geoapify and BusinessTable so both read the response the same way.
+
+        Args:
+            data (dict): A single Geoapify result (from features list).
+            user_coords (tuple, optional): User's (lat, lon) for distance calculation fallback.
+            fallback_distance (float, optional): Precomputed distance in meters (e.g. from a batch
+                computation) to use instead of calling haversine for this one feature.
+        Returns:
+            dict: Keyword arguments for the Business constructor.
+        """
 
         # Get the 'properties' section which contains most of the business info
         properties = data.get("properties", {}) # puts all the business info inside a property section
@@ -185,21 +317,26 @@ class Business:
         # Distance from user location using geoapify provides this automatically
         distance  = properties.get("distance")
 
-        # if not provided, compute it manually
-        if distance is None and user_coords:
+        # if not provided, use the batch-computed value or compute it manually
+        if distance is None and fallback_distance is not None:
+            distance = fallback_distance
+        elif distance is None and user_coords:
             distance = haversine(user_coords, (lat, lon)) * 1000  # in meters
         elif distance is None:
             distance = 0  # fallback if no user_coords
 
-        # Trying to extract the business category
-        business_category = properties.get("categories", ["unknown"])[0].split("/")[-1]
+        # Trying to extract the business category (the most specific one, e.g. "healthcare.pharmacy")
+        business_category = Business.most_specific_category(properties.get("categories", ["unknown"])).split("/")[-1]
 
         # Fetching additional contact details if available
         phone = properties.get("contact", {}).get("phone")
         email = properties.get("contact", {}).get("email")
         website = properties.get("contact", {}).get("website")
 
-        return cls(
+        # Geoapify's own identifier for the place (stable across searches)
+        place_id = properties.get("place_id")
+
+        return dict(
             name=name,
             address=address,
             coordinates=(lat, lon),
@@ -207,5 +344,6 @@ class Business:
             category=business_category,
             phone=phone,
             email=email,
-            website=website
-        )
\ No newline at end of file
+            website=website,
+            place_id=place_id
+        )
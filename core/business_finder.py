@@ -1,76 +1,362 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from core.business import Business
-from typing import List, Tuple, Any
-from config.utils import make_api_request, log_error, validate_api_key
+from core.business_table import BusinessTable
+from core.geo import distances_from, feature_coordinates
+from core.places_cache import PlacesCache
+from core.poi_index import POIIndex, is_mapped_category
+from core.travel_matrix import TravelTimeMatrix, create_travel_matrix
+from typing import Iterator, List, Tuple, Any
+from config.config import get_config
+from config.metrics import get_metrics
+from config.utils import make_api_request, log_error, time_function, validate_api_key
 import requests
 
 
 class BusinessFinder:
     """Manages searching for businesses near a location using an API."""
 
-    def __init__(self, api_key) -> None:
+    PLACES_ENDPOINT = get_config().get_endpoint("geoapify", "/v2/places")
+
+    def __init__(self, api_key, places_cache: PlacesCache | None = None,
+                 travel_matrix: TravelTimeMatrix | None = None, poi_index: POIIndex | None = None,
+                 backend: str = "geoapify") -> None:
         """Initialize with an API key for place search services.
 
         Args:
-            api_key (str): API key for external place search services.
+            api_key (str): API key for external place search services (may be missing with backend "local").
+            places_cache (PlacesCache, optional): Cache consulted before each search.
+            travel_matrix (TravelTimeMatrix, optional): Used by sort_by_travel_time; defaults to the one chosen in Config.
+            poi_index (POIIndex, optional): Offline POI index used by the "local" and "auto" backends.
+            backend (str): "geoapify", "local" or "auto" (see Config.places_backend).
 
         """
-        is_valid, msg = validate_api_key(api_key)
-        if not is_valid:
-            raise ValueError(f"We have a Geoapify API key Error: {msg}")
+        if backend not in ("geoapify", "local", "auto"):
+            raise ValueError(f"Unknown Places backend: {backend}")
+        if backend != "geoapify" and poi_index is None:
+            raise ValueError(f"The {backend!r} Places backend needs a POI index")
+
+        if backend != "local":
+            is_valid, msg = validate_api_key(api_key)
+            if not is_valid:
+                raise ValueError(f"We have a Geoapify API key Error: {msg}")
 
         self.api_key = api_key
+        self.places_cache = places_cache
+        self.travel_matrix = travel_matrix
+        self.poi_index = poi_index
+        self.backend = backend
 
 
-    def search_businesses(self, coords: Tuple[float, float], business_type: str, radius: int =10000) -> list[Any]:
-        """Search for businesses near the given coordinates.
+    def fetch_places_page(self, business_type: str, area_filter: str, bias: str | None = None,
+                          limit: int = 20, offset: int = 0) -> list[dict]:
+        """Fetch one page of raw Geoapify Places features.
 
         Args:
-            coords (tuple): (latitude, longitude) of the search center.
-            radius (int): Search radius in meters.
-            business_type (str): Optional filter for business type (e.g., 'restaurant').
+            business_type (str): Geoapify category (e.g., 'catering.restaurant').
+            area_filter (str): Geoapify filter, e.g. 'circle:lon,lat,radius' or 'rect:lon1,lat1,lon2,lat2'.
+            bias (str, optional): Geoapify bias, e.g. 'proximity:lon,lat'.
+            limit (int): Maximum features in this page.
+            offset (int): Number of features to skip (for paging).
 
         Returns:
-            list: List of Business objects
-        """
-        url = "https://api.geoapify.com/v2/places"
-        lat, lon = coords
+            list: Raw GeoJSON features (empty if there are none).
 
+        Raises:
+            requests.exceptions.RequestException: If the request keeps failing after retries, or
+                Geoapify answers with an error status (an error body must never read as "no places").
+        """
+        query_params = self.places_params(business_type, area_filter, bias, limit, offset)
+        response = make_api_request(BusinessFinder.PLACES_ENDPOINT, query_params)
+        response.raise_for_status()
+        data = response.json()
+        return data.get("features") or []
+
+    def places_params(self, business_type: str, area_filter: str, bias: str | None = None,
+                      limit: int = 20, offset: int = 0) -> dict:
+        """Query parameters for one Geoapify Places request (shared by the sync and async clients)."""
         query_params = {
             "categories": business_type,
-            "filter": f"circle:{lon},{lat},{radius}",
-            "bias": f"proximity:{lon},{lat}",
-            "limit": 20,
+            "filter": area_filter,
+            "limit": limit,
             "apiKey": self.api_key
         }
+        if bias:
+            query_params["bias"] = bias
+        if offset:
+            query_params["offset"] = offset
+        return query_params
 
-        try:
-            response = make_api_request(url, query_params)
-            data = response.json()
+    def iter_feature_pages(self, coords: Tuple[float, float], business_type: str, radius: int = 10000,
+                           page_size: int = 20, max_results: int = 100) -> Iterator[list[dict]]:
+        """Walk the Geoapify result pages for a search, yielding the raw features of each page.
+
+        Paging stops at the first short page or once max_results features have been yielded.
+
+        Args:
+            coords (tuple): (latitude, longitude) of the search center.
+            business_type (str): Geoapify category (e.g., 'restaurant').
+            radius (int): Search radius in meters.
+            page_size (int): Features requested per page.
+            max_results (int): Cap on the total number of features yielded.
 
-            if "features" not in data or not data["features"]:
-                print(" No businesses found.")
-                return []
-            return self.parse_results(data, coords)
+        Yields:
+            list: Raw GeoJSON features from one page.
 
+        Raises:
+            requests.exceptions.RequestException: If a page keeps failing after retries.
+        """
+        lat, lon = coords
+        offset = 0
+
+        while offset < max_results:
+            limit = min(page_size, max_results - offset)
+            features = self.fetch_places_page(
+                business_type,
+                area_filter=f"circle:{lon},{lat},{radius}",
+                bias=f"proximity:{lon},{lat}",
+                limit=limit,
+                offset=offset
+            )
+            if not features:
+                return
+
+            yield features
+
+            if len(features) < limit:
+                return # A short page means there is nothing left to fetch
+            offset += len(features)
+
+    def iter_business_pages(self, coords: Tuple[float, float], business_type: str, radius: int = 10000,
+                            page_size: int = 20, max_results: int = 100) -> Iterator[list]:
+        """Search for businesses, yielding Business objects one page at a time.
+
+        Callers can start ranking and rendering the first page while later pages are still downloading.
+        Searches the POI index (see local_features) or the Places cache can answer come as a single page.
+        Geoapify paging stops at the first short page, the first failed page, or once max_results
+        businesses have been yielded. Only searches that finish are stored in the Places cache, and
+        with the "auto" backend a search that fails before its first page falls back to the index.
+
+        Args:
+            coords (tuple): (latitude, longitude) of the search center.
+            business_type (str): Geoapify category (e.g., 'restaurant'), or several separated by commas.
+            radius (int): Search radius in meters.
+            page_size (int): Features requested per page.
+            max_results (int): Cap on the total number of businesses yielded.
+
+        Yields:
+            list: Business objects from one page.
+        """
+        local = self.local_features(coords, business_type, radius, max_results)
+        if local is not None:
+            yield self.parse_results({"features": local}, coords)
+            return
+
+        if self.places_cache is not None:
+            cached = self.places_cache.lookup(business_type, coords, radius, max_results, page_size)
+            if cached is not None:
+                yield self.parse_results({"features": cached}, coords)
+                return
+
+        features = []
+        try:
+            for page in self.iter_feature_pages(coords, business_type, radius, page_size, max_results):
+                features.extend(page)
+                yield self.parse_results({"features": page}, coords)
         except Exception as e:
             log_error(e, "Failed, to search businesses from Geoapify")
-            return []
+            if self.backend == "auto" and not features:
+                # Offline fallback: whatever the local index has around here beats nothing
+                fallback = self.poi_index.search(business_type, coords, radius, max_results)
+                if fallback:
+                    yield self.parse_results({"features": fallback}, coords)
+        else:
+            # Only cache searches that finished, so a failed page never looks like "no more results"
+            if self.places_cache is not None:
+                self.places_cache.store(business_type, coords, radius, max_results, features)
+
+    def local_features(self, coords: Tuple[float, float], business_type: str, radius: int,
+                       max_results: int) -> list | None:
+        """Features the offline POI index answers a search with, or None if Geoapify should be asked.
+
+        The "local" backend always answers from the index. "auto" does inside an imported region,
+        unless the category has no OSM mapping or nothing was found locally (tags missing from the extract).
+
+        Args:
+            coords (tuple): (latitude, longitude) of the search center.
+            business_type (str): Geoapify category, or several separated by commas.
+            radius (int): Search radius in meters.
+            max_results (int): Maximum number of features.
+
+        Returns:
+            list or None: Geoapify-style features, or None.
+        """
+        if self.backend == "local":
+            return self.poi_index.search(business_type, coords, radius, max_results)
+        if self.backend == "auto" and is_mapped_category(business_type) and self.poi_index.covers(coords, radius):
+            return self.poi_index.search(business_type, coords, radius, max_results) or None
+        return None
+
+    @time_function
+    def search_businesses(self, coords: Tuple[float, float], business_type: str, radius: int =10000,
+                          max_results: int = 20, page_size: int = 20) -> list[Any]:
+        """Search for businesses near the given coordinates and return them all at once.
+
+        A thin wrapper over iter_business_pages for callers that need the whole list (batch runs,
+        benchmarks). If a Places cache is attached, searches it answers (same circle, or a circle
+        inside a fresh, complete cached one) never touch the network. Searches the POI index can
+        answer (see local_features) never reach Geoapify either.
+
+        Args:
+            coords (tuple): (latitude, longitude) of the search center.
+            radius (int): Search radius in meters.
+            business_type (str): Optional filter for business type (e.g., 'restaurant').
+            max_results (int): Maximum number of businesses to return (fetched over several pages if needed).
+            page_size (int): Features requested per page.
+
+        Returns:
+            list: List of Business objects
+        """
+        businesses = [business for page in self.iter_business_pages(coords, business_type, radius, page_size,
+                                                                     max_results)
+                      for business in page]
+        if not businesses:
+            print(" No businesses found.")
+        return businesses
+
+    @time_function
+    def search_categories(self, coords: Tuple[float, float], categories: List[str], radius: int = 10000,
+                          max_results: int = 20, page_size: int = 20, strategy: str = "batched",
+                          max_workers: int = 4) -> List[Business]:
+        """Search several categories at once and return one merged list, nearest first.
+
+        "batched" sends every category in a single comma-separated Geoapify request, which
+        ranks them together by the proximity bias, so it costs the same as a one-category
+        search (and is cached under the sorted category list). "parallel" runs one search per
+        category on a thread pool, so each category gets its own max_results and its own
+        Places cache entry; latency is that of the slowest category.
+
+        Args:
+            coords (tuple): (latitude, longitude) of the search center.
+            categories (list): Geoapify categories (e.g. from expand_categories).
+            radius (int): Search radius in meters.
+            max_results (int): Maximum number of businesses in the merged list.
+            page_size (int): Features requested per page.
+            strategy (str): "batched" or "parallel".
+            max_workers (int): Category searches running at the same time ("parallel" only).
+
+        Returns:
+            list: Business objects without duplicates, nearest first.
+        """
+        batches = self.iter_category_pages(coords, categories, radius, max_results, page_size, strategy, max_workers)
+        return self.merge_results(list(batches), max_results)
+
+    def iter_category_pages(self, coords: Tuple[float, float], categories: List[str], radius: int = 10000,
+                            max_results: int = 20, page_size: int = 20, strategy: str = "batched",
+                            max_workers: int = 4) -> Iterator[List[Business]]:
+        """Search one or several categories, yielding Business objects as they arrive.
+
+        A single category and the "batched" strategy yield each page of the (comma-separated)
+        search; "parallel" yields each category's results as its search finishes. Batches can
+        overlap, so combine them with merge_results (search_categories does exactly that).
+
+        Args:
+            coords (tuple): (latitude, longitude) of the search center.
+            categories (list): Geoapify categories (e.g. from expand_categories).
+            radius (int): Search radius in meters.
+            max_results (int): Maximum number of businesses per search.
+            page_size (int): Features requested per page.
+            strategy (str): "batched" or "parallel".
+            max_workers (int): Category searches running at the same time ("parallel" only).
+
+        Yields:
+            list: Business objects from one page or one category.
+
+        Raises:
+            ValueError: If the strategy is unknown.
+        """
+        categories = list(dict.fromkeys(category for category in categories if category))
+        if not categories:
+            return
+        if len(categories) == 1 or strategy == "batched":
+            yield from self.iter_business_pages(coords, ",".join(sorted(categories)), radius, page_size, max_results)
+        elif strategy == "parallel":
+            search = get_metrics().bind_trace(
+                lambda category: self.search_businesses(coords, category, radius, max_results, page_size)
+            )
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(categories)),
+                                    thread_name_prefix="category-search") as executor:
+                for future in as_completed([executor.submit(search, category) for category in categories]):
+                    yield future.result()
+        else:
+            raise ValueError(f"Unknown multi-category strategy: {strategy}")
+
+    def nearest_businesses(self, coords: Tuple[float, float], business_type: str, k: int = 10,
+                           max_radius: float = 50000) -> List[Business]:
+        """The k nearest businesses of a category from the offline POI index.
+
+        Args:
+            coords (tuple): (latitude, longitude) to measure from.
+            business_type (str): Category, or several separated by commas.
+            k (int): Number of businesses wanted.
+            max_radius (float): Furthest distance searched, in meters.
+
+        Returns:
+            list: Up to k Business objects, nearest first.
+
+        Raises:
+            ValueError: If no POI index is attached.
+        """
+        if self.poi_index is None:
+            raise ValueError("k-nearest searches need a POI index (PLACES_BACKEND=local or auto)")
+        return self.parse_results({"features": self.poi_index.nearest(business_type, coords, k, max_radius)}, coords)
+
+    @staticmethod
+    def merge_results(results: List[List[Business]], max_results: int | None = None) -> List[Business]:
+        """Merge result lists into one, nearest first, keeping one copy of each place.
+
+        Places are matched by Business.place_key (the Geoapify place_id, or name and position
+        when the id is missing); the nearest copy is kept.
+
+        Args:
+            results (list): Lists of Business objects (e.g. one per category).
+            max_results (int, optional): Cap on the merged list.
 
-    def parse_results(self, data, user_coords: Tuple|None) ->  list:
+        Returns:
+            list: Business objects without duplicates, sorted by distance.
+        """
+        merged, seen = [], set()
+        for business in sorted((b for businesses in results for b in businesses), key=lambda b: b.distance_m):
+            key = business.place_key()
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(business)
+        return merged[:max_results] if max_results else merged
+
+    @time_function
+    def parse_results(self, data, user_coords: Tuple|None, as_table: bool = False) ->  list | BusinessTable:
         """Parse API response into a list of Business objects.
 
         Args:
             data (dict): Raw API response data.
             user_coords (tuple): User's (latitude, longitude) for distance calculation.
+            as_table (bool): Return a columnar BusinessTable instead of per-row objects (for large result sets).
 
         Returns:
-            list: List of (Business, distance) tuples.
+            list: List of Business objects, or a BusinessTable if as_table is True.
         """
+        if as_table:
+            return BusinessTable.from_geoapify(data, user_coords)
+
         businesses = []
+        features = data.get("features", [])
+
+        # Distances for features Geoapify didn't measure, computed for the whole page in one NumPy pass
+        fallback_distances = self.fallback_distances(features, user_coords)
 
-        for feature in data.get("features", []):
+        for feature, fallback_distance in zip(features, fallback_distances):
             try:
-                business = Business.from_geoapify(feature, user_coords)
+                business = Business.from_geoapify(feature, user_coords, fallback_distance)
                 businesses.append(business)
             except Exception as e:
                 log_error(e, "Failed to parse a business feature")
@@ -78,18 +364,64 @@ class BusinessFinder:
         return businesses
 
     @staticmethod
-    def filter_by_rating(businesses: List, min_rating: float = 2.5) -> List:
+    def fallback_distances(features: list, user_coords: Tuple|None) -> list:
+        """Compute the distance from the user to every feature in one vectorized pass.
+
+        Args:
+            features (list): Raw Geoapify features.
+            user_coords (tuple): User's (latitude, longitude), or None.
+
+        Returns:
+            list: Distance in meters per feature (None where it can't be computed).
+        """
+        if not user_coords or not features:
+            return [None] * len(features)
+
+        lats, lons = feature_coordinates(features)
+        distances = distances_from(user_coords, lats, lons)
+        return [None if d != d else float(d) for d in distances] # d != d is True only for NaN
+
+    @staticmethod
+    def rerank_by_distance(businesses: List | BusinessTable, origin: Tuple[float, float]) -> List | BusinessTable:
+        """
+        Re-measure every business from a new origin (vectorized) and sort nearest first.
+
+        Used when the user moves or when cached results are reused from a different position.
+
+        Args:
+            businesses (List[Business] or BusinessTable): Businesses to re-rank.
+            origin (tuple): New (latitude, longitude) to measure from.
+
+        Returns:
+            List[Business] or BusinessTable: Businesses sorted by their new distance, same type as the input.
+        """
+        if isinstance(businesses, BusinessTable):
+            businesses.recompute_distances(origin)
+            return businesses.sorted_by_distance()
+
+        if not businesses:
+            return []
+
+        distances = distances_from(origin, [b.latitude for b in businesses], [b.longitude for b in businesses])
+        for business, distance in zip(businesses, distances):
+            business.distance_m = round(float(distance), 2)
+        return sorted(businesses, key=lambda b: b.distance_m)
+
+    @staticmethod
+    def filter_by_rating(businesses: List | BusinessTable, min_rating: float = 2.5) -> List | BusinessTable:
         """
         Filter out businesses that have no rating or have ratings below the minimum threshold.
         Converts Foursquare ratings (out of 10) to a common /5 scale for filtering.
 
         Args:
-            businesses (List[Business]): List of business objects to filter.
+            businesses (List[Business] or BusinessTable): Business objects (or a table) to filter.
             min_rating (float): Minimum acceptable rating on a 5-point scale.
 
         Returns:
-            List[Business]: Filtered list of businesses with ratings >= min_rating.
+            List[Business] or BusinessTable: Businesses with ratings >= min_rating, same type as the input.
         """
+        if isinstance(businesses, BusinessTable):
+            return businesses.filter_by_rating(min_rating)
 
         filtered = [] # storing the filtered businesses into a list
 
@@ -101,7 +433,7 @@ class BusinessFinder:
 
                 # If it passes the minimum threshold, keep it
                 if rating_out_of_5 >= min_rating:
-                    filtered.append(Business)
+                    filtered.append(business)
 
         return filtered
 
@@ -110,11 +442,13 @@ class BusinessFinder:
         Sort a list of business by their distance from the user.
 
         Args:
-            businesses (list): List of Business objects, each with a 'distance_m' attribute.
+            businesses (list or BusinessTable): Business objects, each with a 'distance_m' attribute, or a table.
 
         Returns:
-            list: Businesses sorted from nearest to farthest.
+            list or BusinessTable: Businesses sorted from nearest to farthest, same type as the input.
         """
+        if isinstance(businesses, BusinessTable):
+            return businesses.sorted_by_distance()
 
         if not businesses:
             return []
@@ -124,5 +458,59 @@ class BusinessFinder:
 
         return sorted_businesses
 
+    def annotate_travel_times(self, businesses: List[Business], origin: Tuple[float, float],
+                              mode: str = "drive") -> bool:
+        """
+        Fill in travel_time_s, travel_distance_m and travel_mode on every business (one matrix request).
+
+        Args:
+            businesses (list): Business objects, updated in place.
+            origin (tuple): User's (latitude, longitude).
+            mode (str): Travel mode ('walk', 'drive', 'bike').
+
+        Returns:
+            bool: False if the matrix request failed (businesses are left unchanged).
+        """
+        if self.travel_matrix is None:
+            self.travel_matrix = create_travel_matrix(self.api_key)
+
+        try:
+            cells = self.travel_matrix.travel_times(origin, [(b.latitude, b.longitude) for b in businesses], mode)
+        except requests.exceptions.RequestException as e:
+            log_error(e, "Travel-time matrix failed, falling back to straight-line distance")
+            return False
+
+        for business, cell in zip(businesses, cells):
+            business.travel_mode = mode
+            business.travel_time_s = cell["time_s"] if cell else None
+            business.travel_distance_m = cell["distance_m"] if cell else None
+        return True
+
+    def sort_by_travel_time(self, businesses: List | BusinessTable, origin: Tuple[float, float],
+                            mode: str = "drive") -> List[Business]:
+        """
+        Rank businesses by real travel time from the origin, using one batched matrix request.
+
+        Each business gets travel_time_s, travel_distance_m and travel_mode filled in.
+        Businesses the router cannot reach go last, nearest first. If the matrix request
+        fails, the businesses are returned sorted by straight-line distance instead.
+
+        Args:
+            businesses (list or BusinessTable): Businesses to rank.
+            origin (tuple): User's (latitude, longitude).
+            mode (str): Travel mode ('walk', 'drive', 'bike').
+
+        Returns:
+            list: Business objects, quickest to reach first.
+        """
+        if isinstance(businesses, BusinessTable):
+            businesses = businesses.to_businesses()
+        if not businesses:
+            return []
 
+        if not self.annotate_travel_times(businesses, origin, mode):
+            return self.sort_by_distance(businesses)
 
+        unreachable = float("inf")
+        return sorted(businesses, key=lambda b: (b.travel_time_s if b.travel_time_s is not None else unreachable,
+                                                 b.distance_m if b.distance_m is not None else unreachable))
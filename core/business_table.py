@@ -0,0 +1,240 @@
+# core/business_table.py
+import math
+from array import array
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from config.utils import log_error
+from core.business import Business
+from core.geo import distances_from, feature_coordinates
+
+
+class BusinessTable:
+    """
+    Column-oriented set of businesses, for large harvested result sets.
+
+    Numeric fields live in compact typed arrays (one float per business instead of one object),
+    categories are stored as small integer codes, and sorting/filtering work on row indices
+    without creating Business objects. Rows are turned into Business objects only when needed.
+    Missing ratings are stored as NaN.
+    """
+
+    def __init__(self) -> None:
+        """Create an empty table."""
+        # Numeric columns
+        self.lat = array("d")
+        self.lon = array("d")
+        self.distance = array("d")
+        self.rating = array("d")
+        self.category_code = array("H")
+
+        # Text columns
+        self.names = []
+        self.addresses = []
+        self.place_ids = []
+        self.phones = []
+        self.emails = []
+        self.websites = []
+
+        # Category code <-> name lookup
+        self.categories = []
+        self._category_codes = {}
+
+    def __len__(self) -> int:
+        return len(self.lat)
+
+    def append(self, name: str, address: str, coordinates: Tuple[float, float], distance_m: float, category: str,
+               rating: Optional[float] = None, phone: Optional[str] = None, email: Optional[str] = None,
+               website: Optional[str] = None, place_id: Optional[str] = None) -> None:
+        """
+        Add one row. Takes the same arguments as the Business constructor.
+        """
+        self.lat.append(coordinates[0])
+        self.lon.append(coordinates[1])
+        self.distance.append(distance_m)
+        self.rating.append(math.nan if rating is None else rating)
+        self.category_code.append(self.category_to_code(category))
+
+        self.names.append(name)
+        self.addresses.append(address)
+        self.place_ids.append(place_id)
+        self.phones.append(phone)
+        self.emails.append(email)
+        self.websites.append(website)
+
+    def category_to_code(self, category: str) -> int:
+        """
+        Return the integer code for a category, assigning a new one if needed.
+
+        Args:
+            category (str): Category name.
+
+        Returns:
+            int: Category code.
+        """
+        code = self._category_codes.get(category)
+        if code is None:
+            code = len(self.categories)
+            self.categories.append(category)
+            self._category_codes[category] = code
+        return code
+
+    @classmethod
+    def from_geoapify(cls, data: dict, user_coords: Optional[Tuple[float, float]] = None) -> "BusinessTable":
+        """
+        Build a table straight from a Geoapify Places response, without creating Business objects.
+
+        Args:
+            data (dict): Raw API response data (with a 'features' list).
+            user_coords (tuple, optional): User's (lat, lon) for distance calculation fallback.
+
+        Returns:
+            BusinessTable: One row per parseable feature.
+        """
+        table = cls()
+        features = data.get("features", [])
+
+        # Fallback distances for the whole response in one vectorized pass
+        fallback = [None] * len(features)
+        if user_coords and features:
+            fallback = distances_from(user_coords, *feature_coordinates(features)).tolist()
+
+        for feature, fallback_distance in zip(features, fallback):
+            if fallback_distance is not None and fallback_distance != fallback_distance:
+                fallback_distance = None # NaN: the feature has no usable coordinates
+            try:
+                table.append(**Business.geoapify_fields(feature, user_coords, fallback_distance))
+            except Exception as e:
+                log_error(e, "Failed to parse a business feature")
+        return table
+
+    @classmethod
+    def from_businesses(cls, businesses: Iterable[Business]) -> "BusinessTable":
+        """
+        Build a table from existing Business objects.
+
+        Args:
+            businesses (iterable): Business objects.
+
+        Returns:
+            BusinessTable: One row per business.
+        """
+        table = cls()
+        for b in businesses:
+            table.append(b.name, b.address, (b.latitude, b.longitude), b.distance_m, b.category,
+                         b.rating, b.phone, b.email, b.website, b.place_id)
+        return table
+
+    def coordinates(self) -> tuple:
+        """
+        Zero-copy NumPy views of the latitude and longitude columns.
+
+        Returns:
+            tuple: (lats, lons) as float64 arrays sharing memory with the table.
+        """
+        return np.frombuffer(self.lat, dtype=np.float64), np.frombuffer(self.lon, dtype=np.float64)
+
+    def recompute_distances(self, origin: Tuple[float, float]) -> None:
+        """
+        Re-measure every row from a new origin in one vectorized pass, updating the distance column in place.
+
+        Args:
+            origin (tuple): (latitude, longitude) to measure from.
+        """
+        if not len(self):
+            return
+        distances = np.frombuffer(self.distance, dtype=np.float64)
+        distances[:] = np.round(distances_from(origin, *self.coordinates()), 2)
+
+    def take(self, indices: Sequence[int]) -> "BusinessTable":
+        """
+        Return a new table holding only the given rows, in the given order.
+
+        Args:
+            indices (sequence): Row indices.
+
+        Returns:
+            BusinessTable: The selected rows (category codes are kept as they are).
+        """
+        table = BusinessTable()
+        table.categories = list(self.categories)
+        table._category_codes = dict(self._category_codes)
+
+        for column in ("lat", "lon", "distance", "rating", "category_code"):
+            source = getattr(self, column)
+            setattr(table, column, array(source.typecode, (source[i] for i in indices)))
+        for column in ("names", "addresses", "place_ids", "phones", "emails", "websites"):
+            source = getattr(self, column)
+            setattr(table, column, [source[i] for i in indices])
+        return table
+
+    def sorted_by_distance(self) -> "BusinessTable":
+        """Return a copy of the table ordered from nearest to farthest."""
+        if not len(self):
+            return self.take([])
+        order = np.argsort(np.frombuffer(self.distance, dtype=np.float64), kind="stable")
+        return self.take(order.tolist())
+
+    def filter_by_rating(self, min_rating: float = 2.5) -> "BusinessTable":
+        """
+        Keep rated rows whose rating (Foursquare /10, converted to /5) is at least min_rating.
+
+        Args:
+            min_rating (float): Minimum acceptable rating on a 5-point scale.
+
+        Returns:
+            BusinessTable: Matching rows (unrated rows are dropped, NaN never passes the comparison).
+        """
+        threshold = min_rating * 2
+        return self.take([i for i, rating in enumerate(self.rating) if rating >= threshold])
+
+    def filter_by_category(self, category: str) -> "BusinessTable":
+        """
+        Keep rows of a single category.
+
+        Args:
+            category (str): Category name.
+
+        Returns:
+            BusinessTable: Matching rows.
+        """
+        code = self._category_codes.get(category)
+        return self.take([i for i, c in enumerate(self.category_code) if c == code])
+
+    def row(self, i: int) -> Business:
+        """
+        Materialize one row as a Business object.
+
+        Args:
+            i (int): Row index.
+
+        Returns:
+            Business: The business in that row.
+        """
+        rating = self.rating[i]
+        return Business(
+            name=self.names[i],
+            address=self.addresses[i],
+            coordinates=(self.lat[i], self.lon[i]),
+            distance_m=self.distance[i],
+            category=self.categories[self.category_code[i]],
+            rating=None if math.isnan(rating) else rating,
+            phone=self.phones[i],
+            email=self.emails[i],
+            website=self.websites[i],
+            place_id=self.place_ids[i]
+        )
+
+    def to_businesses(self, limit: Optional[int] = None) -> List[Business]:
+        """
+        Materialize the first rows as Business objects (e.g. only the ones about to be rendered).
+
+        Args:
+            limit (int, optional): Maximum number of rows to convert.
+
+        Returns:
+            list: Business objects.
+        """
+        count = len(self) if limit is None else min(limit, len(self))
+        return [self.row(i) for i in range(count)]
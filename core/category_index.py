@@ -0,0 +1,178 @@
+# core/category_index.py
+import difflib
+import threading
+from collections import defaultdict
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
+
+from config.metrics import get_metrics
+from core.constant import CATEGORY_SYNONYMS, GEOAPIFY_CATEGORIES
+
+
+def _normalize(text: str) -> str:
+    """Lower-case and turn '_', '-' and repeated spaces into single spaces."""
+    return " ".join(text.lower().replace("_", " ").replace("-", " ").split())
+
+
+def _ngrams(text: str, n: int = 3) -> set:
+    """Character n-grams of a term, padded so that word starts and ends count too."""
+    padded = f" {text} "
+    if len(padded) <= n:
+        return {padded}
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+class CategoryIndex:
+    """
+    Prebuilt search index over the Geoapify category list.
+
+    Each category is indexed under a few "terms": its leaf token ("pharmacy" for
+    "healthcare.pharmacy"), its full dotted name, and any synonyms ("chemist").
+    An inverted index from character trigrams to terms narrows every query down to a
+    handful of candidates, which are then scored with the same difflib ratio the old
+    linear scan used. Results for repeated inputs come from an LRU cache.
+    """
+
+    def __init__(self, categories: Iterable[str] = GEOAPIFY_CATEGORIES,
+                 synonyms: Dict[str, str] = CATEGORY_SYNONYMS, cutoff: float = 0.4, cache_size: int = 2048) -> None:
+        """
+        Build the index.
+
+        Args:
+            categories (iterable): Geoapify categories (duplicates are ignored).
+            synonyms (dict): Extra words mapped to the category they stand for.
+            cutoff (float): Minimum similarity (0-1) for a match, as in difflib.get_close_matches.
+            cache_size (int): Number of distinct queries whose results are cached.
+        """
+        self.categories = list(dict.fromkeys(categories)) # Drop duplicates, keep order
+        self.cutoff = cutoff
+
+        # A category is a leaf if no other category sits below it (e.g. "catering" is not)
+        self.leaves = [c for c in self.categories if not any(o.startswith(c + ".") for o in self.categories)]
+
+        self._terms = []  # (normalized term, category, is_synonym)
+        self._synonyms = {}  # normalized synonym -> category, for exact synonym hits
+        self._postings = defaultdict(list)  # trigram -> term ids
+        self._gram_counts = []  # term id -> number of trigrams in the term
+        self.max_candidates = 12  # Terms re-scored with difflib per query
+
+        leaf_set = set(self.leaves)
+        for category in self.categories:
+            self._add_term(_normalize(category.replace(".", " ")), category, is_synonym=False)
+            if category in leaf_set:
+                self._add_term(_normalize(category.rsplit(".", 1)[-1]), category, is_synonym=False)
+        for word, category in synonyms.items():
+            self._add_term(_normalize(word), category, is_synonym=True)
+
+        self._search_cached = lru_cache(maxsize=cache_size)(self._search)
+
+    def _add_term(self, term: str, category: str, is_synonym: bool) -> None:
+        """Register one searchable term for a category."""
+        if not term:
+            return
+        # Synonyms win exact hits: "chemist" means a pharmacy, not commercial.chemist
+        if is_synonym:
+            self._synonyms[term] = category
+        term_id = len(self._terms)
+        self._terms.append((term, category, is_synonym))
+        grams = _ngrams(term)
+        self._gram_counts.append(len(grams))
+        for gram in grams:
+            self._postings[gram].append(term_id)
+
+    def search(self, query: str, k: int = 5) -> List[Tuple[str, float]]:
+        """
+        Rank categories for a query.
+
+        Args:
+            query (str): User input, e.g. "chemist" or "generator repair".
+            k (int): Maximum number of results.
+
+        Returns:
+            list: Up to k (category, score) pairs, best first; scores are between 0 and 1.
+        """
+        if not query or not query.strip():
+            return []
+        return list(self._search_cached(_normalize(query), k))
+
+    def match(self, query: str) -> str | None:
+        """
+        Best category for a query, or None if nothing is similar enough.
+
+        Args:
+            query (str): User input.
+
+        Returns:
+            str or None: Geoapify category.
+        """
+        results = self.search(query, 1)
+        return results[0][0] if results else None
+
+    def cache_info(self):
+        """LRU cache statistics for the query cache."""
+        return self._search_cached.cache_info()
+
+    def stats(self) -> dict:
+        """Query cache counters in the same shape as the other caches."""
+        info = self.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+
+    def _search(self, query: str, k: int) -> Tuple[Tuple[str, float], ...]:
+        """Uncached search over a normalized query (results are a tuple so they can be cached safely)."""
+        scores = {}
+        exact = self._synonyms.get(query)
+
+        # Candidate terms: those sharing trigrams with the query, ranked by Dice similarity
+        query_grams = _ngrams(query)
+        shared = defaultdict(int)
+        for gram in query_grams:
+            for term_id in self._postings.get(gram, ()):
+                shared[term_id] += 1
+        dice = {term_id: 2 * count / (len(query_grams) + self._gram_counts[term_id]) for term_id, count in shared.items()}
+        candidates = sorted(dice, key=dice.get, reverse=True)[:self.max_candidates]
+
+        # Re-score the few candidates with the same difflib ratio get_close_matches uses
+        matcher = difflib.SequenceMatcher(b=query, autojunk=False)
+        for term_id in candidates:
+            term, category, _ = self._terms[term_id]
+            matcher.set_seq1(term)
+            if matcher.real_quick_ratio() < self.cutoff or matcher.quick_ratio() < self.cutoff:
+                continue
+            score = matcher.ratio()
+            if score >= self.cutoff and score > scores.get(category, 0.0):
+                scores[category] = score
+
+        if exact:
+            scores[exact] = 1.0
+
+        # Exact synonym hits first, then by score; ties go to the category whose
+        # full dotted name is closest to the query, then to the later name in sort order,
+        # both of which mirror how difflib.get_close_matches breaks ties
+        def rank(item):
+            category, score = item
+            matcher.set_seq1(category)
+            return category != exact, -score, -matcher.ratio()
+
+        ranked = sorted(sorted(scores.items(), reverse=True), key=rank)
+        return tuple((category, round(score, 3)) for category, score in ranked[:k])
+
+
+# Shared index for the whole process, built on first use
+_category_index = None
+_category_index_lock = threading.Lock()
+
+
+def get_category_index() -> CategoryIndex:
+    """
+    Return the process-wide category index, building it on first use.
+
+    Returns:
+        CategoryIndex: Shared index over GEOAPIFY_CATEGORIES and CATEGORY_SYNONYMS.
+    """
+    global _category_index
+    if _category_index is None:
+        with _category_index_lock:
+            if _category_index is None:
+                _category_index = CategoryIndex()
+                get_metrics().register_cache("category_index", _category_index.stats)
+    return _category_index
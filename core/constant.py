@@ -1,5 +1,3 @@
-import difflib
-
 # Complete list of Geoapify Places categories (https://apidocs.geoapify.com/docs/places/#categories)
 GEOAPIFY_CATEGORIES = [
     # Accommodation
@@ -215,19 +213,126 @@ GEOAPIFY_CATEGORIES = [
 ]
 
 
+# Everyday (often Nigerian) words that don't look like any category name, mapped to the category people mean
+CATEGORY_SYNONYMS = {
+    "chemist": "healthcare.pharmacy",
+    "drugstore": "healthcare.pharmacy",
+    "medicine store": "healthcare.pharmacy",
+    "patent medicine": "healthcare.pharmacy",
+    "doctor": "healthcare.doctors",
+    "eatery": "catering.restaurant",
+    "food": "catering.restaurant",
+    "chop": "catering.buka",
+    "mama put": "catering.buka",
+    "suya": "catering.suya_spot",
+    "amala": "catering.amala_joint",
+    "pepper soup": "catering.pepper_soup_joint",
+    "shawarma": "catering.fast_food",
+    "beer": "entertainment.beer_parlour",
+    "drinks": "entertainment.beer_parlour",
+    "club": "entertainment.nightclub",
+    "keke": "transportation.tricycle_stand",
+    "keke stand": "transportation.tricycle_stand",
+    "napep": "transportation.tricycle_stand",
+    "motor park": "transportation.bus_station",
+    "bus park": "transportation.bus_station",
+    "filling station": "commercial.petrol_station",
+    "fuel": "commercial.petrol_station",
+    "petrol": "commercial.petrol_station",
+    "gas station": "commercial.petrol_station",
+    "mechanic": "service.vehicle.repair",
+    "vulcanizer": "service.vehicle.repair",
+    "spare parts": "service.vehicle.parts",
+    "salon": "commercial.beauty_salon",
+    "hair": "commercial.beauty_salon",
+    "barber": "commercial.barber_shop",
+    "printing": "commercial.print_shop",
+    "phone": "commercial.mobile_phone",
+    "gym": "leisure.sports_centre",
+    "cyber": "service.cyber_cafe",
+    "generator": "service.generator_repair",
+    "gen repair": "service.generator_repair",
+    "provision store": "commercial.convenience",
+    "mai shayi": "catering.tea_house",
+}
+
+
+# Broad words that mean several categories at once; searched together and merged into one list
+CATEGORY_GROUPS = {
+    "food": ["catering.restaurant", "catering.fast_food", "catering.buka", "catering.suya_spot",
+             "catering.amala_joint", "catering.pepper_soup_joint", "catering.food_court", "catering.bistro"],
+    "eat": ["catering.restaurant", "catering.fast_food", "catering.buka", "catering.food_court"],
+    "drinks": ["entertainment.beer_parlour", "catering.bar", "catering.pub", "catering.juice_bar"],
+    "health": ["healthcare.hospital", "healthcare.clinic", "healthcare.pharmacy", "healthcare.doctors",
+               "healthcare.laboratory"],
+    "medicine": ["healthcare.pharmacy", "healthcare.traditional"],
+    "groceries": ["commercial.supermarket", "commercial.convenience", "commercial.petty_trader",
+                  "commercial.cold_room"],
+    "stay": ["accommodation.hotel", "accommodation.guest_house", "accommodation.hostel",
+             "accommodation.apartment", "accommodation.lodge"],
+}
+
+
 def match_category(user_input) -> str:
     """
     Fuzzy-matches user input to the closest Geoapify category.
 
+    Uses the prebuilt CategoryIndex (character n-grams + synonyms, cached per input),
+    so it is cheap enough to call on every keystroke.
+
     Args:
         user_input (str): User's search term (e.g., "pharmacy", "hotel")
 
     Returns:
         str: Matched Geoapify category (e.g., "healthcare.pharmacy") or None if no match.
     """
-    user_input = user_input.lower().strip()
-    matches = difflib.get_close_matches(user_input, GEOAPIFY_CATEGORIES, n=1, cutoff=0.4)
-    return matches[0] if matches else None
+    from core.category_index import get_category_index # Imported here: the index module imports this one
+
+    return get_category_index().match(user_input)
+
+
+def suggest_categories(user_input, k: int = 5) -> list:
+    """
+    Ranked category suggestions for autocomplete.
+
+    Args:
+        user_input (str): What the user has typed so far.
+        k (int): Maximum number of suggestions.
+
+    Returns:
+        list: Up to k Geoapify categories, best match first.
+    """
+    from core.category_index import get_category_index
+
+    return [category for category, _ in get_category_index().search(user_input, k)]
+
+
+def expand_categories(user_input) -> list:
+    """
+    Turn a search into every category it stands for.
+
+    A group word ("food") gives its whole group, a list ("pharmacy, clinic" or "suya and
+    shawarma") gives one match per item, and anything else gives the single best match.
+
+    Args:
+        user_input (str): User's search term.
+
+    Returns:
+        list: Geoapify categories without duplicates, in order (empty if nothing matched).
+    """
+    if not user_input or not user_input.strip():
+        return []
+
+    query = " ".join(user_input.lower().split())
+    if query in CATEGORY_GROUPS:
+        return list(CATEGORY_GROUPS[query])
+
+    parts = [part.strip() for part in query.replace(" and ", ",").replace("&", ",").split(",")]
+    categories = []
+    for part in filter(None, parts):
+        matched = CATEGORY_GROUPS.get(part) or [match_category(part)]
+        categories.extend(category for category in matched if category)
+    return list(dict.fromkeys(categories))
 
 
 # Example usage:
@@ -235,4 +340,5 @@ if __name__ == "__main__":
     print(match_category("chemist"))  # healthcare.pharmacy
     print(match_category("buka"))  # catering.buka (Nigerian)
     print(match_category("generator repair"))  # service.generator_repair
-    print(match_category("keke stand"))
\ No newline at end of file
+    print(match_category("keke stand"))
+    print(expand_categories("food"))  # catering.restaurant, catering.fast_food, catering.buka, ...
\ No newline at end of file
@@ -0,0 +1,342 @@
+# core/enrichment.py
+import logging
+import math
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from functools import partial
+from typing import Dict, List, Tuple
+
+from config.config import get_config
+from config.http import http_get
+from config.metrics import get_metrics
+from config.utils import log_error
+from core.business import Business
+from core.geo import distances_from
+from core.venue_matcher import match_venues, venue_position
+
+
+class RatingEnricher:
+    """Fetches Foursquare ratings for many businesses at once, with bounded parallelism."""
+
+    def __init__(self, fsq_api_key: str, max_workers: int = 8, timeout: float = 5.0) -> None:
+        """
+        Initialize the enricher with its worker pool.
+
+        Args:
+            fsq_api_key (str): Foursquare API key.
+            max_workers (int): Maximum number of rating lookups in flight at the same time.
+            timeout (float): Timeout in seconds for each Foursquare request.
+        """
+        self.fsq_api_key = fsq_api_key
+        self.max_workers = max_workers
+        self.timeout = timeout
+
+        # Long-lived pool so reruns reuse the same threads (and their pooled HTTP connections)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="rating-enricher")
+
+    def submit(self, businesses: List[Business]) -> Dict[Future, Business]:
+        """
+        Start rating lookups for every business that has no rating yet, without waiting for them.
+
+        Ratings already in the rating cache are filled in immediately and never hit the network.
+        Each lookup writes its rating straight onto the Business object when it finishes.
+
+        Args:
+            businesses (list): Business objects to enrich.
+
+        Returns:
+            dict: Mapping of Future -> Business for the lookups that were started.
+        """
+        futures = {}
+        if not self.fsq_api_key:
+            return futures
+
+        bind_trace = get_metrics().bind_trace
+        for business in businesses:
+            if business.rating is None and not business.load_cached_rating():
+                future = self._executor.submit(bind_trace(business.fetch_rating_from_foursquare),
+                                               self.fsq_api_key, self.timeout)
+                futures[future] = business
+        return futures
+
+    def enrich(self, businesses: List[Business], wait_timeout: float | None = None) -> int:
+        """
+        Fetch ratings for all unrated businesses concurrently and apply them in place.
+
+        Args:
+            businesses (list): Business objects to enrich.
+            wait_timeout (float, optional): Give up waiting after this many seconds;
+                lookups still running keep going and fill in their rating later.
+
+        Returns:
+            int: Number of businesses that received a rating.
+        """
+        futures = self.submit(businesses)
+        if not futures:
+            return 0
+
+        done, _ = wait(futures, timeout=wait_timeout)
+
+        rated = 0
+        for future in done:
+            try:
+                if future.result() is not None:
+                    rated += 1
+            except Exception as e:
+                log_error(e, f"Rating lookup failed for {futures[future].name}")
+        return rated
+
+    def shutdown(self) -> None:
+        """Stop the worker pool (pending lookups are cancelled)."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+class AreaRatingEnricher(RatingEnricher):
+    """
+    Rates a whole result list from a few Foursquare area searches instead of two lookups per business.
+
+    Businesses are grouped by category, and each group gets one area search for that category
+    (the Foursquare query is the category in words, e.g. "pharmacy"), fetched with ratings in up
+    to max_pages pages, nearest first. The venues are matched to the businesses locally by
+    position and name (see core/venue_matcher.py), so a 40-result search costs 1-3 requests
+    instead of 80.
+
+    If max_pages runs out before the area does, the pages only cover the circle out to the
+    farthest venue received. Businesses whose match distance reaches past it get the usual
+    per-business lookup; unmatched businesses inside it are cached as "no match" for
+    truncated_ttl only, so the next rerun doesn't search again but the answer doesn't stick for a day.
+    """
+
+    # Venue fields requested with each area search (rating included, so no details calls)
+    FIELDS = "fsq_id,name,geocodes,location,distance,rating"
+
+    def __init__(self, fsq_api_key: str, max_workers: int = 8, timeout: float = 5.0, page_limit: int = 50,
+                 max_pages: int = 3, max_distance_m: float = 150.0, min_similarity: float = 0.6,
+                 truncated_ttl: float = 3600.0) -> None:
+        """
+        Args:
+            fsq_api_key (str): Foursquare API key.
+            max_workers (int): Area searches and fallback lookups running at the same time.
+            timeout (float): Timeout in seconds for each Foursquare request.
+            page_limit (int): Venues per page (Foursquare allows up to 50).
+            max_pages (int): Pages fetched per area at most.
+            max_distance_m (float): Furthest a venue can be from a business it matches.
+            min_similarity (float): Name similarity (0-1) needed for a match.
+            truncated_ttl (float): Seconds a "no match" from a truncated area search is cached.
+        """
+        super().__init__(fsq_api_key, max_workers, timeout)
+        self.page_limit = page_limit
+        self.max_pages = max_pages
+        self.max_distance_m = max_distance_m
+        self.min_similarity = min_similarity
+        self.truncated_ttl = truncated_ttl
+
+    @staticmethod
+    def search_query(business: Business) -> str | None:
+        """Foursquare query of the area search a business belongs to: the leaf of its category in words, if known."""
+        words = (business.category or "").split(".")[-1].replace("_", " ").strip()
+        return words if words and words != "unknown" else None
+
+    def submit(self, businesses: List[Business]) -> Dict[Future, Business]:
+        """
+        Start one area search per category among the unrated businesses, without waiting for them.
+
+        The returned futures (one per business, as with RatingEnricher) finish with their
+        business's rating (or None): when its area search does, or when its per-business
+        fallback lookup does.
+
+        Args:
+            businesses (list): Business objects to enrich.
+
+        Returns:
+            dict: Mapping of Future -> Business for the businesses being looked up.
+        """
+        if not self.fsq_api_key:
+            return {}
+        groups = {}
+        for business in businesses:
+            if business.rating is None and not business.load_cached_rating():
+                groups.setdefault(self.search_query(business), []).append(business)
+
+        # Bound here, on the caller's thread, so the fallbacks started from done-callbacks join its trace too
+        bind_trace = get_metrics().bind_trace
+        fallback = bind_trace(Business.fetch_rating_from_foursquare)
+
+        futures = {}
+        for query, group in groups.items():
+            group_futures = {Future(): business for business in group}
+            futures.update(group_futures)
+            area_future = self._executor.submit(bind_trace(self.rate_area), group, query)
+            area_future.add_done_callback(partial(self._resolve, group_futures, fallback))
+        return futures
+
+    def _resolve(self, futures: Dict[Future, Business], fallback, area_future: Future) -> None:
+        """Finish the futures of one area search, handing uncovered businesses to per-business lookups."""
+        if area_future.cancelled():  # Shut down before the area search started
+            for future in futures:
+                _cancel(future)
+            return
+        error = area_future.exception()
+        if error is not None:
+            for future in futures:
+                future.set_exception(error)
+            return
+
+        uncovered = {id(business) for business in area_future.result()}
+        for future, business in futures.items():
+            if id(business) not in uncovered:
+                future.set_result(business.rating)
+                continue
+            try:
+                lookup = self._executor.submit(fallback, business, self.fsq_api_key, self.timeout)
+            except RuntimeError:  # Shut down meanwhile
+                _cancel(future)
+                continue
+            lookup.add_done_callback(partial(_copy_outcome, future))
+
+    def rate_area(self, businesses: List[Business], query: str | None = None) -> List[Business]:
+        """
+        Fetch the venues around the businesses, match them, and store every outcome that is known.
+
+        Args:
+            businesses (list): Business objects (ratings are written onto them).
+            query (str, optional): Foursquare query narrowing the search to their category.
+
+        Returns:
+            list: Businesses outside the circle the fetched pages covered, still to be looked up one by one.
+
+        Raises:
+            requests.exceptions.RequestException: If an area search fails (nothing is cached).
+        """
+        center, radius = self.search_area(businesses)
+        venues, complete = self.fetch_venues(center, radius, query)
+        matches = match_venues(businesses, venues, self.max_distance_m, self.min_similarity)
+
+        # A business is covered if every venue it could match lies inside the circle the pages reached
+        covered = radius if complete else self.covered_radius(center, venues)
+        reach = distances_from(center, [b.latitude for b in businesses], [b.longitude for b in businesses])
+        reach += self.max_distance_m
+
+        rated, uncovered = 0, []
+        for i, business in enumerate(businesses):
+            venue = matches.get(i)
+            if venue is not None:
+                rating = venue.get("rating") or None
+                business.store_rating(rating, "rated" if rating else "no_rating")
+                rated += rating is not None
+            elif reach[i] <= covered:
+                business.store_rating(None, "no_match", ttl=None if complete else self.truncated_ttl)
+            else:
+                uncovered.append(business)
+        logging.info(f"Area enrichment ({query or 'any category'}): {len(venues)} venues, "
+                     f"{len(matches)}/{len(businesses)} matched, {rated} rated, "
+                     f"{len(uncovered)} left for per-business lookups (area {'complete' if complete else 'truncated'})")
+        return uncovered
+
+    def search_area(self, businesses: List[Business]) -> Tuple[Tuple[float, float], float]:
+        """
+        The circle to search: centered on the businesses, reaching the farthest one plus the match distance.
+
+        Args:
+            businesses (list): Business objects.
+
+        Returns:
+            tuple: ((latitude, longitude), radius in meters), radius capped at Foursquare's 100 km.
+        """
+        lats = [b.latitude for b in businesses]
+        lons = [b.longitude for b in businesses]
+        center = (sum(lats) / len(lats), sum(lons) / len(lons))
+        farthest = float(distances_from(center, lats, lons).max())
+        return center, min(100000.0, math.ceil(farthest + self.max_distance_m))
+
+    @staticmethod
+    def covered_radius(center: Tuple[float, float], venues: List[dict]) -> float:
+        """
+        Radius a truncated, nearest-first listing covers: out to the farthest venue it returned.
+
+        Args:
+            center (tuple): (latitude, longitude) the search was centered on.
+            venues (list): Venues received.
+
+        Returns:
+            float: Radius in meters (0 if no venue has a position).
+        """
+        positions = [position for position in map(venue_position, venues) if position]
+        if not positions:
+            return 0.0
+        return float(distances_from(center, [p[0] for p in positions], [p[1] for p in positions]).max())
+
+    def fetch_venues(self, center: Tuple[float, float], radius: float,
+                     query: str | None = None) -> Tuple[List[dict], bool]:
+        """
+        Page through the Foursquare venues in a circle, nearest first.
+
+        Args:
+            center (tuple): (latitude, longitude).
+            radius (float): Radius in meters.
+            query (str, optional): Foursquare query (category words) narrowing the search.
+
+        Returns:
+            tuple: (venues, complete) where complete is False if max_pages ran out first.
+
+        Raises:
+            requests.exceptions.RequestException: On network or HTTP errors.
+        """
+        headers = Business.foursquare_headers(self.fsq_api_key)
+        url = Business.FSQ_SEARCH_ENDPOINT
+        params = {
+            "ll": f"{center[0]},{center[1]}",
+            "radius": int(radius),
+            "limit": self.page_limit,
+            "sort": "DISTANCE",
+            "fields": self.FIELDS,
+        }
+        if query:
+            params["query"] = query
+
+        venues = []
+        for _ in range(self.max_pages):
+            response = http_get(url, headers=headers, params=params, timeout=self.timeout)
+            response.raise_for_status()
+            results = response.json().get("results", [])
+            venues.extend(results)
+
+            # Foursquare pages with a cursor in the Link header
+            next_url = response.links.get("next", {}).get("url")
+            if not next_url or len(results) < self.page_limit:
+                return venues, True
+            url, params = next_url, None
+        return venues, False
+
+
+def _cancel(future: Future) -> None:
+    """Cancel a future nobody runs, waking up wait() and as_completed() callers (cancel() alone doesn't)."""
+    future.cancel()
+    future.set_running_or_notify_cancel()
+
+
+def _copy_outcome(target: Future, source: Future) -> None:
+    """Finish target with the result or exception of source."""
+    if source.cancelled():
+        _cancel(target)
+        return
+    error = source.exception()
+    if error is not None:
+        target.set_exception(error)
+    else:
+        target.set_result(source.result())
+
+
+def create_rating_enricher(fsq_api_key: str) -> RatingEnricher:
+    """
+    Build the rating enricher selected in Config (ENRICHMENT_MODE=area or per_business).
+
+    Args:
+        fsq_api_key (str): Foursquare API key.
+
+    Returns:
+        RatingEnricher: An AreaRatingEnricher, or the per-business RatingEnricher.
+    """
+    config = get_config()
+    if config.enrichment_mode == "per_business":
+        return RatingEnricher(fsq_api_key, **config.get_enrichment_settings())
+    return AreaRatingEnricher(fsq_api_key, **config.get_enrichment_settings(), **config.get_area_enrichment_settings())
@@ -0,0 +1,87 @@
+# core/geo.py
+from typing import Iterable, Sequence, Tuple
+
+import numpy as np
+
+# Mean Earth radius in meters (same value the haversine package uses)
+EARTH_RADIUS_M = 6_371_008.8
+
+
+def coords_to_arrays(points: Iterable[Sequence[float]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Split (latitude, longitude) pairs into two float arrays.
+
+    Args:
+        points (iterable): (lat, lon) pairs.
+
+    Returns:
+        tuple: (lats, lons) as NumPy float64 arrays.
+    """
+    array = np.asarray(list(points), dtype=np.float64).reshape(-1, 2)
+    return array[:, 0], array[:, 1]
+
+
+def distances_from(origin: Tuple[float, float], lats, lons) -> np.ndarray:
+    """
+    Great-circle distance in meters from one origin to N points, in a single vectorized pass.
+
+    Args:
+        origin (tuple): (latitude, longitude) of the origin.
+        lats (array-like): N latitudes in degrees.
+        lons (array-like): N longitudes in degrees.
+
+    Returns:
+        np.ndarray: N distances in meters (NaN where a coordinate is NaN).
+    """
+    lat1 = np.radians(origin[0])
+    lon1 = np.radians(origin[1])
+    lat2 = np.radians(np.asarray(lats, dtype=np.float64))
+    lon2 = np.radians(np.asarray(lons, dtype=np.float64))
+
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def distance_matrix(origin_lats, origin_lons, lats, lons) -> np.ndarray:
+    """
+    Great-circle distances in meters from N origins to M points.
+
+    Args:
+        origin_lats (array-like): N origin latitudes in degrees.
+        origin_lons (array-like): N origin longitudes in degrees.
+        lats (array-like): M point latitudes in degrees.
+        lons (array-like): M point longitudes in degrees.
+
+    Returns:
+        np.ndarray: Matrix of shape (N, M); row i holds the distances from origin i.
+    """
+    lat1 = np.radians(np.asarray(origin_lats, dtype=np.float64))[:, np.newaxis]
+    lon1 = np.radians(np.asarray(origin_lons, dtype=np.float64))[:, np.newaxis]
+    lat2 = np.radians(np.asarray(lats, dtype=np.float64))[np.newaxis, :]
+    lon2 = np.radians(np.asarray(lons, dtype=np.float64))[np.newaxis, :]
+
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def feature_coordinates(features: Sequence[dict]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pull the coordinates out of GeoJSON point features into (lats, lons) arrays.
+
+    Features without usable coordinates get NaN so positions stay aligned with the input list.
+
+    Args:
+        features (sequence): GeoJSON features with [lon, lat] point geometry.
+
+    Returns:
+        tuple: (lats, lons) as NumPy float64 arrays.
+    """
+    lats = np.full(len(features), np.nan)
+    lons = np.full(len(features), np.nan)
+    for i, feature in enumerate(features):
+        try:
+            lon, lat = feature["geometry"]["coordinates"][:2]
+            lats[i], lons[i] = lat, lon
+        except (KeyError, TypeError, ValueError):
+            continue
+    return lats, lons
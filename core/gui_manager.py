@@ -1,25 +1,41 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple
-import folium
 import requests
 
 import streamlit as st # GUI Library for our Web app
+import streamlit.components.v1 as components
 from haversine import haversine
-from streamlit_folium import folium_static
 from streamlit_geolocation import streamlit_geolocation
+# folium and streamlit_folium (over a second to import) are imported where a directions map is drawn
 
 
 # project modules
 import os
-from config.config import Config
+from config.config import get_config
+from config.metrics import get_metrics
 from core.business import Business
 from core.business_finder import BusinessFinder
 from core.location_manager import LocationManager
-from core.constant import match_category
+from core.constant import expand_categories, suggest_categories
+from core.enrichment import create_rating_enricher
+from core.places_cache import get_places_cache
+from core.poi_index import get_poi_index
 from config.utils import get_location_from_ip
 from config.utils import save_map_html
+from core.routing import RoutePrefetcher, fetch_route
+from core.route_tracker import RouteTracker
+from core.route_geometry import simplify_route
+from core.map_renderer import get_map_renderer
 
 class GUIManager:
-    """Manages the graphical user interface for the application."""
+    """
+    Manages the graphical user interface for the application.
+
+    One instance serves every rerun and session of the process (see get_gui_manager); anything
+    that belongs to a single user lives in st.session_state, not on the instance.
+    """
 
     def __init__(self):
         """
@@ -27,83 +43,110 @@ class GUIManager:
         - Load API keys from config.
         - Instantiate BusinessFinder with Geoapify key.
         """
-        self.config = Config()
+        self.config = get_config()
 
         # Loading my api keys securely
         self.geoapify_key = self.config.get_api_key("geoapify")
         self.foursquare_key = self.config.get_api_key("foursquare")
 
-        # Instantiate my busines finder with geoapify key
-        self.business_finder = BusinessFinder(self.geoapify_key)
+        # Instantiate my busines finder with geoapify key (and the shared, geography-aware results cache),
+        # answering from the offline POI index when PLACES_BACKEND is "local" or "auto"
+        backend = self.config.get_places_backend_settings()["backend"]
+        self.business_finder = BusinessFinder(
+            self.geoapify_key,
+            places_cache=get_places_cache(),
+            poi_index=get_poi_index() if backend != "geoapify" else None,
+            backend=backend
+        )
+
+        # Fetches Foursquare ratings for the whole result list (area searches matched locally, or per business)
+        self.rating_enricher = create_rating_enricher(self.foursquare_key)
+
+        # Background work for the results page (travel times), shown progressively
+        self.display_settings = self.config.get_display_settings()
+        self.background_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="results-page")
+
+        # Computes walk/drive routes for the nearest results in the background after each search
+        self.prefetch_settings = self.config.get_prefetch_settings()
+        self.route_prefetcher = RoutePrefetcher(self.geoapify_key, self.prefetch_settings["max_workers"])
 
     def get_realtime_directions(self, business, travel_mode):
         """
-        Continuously updates and displays navigation directions from the user's real-time position
-        to the selected business using Geoapify.
+        Follows the user's real-time position along the route to the selected business.
 
-        This function uses `streamlit_geolocation()` to detect changes in the user's location
-        and fetches updated directions whenever the user moves significantly (50+ meters).
+        The route is fetched once and handed to a RouteTracker, which snaps each new position
+        onto the route locally to advance the current step and remaining distance. A new route
+        is fetched only when the user is further off the route than the configured threshold.
 
         Args:
             business (Business): The business object the user wants to navigate to.
             travel_mode (str): The selected travel method ('walk', 'drive', 'bike').
 
         Returns:
-            list: A list of updated direction instructions or previously cached directions.
+            list: The direction instructions of the route currently being followed.
         """
-
-        # --- Track and initialize the user's last known location ---
-        # If this is the first time tracking, use the current static location as the starting point
-        if 'last_known_location' not in st.session_state:
-            st.session_state.last_known_location = st.session_state.user_coords
+        tracker_key = f"tracker_{business.name}_{travel_mode}"
+        destination = (business.latitude, business.longitude)
 
         # --- Set up a Streamlit container to display tracking UI ---
         with st.container():
             st.write("**Live Location Tracking**")
 
-            # Call the geolocation widget with a unique key (based on business name)
             # This widget will auto-update as the user moves
             location = streamlit_geolocation()
-
-
-            # If location was successfully retrieved and contains latitude
-            if location and location.get("latitude"):
-                current_location = (location["latitude"], location["longitude"])
-
-                # Only update directions if the user moved more than 50 meters
-                if haversine(current_location, st.session_state.last_known_location) > 0.05:  # 0.05 km = 50 meters
-                    # Update last known location to this new position
-                    st.session_state.last_known_location = current_location
-
-                    # Show a loading spinner while fetching updated directions
-                    with st.spinner("Updating directions..."):
-                        directions = business.get_directions(
-                            current_location,  # Live location
-                            self.geoapify_key,  # API key for Geoapify routing
-                            travel_mode  # Mode of travel: walk, drive, etc.
-                        )
-
-                        # Save the latest directions in session state (associated with this business)
-                        st.session_state[f"directions_{business.name}"] = directions
-
-                        # Immediately refresh the UI to reflect new directions
-                        st.rerun()
+            if not (location and location.get("latitude")):
+                st.info("Waiting for your live location...")
+                return st.session_state.get(f"directions_{business.name}", [])
+
+            current_location = (location["latitude"], location["longitude"])
+            tracker = st.session_state.get(tracker_key)
+            state = tracker.update(current_location) if tracker else None
+
+            # Only call the routing API at the start or when the user has left the route
+            if state is None or state.off_route:
+                with st.spinner("Updating directions..." if state else "Fetching directions..."):
+                    try:
+                        feature = fetch_route(current_location, destination, travel_mode, self.geoapify_key)
+                    except requests.exceptions.RequestException as e:
+                        st.error("Network error while contacting Geoapify.")
+                        st.exception(e)
+                        return st.session_state.get(f"directions_{business.name}", [])
+
+                if not feature:
+                    st.warning("No route data received from Geoapify.")
+                    return []
+
+                tracker = RouteTracker(feature, **self.config.get_tracking_settings())
+                st.session_state[tracker_key] = tracker
+                st.session_state[f"directions_{business.name}"] = Business.parse_directions({"features": [feature]})
+                state = tracker.update(current_location)
+
+            # Progress is computed locally, no rerun or network call needed
+            if state.arrived:
+                st.success(f"You have arrived at {business.name}.")
+            else:
+                st.write(f"➡️ **{state.instruction}**")
+                st.write(f"Remaining: {int(state.remaining_m)} m "
+                         f"(step {state.step_index + 1} of {len(tracker.steps)})")
 
             # Display the user's live coordinates to give visual feedback
             st.write(f"📍 Your position: {current_location[0]:.5f}, {current_location[1]:.5f}")
 
-            #
-            # If user clicks stop, remove the stored last known location and rerun the app
+            # If user clicks stop, forget the tracked route and rerun the app
             if st.button("Stop Tracking", key=f"stop_{business.name}"):
-                del st.session_state.last_known_location
+                st.session_state.pop(tracker_key, None)
                 st.rerun()
-        # Return updated directions from session state (or empty if none exists yet)
+        # Return the directions of the route being followed
         return st.session_state.get(f"directions_{business.name}", [])
 
     def display_businesses(self, businesses: list, user_coords: Tuple[float, float]):
         """
         Display a list of businesses in a structured Streamlit format.
 
+        Every listing is shown straight away. Ratings and travel times are fetched in the
+        background (see start_lookups); whatever has finished is shown, the rest says "loading"
+        and is picked up by the short polling reruns at the end of run_app.
+
         Args:
             businesses (list): List of Business objects.
             user_coords (tuple): User's coordinates for generating directions.
@@ -113,6 +156,13 @@ class GUIManager:
         st.session_state['current_businesses'] = businesses
         st.session_state['user_coords'] = user_coords
 
+        # The slow lookups run in the background, started once per result list (cached ratings are there already)
+        lookups = self.start_lookups(businesses, user_coords)
+        waiting = time.monotonic() < lookups["deadline"]
+        pending_ratings = {id(business) for future, business in lookups["ratings"].items()
+                           if waiting and not future.done()}
+        travel_pending = waiting and lookups["travel"] is not None and not lookups["travel"].done()
+
         # Loop through each business and render its info block on the UI
         for i, business in enumerate(businesses, 1):
             st.markdown(f"---")  # Separator between each business listing
@@ -122,10 +172,9 @@ class GUIManager:
             st.write(f"**Address:** {business.address}")
             st.write(f"**Distance:** {int(business.distance_m)} meters")
 
-            rating = business.rating
-            if rating is None and self.foursquare_key:
-                rating = business.fetch_rating_from_foursquare(self.foursquare_key)
-            st.write(f"**Rating:** {rating}/5" if rating else "**Rating:** Not available")
+            # Filled in by a later rerun if the background lookup hasn't finished yet
+            self.show_travel_time(st.empty(), business, pending=travel_pending)
+            self.show_rating(st.empty(), business, pending=id(business) in pending_ratings)
 
             # Optional contact fields: displayed only if present on the object
             if hasattr(business, "phone") and business.phone:
@@ -162,22 +211,16 @@ class GUIManager:
                 if st.button("Get Directions", key=f"get_dir_btn{i}"):
                     with st.spinner("Fetching directions..."):
                         try:
-                            # Construct request URL to Geoapify Routing API
-                            route_url = (
-                                f"https://api.geoapify.com/v1/routing?"
-                                f"waypoints={user_coords[0]},{user_coords[1]}|{business.latitude},{business.longitude}"
-                                f"&mode={travel_mode}&apiKey={self.geoapify_key}"
+                            # Route from the shared cache (often already prefetched), else from Geoapify
+                            feature = fetch_route(
+                                user_coords,
+                                (business.latitude, business.longitude),
+                                travel_mode,
+                                self.geoapify_key
                             )
-                            # Send request to Geoapify
-                            response = requests.get(route_url)
-
-                            # Raise an exception if the response is not 2xx
-                            response.raise_for_status()
-                            data = response.json()
 
                             # Check if route data was returned
-                            if data.get("features"):
-                                feature = data["features"][0]
+                            if feature:
 
                                 # Turn-by-turn instruction section
                                 st.subheader("Turn-by-Turn Directions")
@@ -187,28 +230,20 @@ class GUIManager:
                                         distance = step.get("distance", 0)
                                         st.markdown(f"**{j}. {instruction}** ({int(distance)}m)")
 
+                                import folium
+                                from streamlit_folium import folium_static
+
                                 # Initialize map centered at user location
-                                route_map = folium.Map(location=[user_coords[0], user_coords[1]], zoom_start=13)
-                                # Retrieve route coordinates from Geoapify response
-                                coordinates = feature["geometry"].get("coordinates", [])
-                                route_path = []
-
-                                # Handle LineString type (flat list of lon, lat)
-                                if all(isinstance(coord, list) and len(coord) == 2 and isinstance(coord[0],
-                                                                                                  (int, float)) for
-                                       coord in coordinates):
-                                    route_path = [[coord[1], coord[0]] for coord in
-                                                  coordinates]  # Swap [lon, lat] → [lat, lon]
-
-                                # Handle MultiLineString type (nested list of [lon, lat])
-                                elif all(isinstance(segment, list) for segment in coordinates):
-                                    for segment in coordinates:
-                                        for coord in segment:
-                                            if len(coord) == 2:
-                                                route_path.append([coord[1], coord[0]])
+                                zoom = 13
+                                route_map = folium.Map(location=[user_coords[0], user_coords[1]], zoom_start=zoom)
+
+                                # Decode the route geometry and drop points too close together to see at this zoom
+                                route_path = simplify_route(feature["geometry"], zoom)
+                                st.caption(f"Route drawn with {route_path.kept_points} of {route_path.original_points} "
+                                           f"points ({route_path.reduction:.0%} fewer)")
 
                                 # Draw the route on the map
-                                folium.PolyLine(route_path, color='blue', weight=4).add_to(route_map)
+                                folium.PolyLine(route_path.path, color='blue', weight=4).add_to(route_map)
 
                                 # Mark user's origin location
                                 folium.Marker(
@@ -244,49 +279,102 @@ class GUIManager:
                 if st.button("Refresh Directions", key=f"refresh_{i}"):
                     st.rerun()
 
+                # Follow the user's live position along the route
+                live_tracking = st.checkbox("Live tracking", key=f"live_tracking_{i}")
+                st.session_state[f"directions_{i}"]["live_tracking"] = live_tracking
+                if live_tracking:
+                    self.get_realtime_directions(business, travel_mode)
+
             # Always provide a fallback link to OpenStreetMap for external viewing
             map_url = f"https://www.openstreetmap.org/?mlat={business.latitude}&mlon={business.longitude}#map=18"
             st.markdown(f"[View on Map]({map_url})", unsafe_allow_html=True)
 
+    def start_lookups(self, businesses: list, user_coords: Tuple[float, float]) -> dict:
+        """
+        Start the rating and travel-time lookups for a result list, once per list.
+
+        The futures are kept in st.session_state, so reruns (widget clicks, the polling at the
+        end of run_app) read the running lookups instead of submitting them again.
+
+        Args:
+            businesses (list): Business objects on the page (the list kept in session_state).
+            user_coords (tuple): User's coordinates, for travel times.
+
+        Returns:
+            dict: businesses, ratings (Future -> Business), travel (Future or None) and deadline
+                (monotonic time after which unfinished lookups are shown as unavailable).
+        """
+        lookups = st.session_state.get("lookups")
+        if lookups is not None and lookups["businesses"] is businesses:
+            return lookups
+
+        travel_future = None
+        if self.display_settings["travel_mode"] and any(b.travel_time_s is None for b in businesses):
+            travel_future = self.background_executor.submit(
+                get_metrics().bind_trace(self.business_finder.annotate_travel_times), businesses, user_coords,
+                self.display_settings["travel_mode"]
+            )
+        lookups = {
+            "businesses": businesses,
+            "ratings": self.rating_enricher.submit(businesses),
+            "travel": travel_future,
+            "deadline": time.monotonic() + self.display_settings["wait_timeout"],
+        }
+        st.session_state.lookups = lookups
+        return lookups
+
+    @staticmethod
+    def lookups_pending() -> bool:
+        """Whether this session has background lookups still running and still worth waiting for."""
+        lookups = st.session_state.get("lookups")
+        if lookups is None or time.monotonic() >= lookups["deadline"]:
+            return False
+        futures = [*lookups["ratings"], *([lookups["travel"]] if lookups["travel"] is not None else [])]
+        return any(not future.done() for future in futures)
+
+    @staticmethod
+    def show_search_progress(slot, businesses: list) -> None:
+        """List the businesses a search has found so far while its later pages are still loading."""
+        lines = [f"**Found {len(businesses)} so far, still searching…**", ""]
+        lines += [f"{i}. {business.name} ({int(business.distance_m)} m)" for i, business in enumerate(businesses, 1)]
+        slot.markdown("\n".join(lines))
+
+    @staticmethod
+    def show_rating(slot, business, pending: bool) -> None:
+        """Write a business's rating into its placeholder."""
+        if business.rating:
+            slot.write(f"**Rating:** {business.rating}/5")
+        elif pending:
+            slot.write("**Rating:** _loading…_")
+        else:
+            slot.write("**Rating:** Not available")
+
+    @staticmethod
+    def show_travel_time(slot, business, pending: bool) -> None:
+        """Write a business's travel time into its placeholder (left empty when there is none)."""
+        if business.travel_time_s is not None:
+            slot.write(f"**Travel time ({business.travel_mode}):** {max(1, round(business.travel_time_s / 60))} min "
+                       f"({int(business.travel_distance_m)} m by road)")
+        elif pending:
+            slot.write("**Travel time:** _calculating…_")
+        else:
+            slot.empty()
+
     def render_map(self, user_coords: Tuple[float, float], businesses: list) -> None:
         """
-        Generate and display an interactive Folium map in Streamlit showing user location
-        and nearby businesses with markers and connecting lines.
+        Display the interactive map of the user location and nearby businesses in Streamlit.
+
+        The HTML comes from the shared MapRenderer, which only rebuilds it when the result set
+        or the user position changed, and clusters markers for large result sets.
         Args:
             user_coords (tuple): (lat, lon) of the user's location to center the map.
             businesses (list): List of Business objects to display on map.
         """
         try:
-            # Initializing the map centered at the user's current location wih a moderate zoom level
-            user_map = folium.Map(location=user_coords, zoom_start=14)
-
-            # Adding marker for the user's location (green, labeled "Your Location")
-            folium.Marker(  # This is the marker function in folium
-                location=user_coords,
-                popup="Your Location",
-                icon=folium.Icon(color="green", icon="user")
-            ).add_to(user_map)
-
-            # Looping through each business to add its own marker on the map
-            for i, business in enumerate(businesses, 1):
-                folium.Marker(
-                    location=(business.latitude, business.longitude),
-                    popup=business.name,  # Show business name on click
-                    color="red",
-                    icon=folium.Icon(color="red", icon="info-sign")  # Red icon for businesses
-                ).add_to(user_map)
-
-            # Draw a straight line (polyline) from the user's location to each business location
-            for business in businesses:
-                folium.PolyLine(
-                    locations=[user_coords, (business.latitude, business.longitude)],
-                    color='gray',
-                    weight=2,
-                    opacity=0.7
-                ).add_to(user_map)
-
-            # Display the entire map within Streamlit using the folium_static function
-            folium_static(user_map, width=800, height=500)
+            html = get_map_renderer().render_html(user_coords, businesses)
+
+            # Display the entire map within Streamlit
+            components.html(html, width=800, height=500)
 
         except Exception as e:
             st.error("Failed to load interactive map.")
@@ -302,10 +390,21 @@ class GUIManager:
         # Configure the page to use wide layout and set the title
         st.set_page_config(page_title="Services at Your Door Step", layout="wide")
 
+        # Collect this rerun's stages and provider calls for the debug panel. The trace belongs to
+        # this session's script thread and is kept in session_state, because a search reruns the
+        # page to show results and its trace is carried into that rerun.
+        metrics = get_metrics()
+        page_start = time.perf_counter()
+        carried = st.session_state.get("trace") if st.session_state.pop("carry_trace", False) else None
+        st.session_state.trace = metrics.start_trace(carried)
+
         # Display the main title and brief instructions
         st.title("📍 Nearby Businesses")  # Using an emoji for visual appeal
         st.write("Enter your location and a business type to discover nearby places!")  # Simple user guidance
 
+        # Main-area slot where a running search lists what it has found so far, page by page
+        search_progress = st.empty()
+
         # Create a sidebar container for all search controls
         with st.sidebar:
             # Section header for search settings
@@ -376,44 +475,164 @@ class GUIManager:
                 # Input for business type
                 category_input = st.text_input("Business type (e.g., hotel, clinic)")
 
+                # Ranked suggestions from the category index (cheap enough to run on every input change)
+                if category_input:
+                    suggestions = suggest_categories(category_input)
+                    if suggestions:
+                        st.caption("Suggestions: " + ", ".join(suggestions))
+
+                # Straight-line distance, or real travel time from one batched matrix request
+                rank_by = st.selectbox(
+                    "Rank results by",
+                    ["Distance", "Travel time (walk)", "Travel time (drive)"],
+                    key="rank_by"
+                )
+
                 # Search button handler
                 if st.button("Search Businesses"):
                     if not category_input:
                         st.warning("Please enter a business type.")
                     else:
-                        # Match input to known categories
-                        matched_category = match_category(category_input)
+                        # Match input to known categories ("food" or "suya, shawarma" cover several)
+                        matched_categories = expand_categories(category_input)
 
-                        if not matched_category:
+                        if not matched_categories:
                             st.error("Business type not recognized. Please try again.")
                         else:
                             # Show loading spinner during search
-                            with st.spinner(f"Searching for {matched_category}..."):
-                                businesses = self.business_finder.search_businesses(current_coords, matched_category)
+                            with st.spinner(f"Searching for {', '.join(matched_categories)}..."):
+                                search_settings = self.config.get_default_settings()
+                                max_results = search_settings["max_results"]
+
+                                # Show each page as it arrives instead of waiting for the whole search
+                                batches = []
+                                for batch in self.business_finder.iter_category_pages(
+                                    current_coords,
+                                    matched_categories,
+                                    max_results=max_results,
+                                    page_size=search_settings["page_size"],
+                                    **self.config.get_multi_category_settings()
+                                ):
+                                    batches.append(batch)
+                                    self.show_search_progress(
+                                        search_progress, self.business_finder.merge_results(batches, max_results)
+                                    )
+                                businesses = self.business_finder.merge_results(batches, max_results)
+                                search_progress.empty()
 
                                 if not businesses:
                                     st.warning("No businesses found in that area.")
                                 else:
                                     # Store sorted results and refresh the page
-                                    st.session_state.current_businesses = self.business_finder.sort_by_distance(
-                                        businesses)
+                                    if rank_by == "Distance":
+                                        st.session_state.current_businesses = self.business_finder.sort_by_distance(
+                                            businesses)
+                                    else:
+                                        mode = "walk" if rank_by.endswith("(walk)") else "drive"
+                                        st.session_state.current_businesses = self.business_finder.sort_by_travel_time(
+                                            businesses, current_coords, mode)
+
+                                    # Warm the route cache for the closest results so directions appear instantly
+                                    if self.prefetch_settings["enabled"]:
+                                        self.route_prefetcher.prefetch(
+                                            current_coords,
+                                            st.session_state.current_businesses,
+                                            nearest=self.prefetch_settings["nearest"]
+                                        )
+                                    st.session_state.carry_trace = True
                                     st.rerun()  # Refresh to show results
 
         # Main content area - only show if we have search results
         if 'current_businesses' in st.session_state and 'user_coords' in st.session_state:
             # Display the interactive map at the top
-            self.render_map(st.session_state.user_coords, st.session_state.current_businesses)
+            with metrics.timer("render_map"):
+                self.render_map(st.session_state.user_coords, st.session_state.current_businesses)
 
             # Show results header
             st.subheader("Search Results")
 
             # Display all business listings
-            self.display_businesses(st.session_state.current_businesses, st.session_state.user_coords)
+            with metrics.timer("display_businesses"):
+                self.display_businesses(st.session_state.current_businesses, st.session_state.user_coords)
 
             # New search button to reset everything
             if st.button("New Search"):
                 # Clear stored results and coordinates
-                for key in ['current_businesses', 'user_coords']:
+                for key in ['current_businesses', 'user_coords', 'lookups']:
                     if key in st.session_state:
                         del st.session_state[key]
-                st.rerun()  # Refresh to show empty search form
\ No newline at end of file
+                st.rerun()  # Refresh to show empty search form
+
+        # Optional timing and metrics panel, drawn last so it covers the whole rerun
+        with st.sidebar:
+            if st.checkbox("Debug panel", value=self.config.debug_panel, key="show_debug_panel"):
+                self.render_debug_panel(time.perf_counter() - page_start)
+
+        # Ratings or travel times still loading: look again shortly. The whole page is already
+        # drawn and usable; a click during the pause just starts its own rerun instead.
+        if 'current_businesses' in st.session_state and self.lookups_pending():
+            time.sleep(self.display_settings["poll_interval"])
+            st.rerun()
+
+    @staticmethod
+    def render_debug_panel(page_seconds: float) -> None:
+        """
+        Show where this rerun spent its time, plus provider and cache metrics for the process.
+
+        Args:
+            page_seconds (float): Wall time of this rerun so far.
+        """
+        metrics = get_metrics()
+        trace = metrics.trace()
+
+        st.subheader("Debug")
+        st.caption(f"This rerun: {page_seconds * 1000:.0f} ms, {sum(e['kind'] == 'request' for e in trace)} provider calls")
+
+        # Per-endpoint totals for this rerun, then every stage and request in order
+        totals = {}
+        for event in trace:
+            if event["kind"] == "request":
+                total = totals.setdefault(event["name"], {"endpoint": event["name"], "calls": 0, "total_ms": 0.0})
+                total["calls"] += 1
+                total["total_ms"] = round(total["total_ms"] + event["ms"], 2)
+        if totals:
+            st.write("**Provider calls (this rerun)**")
+            st.dataframe(sorted(totals.values(), key=lambda t: -t["total_ms"]), hide_index=True)
+        if trace:
+            st.write("**Timeline**")
+            st.dataframe(trace, hide_index=True)
+
+        summary = metrics.to_json()
+        st.write("**Caches**")
+        st.dataframe([{"cache": name, "hits": values.get("hits"), "misses": values.get("misses"),
+                       "hit_ratio": values.get("hit_ratio")} for name, values in summary["caches"].items()],
+                     hide_index=True)
+        if summary["retries"]:
+            st.write("**Retries**", summary["retries"])
+        st.write("**Status codes**", summary["status_codes"])
+
+        st.download_button("Metrics (JSON)", metrics.to_json_text(), file_name="metrics.json",
+                           mime="application/json")
+        st.download_button("Metrics (Prometheus)", metrics.to_prometheus(), file_name="metrics.prom",
+                           mime="text/plain")
+
+
+# Shared GUI manager for the whole process: Streamlit re-executes main.py on every interaction,
+# and building a new one each time re-created the finder, enricher and their thread pools
+_gui_manager = None
+_gui_manager_lock = threading.Lock()
+
+
+def get_gui_manager() -> GUIManager:
+    """
+    Return the process-wide GUIManager, creating it (and its services) on first use.
+
+    Returns:
+        GUIManager: Shared manager; call run_app() on it for each rerun.
+    """
+    global _gui_manager
+    if _gui_manager is None:
+        with _gui_manager_lock:
+            if _gui_manager is None:
+                _gui_manager = GUIManager()
+    return _gui_manager
@@ -1,6 +1,16 @@
 # core/location_manager.py
+import threading
+
 import requests
 
+from config.cache import SQLiteTTLCache, normalize_address
+from config.config import get_config
+from config.http import http_get
+from config.utils import time_function
+
+# Guards creation of the shared geocode cache (GUI, batch and async callers can race on first use)
+_cache_lock = threading.Lock()
+
 
 class LocationManager:
     """
@@ -8,18 +18,40 @@ class LocationManager:
 
     This class provides static methods for interacting with the Geoapify
     geocoding API to convert human-readable addresses to geographic coordinates.
+    Results are kept in a local disk cache so repeated lookups skip the network.
     """
 
     # Instead of importing the endpoint from another file, we define it here so that the class is self-contained and reusable.
     # This also makes it easier to override or test if needed.
 
-    GEOCODE_ENDPOINT = "https://api.geoapify.com/v1/geocode/search"
+    GEOCODE_ENDPOINT = get_config().get_endpoint("geoapify", "/v1/geocode/search")
+
+    # Shared geocode cache, created on first use (see get_cache)
+    cache = None
+
+    @classmethod
+    def get_cache(cls) -> SQLiteTTLCache:
+        """
+        Return the process-wide geocode cache, creating it from the Config settings on first use.
+
+        Returns:
+            SQLiteTTLCache: Cache of normalized address -> geocode result.
+        """
+        if cls.cache is None:
+            with _cache_lock:
+                if cls.cache is None:
+                    cls.cache = SQLiteTTLCache(**get_config().get_cache_settings("geocode"))
+        return cls.cache
 
     @staticmethod
+    @time_function
     def geocode_address(address: str, api_key: str) ->dict|None :
         """
         Convert a human-readable address to geographic coordinates.
 
+        The address is normalized (case, spacing, punctuation) and looked up in the geocode
+        cache first. Addresses with no results are cached too, for a shorter time.
+
         Args:
             address (str): The address to geocode (e.g., "1600 Pennsylvania Ave NW, Washington, DC")
             api_key (str): Geoapify API key
@@ -33,37 +65,77 @@ class LocationManager:
         Raises:
             Prints error message to console if API request fails
         """
-        params = {
+        cache_key = normalize_address(address)
+        if not cache_key:
+            return None
+
+        try:
+            return LocationManager.get_cache().get_or_load(
+                cache_key,
+                lambda: LocationManager._fetch_geocode(address, api_key)
+            )
+
+        except requests.exceptions.RequestException as e:
+            print(f"Network error during geocoding: {e}")
+            return None
+        except (KeyError, IndexError) as e:
+            print(f"Data parsing error: {e}")
+            return None
+
+    @staticmethod
+    def _fetch_geocode(address: str, api_key: str) -> dict|None:
+        """
+        Call the Geoapify geocoder for a single address (no caching).
+
+        Args:
+            address (str): The address to geocode.
+            api_key (str): Geoapify API key
+
+        Returns:
+            dict or None: Geocode result, or None if the API found nothing.
+
+        Raises:
+            requests.exceptions.RequestException: On network or HTTP errors (these are never cached).
+        """
+        print(f"Attempting to geocode: {address}")  # Debug print
+        response = http_get(LocationManager.GEOCODE_ENDPOINT, params=LocationManager.geocode_params(address, api_key), timeout=10)
+        print(f"API Response Status: {response.status_code}")  # Debug
+
+        response.raise_for_status()
+        data = response.json()
+
+        print(f"API Response Data: {data}")  # Debug
+
+        return LocationManager.parse_geocode(data)
+
+    @staticmethod
+    def geocode_params(address: str, api_key: str) -> dict:
+        """Query parameters for a Geoapify geocoding request (shared by the sync and async clients)."""
+        return {
             'text': address,
             'apiKey': api_key,
             'format': 'json',
             'limit': 1
         }
 
-        try:
-            print(f"Attempting to geocode: {address}")  # Debug print
-            response = requests.get(LocationManager.GEOCODE_ENDPOINT, params=params, timeout=10)
-            print(f"API Response Status: {response.status_code}")  # Debug
-
-            response.raise_for_status()
-            data = response.json()
-
-            print(f"API Response Data: {data}")  # Debug
-
-            if not data.get('results'):
-                print("No results found in API response")
-                return None
+    @staticmethod
+    def parse_geocode(data: dict) -> dict|None:
+        """
+        Extract the first result of a Geoapify geocoding response.
 
-            result = data['results'][0]
-            return {
-                'lat': result['lat'],
-                'lon': result['lon'],
-                'address': result['formatted']
-            }
+        Args:
+            data (dict): Parsed geocoding response.
 
-        except requests.exceptions.RequestException as e:
-            print(f"Network error during geocoding: {e}")
+        Returns:
+            dict or None: {'lat', 'lon', 'address'}, or None if there were no results.
+        """
+        if not data.get('results'):
+            print("No results found in API response")
             return None
-        except (KeyError, IndexError) as e:
-            print(f"Data parsing error: {e}")
-            return None
\ No newline at end of file
+
+        result = data['results'][0]
+        return {
+            'lat': result['lat'],
+            'lon': result['lon'],
+            'address': result['formatted']
+        }
@@ -0,0 +1,181 @@
+# core/map_renderer.py
+import hashlib
+import html as html_lib
+import threading
+from collections import OrderedDict
+from typing import List, Tuple
+
+from config.config import get_config
+from config.metrics import get_metrics
+
+# Client-side popup for FastMarkerCluster: each data row is [lat, lon, name]
+_FAST_MARKER_CALLBACK = """
+function (row) {
+    var marker = L.marker(new L.LatLng(row[0], row[1]));
+    marker.bindPopup(row[2]);
+    return marker;
+};
+"""
+
+
+class MapRenderer:
+    """
+    Renders the results map to HTML, caching the output per result set and user position.
+
+    Streamlit reruns the whole script on every interaction, so the same map used to be rebuilt
+    and re-serialized each time. Here the HTML is keyed by a hash of the user position and
+    the businesses shown, and kept in a small LRU cache. Large result sets are drawn with
+    marker clustering, and very large ones with a single FastMarkerCluster layer (one JS
+    array instead of one Python object per marker).
+    """
+
+    def __init__(self, zoom: int = 14, tiles: str = "OpenStreetMap", cluster_threshold: int = 50,
+                 fast_cluster_threshold: int = 300, cache_size: int = 16) -> None:
+        """
+        Args:
+            zoom (int): Initial zoom level.
+            tiles (str): Folium tile layer name.
+            cluster_threshold (int): Above this many businesses, markers are clustered.
+            fast_cluster_threshold (int): Above this many, a FastMarkerCluster layer is used.
+            cache_size (int): Rendered maps kept in memory.
+        """
+        self.zoom = zoom
+        self.tiles = tiles
+        self.cluster_threshold = cluster_threshold
+        self.fast_cluster_threshold = fast_cluster_threshold
+        self.cache_size = cache_size
+
+        self._cache = OrderedDict()  # key -> HTML, most recently used last
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def cache_key(user_coords: Tuple[float, float], businesses: List) -> str:
+        """
+        Hash of everything the map shows: the user position (to ~1 m) and each business marker.
+
+        Args:
+            user_coords (tuple): (latitude, longitude) of the user.
+            businesses (list): Business objects on the map.
+
+        Returns:
+            str: Hex digest.
+        """
+        digest = hashlib.sha1(f"{user_coords[0]:.5f},{user_coords[1]:.5f}".encode())
+        for business in businesses:
+            digest.update(f"|{business.latitude:.6f},{business.longitude:.6f},{business.name}".encode())
+        return digest.hexdigest()
+
+    def render_html(self, user_coords: Tuple[float, float], businesses: List) -> str:
+        """
+        Return the map as a standalone HTML document, from the cache when nothing changed.
+
+        Args:
+            user_coords (tuple): (latitude, longitude) of the user, used as the map center.
+            businesses (list): Business objects to show.
+
+        Returns:
+            str: HTML document.
+        """
+        key = self.cache_key(user_coords, businesses)
+        with self._lock:
+            html = self._cache.get(key)
+            if html is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return html
+            self.misses += 1
+
+        html = self.build_map(user_coords, businesses).get_root().render()
+
+        with self._lock:
+            self._cache[key] = html
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return html
+
+    def build_map(self, user_coords: Tuple[float, float], businesses: List) -> "folium.Map":
+        """
+        Build the Folium map, choosing the marker strategy from the number of businesses.
+
+        Args:
+            user_coords (tuple): (latitude, longitude) of the user.
+            businesses (list): Business objects to show.
+
+        Returns:
+            folium.Map: The map.
+        """
+        # Folium takes about a second to import; cached renders never need it
+        import folium
+        from folium.plugins import FastMarkerCluster, MarkerCluster
+
+        user_map = folium.Map(location=user_coords, zoom_start=self.zoom, tiles=self.tiles)
+
+        # Adding marker for the user's location (green, labeled "Your Location")
+        folium.Marker(
+            location=user_coords,
+            popup="Your Location",
+            icon=folium.Icon(color="green", icon="user")
+        ).add_to(user_map)
+
+        count = len(businesses)
+        if count > self.fast_cluster_threshold:
+            # One JS data array; markers are created in the browser only when their cluster is opened
+            data = [[b.latitude, b.longitude, html_lib.escape(b.name or "")] for b in businesses]
+            FastMarkerCluster(data, callback=_FAST_MARKER_CALLBACK).add_to(user_map)
+        elif count > self.cluster_threshold:
+            cluster = MarkerCluster().add_to(user_map)
+            for business in businesses:
+                folium.Marker(
+                    location=(business.latitude, business.longitude),
+                    popup=business.name,
+                    icon=folium.Icon(color="red", icon="info-sign")
+                ).add_to(cluster)
+        else:
+            # Small result sets: individual markers plus a straight line from the user to each business
+            for business in businesses:
+                folium.Marker(
+                    location=(business.latitude, business.longitude),
+                    popup=business.name,
+                    icon=folium.Icon(color="red", icon="info-sign")
+                ).add_to(user_map)
+                folium.PolyLine(
+                    locations=[user_coords, (business.latitude, business.longitude)],
+                    color='gray',
+                    weight=2,
+                    opacity=0.7
+                ).add_to(user_map)
+        return user_map
+
+    def stats(self) -> dict:
+        """Cache hit/miss counters."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._cache),
+            "hit_ratio": round(self.hits / total, 3) if total else 0.0,
+        }
+
+
+# Shared renderer for the whole process, so every browser session draws from one rendered-HTML LRU
+_map_renderer = None
+_map_renderer_lock = threading.Lock()
+
+
+def get_map_renderer() -> MapRenderer:
+    """
+    Return the process-wide map renderer, creating it from the Config settings on first use.
+
+    Returns:
+        MapRenderer: Shared renderer and its HTML cache.
+    """
+    global _map_renderer
+    if _map_renderer is None:
+        with _map_renderer_lock:
+            if _map_renderer is None:
+                _map_renderer = MapRenderer(**get_config().get_map_render_settings())
+                get_metrics().register_cache("map_html", _map_renderer.stats)
+    return _map_renderer
@@ -0,0 +1,168 @@
+# core/places_cache.py
+import logging
+import math
+import threading
+import time
+from typing import List, Tuple
+
+from haversine import haversine
+
+from config.config import get_config
+from config.metrics import get_metrics
+from core.geo import distances_from, feature_coordinates
+
+
+class PlacesCache:
+    """
+    In-memory cache of Geoapify Places results that understands geography.
+
+    Each entry remembers the (category, centre, radius) circle it was fetched for. A new search
+    is answered locally when a fresh cached circle of the same category fully contains the new
+    circle: we just keep the cached features that fall inside it. Only complete result sets
+    (those that were not cut short by the result cap) can answer a different, smaller circle.
+    """
+
+    def __init__(self, ttl: float = 900, max_entries: int = 200) -> None:
+        """
+        Initialize an empty cache.
+
+        Args:
+            ttl (float): Seconds a cached search stays fresh.
+            max_entries (int): Maximum cached searches; the oldest are dropped first.
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = []  # Each entry is a dict, newest last
+        self._lock = threading.Lock()
+
+        # Counters for reporting how much network traffic the cache saved
+        self.hits = 0
+        self.containment_hits = 0
+        self.misses = 0
+        self.network_calls_avoided = 0
+
+    def lookup(self, category: str, center: Tuple[float, float], radius: float,
+               max_results: int, page_size: int = 20) -> List[dict] | None:
+        """
+        Answer a search from the cache if possible.
+
+        Args:
+            category (str): Geoapify category.
+            center (tuple): (latitude, longitude) of the search centre.
+            radius (float): Search radius in meters.
+            max_results (int): Result cap of the search.
+            page_size (int): Page size the search would have used (for counting avoided calls).
+
+        Returns:
+            list or None: Features within the circle, nearest first, with 'distance' measured
+            from the new centre; None if the cache can't answer.
+        """
+        now = time.time()
+        with self._lock:
+            self._entries = [entry for entry in self._entries if entry["expires_at"] > now]
+
+            for entry in reversed(self._entries):
+                if entry["category"] != category:
+                    continue
+
+                offset_m = haversine(entry["center"], center) * 1000
+                exact = offset_m < 1 and entry["radius"] == radius and entry["max_results"] >= max_results
+                contained = entry["complete"] and offset_m + radius <= entry["radius"]
+                if not (exact or contained):
+                    continue
+
+                features = self._filter(entry["features"], center, radius)[:max_results]
+
+                self.hits += 1
+                if not exact:
+                    self.containment_hits += 1
+                self.network_calls_avoided += max(1, math.ceil(len(features) / page_size))
+                logging.debug(f"Places cache hit for {category} ({len(features)} features, exact={exact})")
+                return features
+
+            self.misses += 1
+            return None
+
+    def store(self, category: str, center: Tuple[float, float], radius: float,
+              max_results: int, features: List[dict]) -> None:
+        """
+        Remember the features returned for a search.
+
+        Args:
+            category (str): Geoapify category.
+            center (tuple): (latitude, longitude) of the search centre.
+            radius (float): Search radius in meters.
+            max_results (int): Result cap the search used; fewer features than this means the set is complete.
+            features (list): Raw Geoapify features.
+        """
+        entry = {
+            "category": category,
+            "center": tuple(center),
+            "radius": radius,
+            "max_results": max_results,
+            "complete": len(features) < max_results,
+            "features": features,
+            "expires_at": time.time() + self.ttl,
+        }
+        with self._lock:
+            self._entries.append(entry)
+            if len(self._entries) > self.max_entries:
+                del self._entries[:len(self._entries) - self.max_entries]
+
+    def clear(self) -> None:
+        """Drop every cached search."""
+        with self._lock:
+            self._entries = []
+
+    def stats(self) -> dict:
+        """
+        Return the cache counters.
+
+        Returns:
+            dict: hits, containment_hits, misses, network_calls_avoided and size.
+        """
+        return {
+            "hits": self.hits,
+            "containment_hits": self.containment_hits,
+            "misses": self.misses,
+            "network_calls_avoided": self.network_calls_avoided,
+            "size": len(self._entries),
+        }
+
+    @staticmethod
+    def _filter(features: List[dict], center: Tuple[float, float], radius: float) -> List[dict]:
+        """Keep the features inside the circle and re-measure their distance from its centre (vectorized)."""
+        if not features:
+            return []
+
+        distances = distances_from(center, *feature_coordinates(features))
+        inside = []
+        for index in distances.argsort(kind="stable"):
+            distance = float(distances[index])
+            if not distance <= radius:
+                break # Sorted nearest first (NaN last), so everything after this is outside too
+            feature = features[index]
+            properties = dict(feature.get("properties", {}), distance=round(distance, 2))
+            inside.append(dict(feature, properties=properties))
+        return inside
+
+
+# Shared cache for the whole process, created on first use
+_places_cache = None
+_places_cache_lock = threading.Lock()
+
+
+def get_places_cache() -> PlacesCache:
+    """
+    Return the process-wide Places cache, creating it from the Config settings on first use.
+
+    Returns:
+        PlacesCache: Shared cache.
+    """
+    global _places_cache
+    if _places_cache is None:
+        with _places_cache_lock:
+            if _places_cache is None:
+                _places_cache = PlacesCache(**get_config().get_places_cache_settings())
+                get_metrics().register_cache("places", _places_cache.stats)
+    return _places_cache
@@ -0,0 +1,688 @@
+# core/poi_index.py
+import json
+import logging
+import math
+import os
+import sqlite3
+import threading
+import time
+import xml.etree.ElementTree as ET
+from typing import Iterable, Iterator, List, Tuple
+
+from config.config import get_config
+from config.metrics import get_metrics
+from core.constant import GEOAPIFY_CATEGORIES
+from core.geo import EARTH_RADIUS_M, distances_from
+
+# OpenStreetMap tags mapped onto the app's (Geoapify-style) category taxonomy
+OSM_TAG_CATEGORIES = {
+    ("tourism", "hotel"): "accommodation.hotel",
+    ("tourism", "hostel"): "accommodation.hostel",
+    ("tourism", "guest_house"): "accommodation.guest_house",
+    ("tourism", "motel"): "accommodation.motel",
+    ("tourism", "apartment"): "accommodation.apartment",
+    ("tourism", "chalet"): "accommodation.chalet",
+    ("tourism", "camp_site"): "accommodation.camping",
+    ("tourism", "caravan_site"): "accommodation.caravan_site",
+    ("leisure", "resort"): "accommodation.resort",
+    ("amenity", "restaurant"): "catering.restaurant",
+    ("amenity", "fast_food"): "catering.fast_food",
+    ("amenity", "cafe"): "catering.cafe",
+    ("amenity", "pub"): "catering.pub",
+    ("amenity", "bar"): "catering.bar",
+    ("amenity", "biergarten"): "entertainment.beer_parlour",
+    ("amenity", "food_court"): "catering.food_court",
+    ("amenity", "ice_cream"): "catering.ice_cream",
+    ("amenity", "bbq"): "catering.barbecue",
+    ("shop", "bakery"): "catering.bakery",
+    ("shop", "confectionery"): "catering.confectionery",
+    ("shop", "tea"): "catering.tea_house",
+    ("shop", "coffee"): "catering.roastery",
+    ("shop", "supermarket"): "commercial.supermarket",
+    ("amenity", "bank"): "commercial.bank",
+    ("amenity", "atm"): "commercial.atm",
+    ("shop", "mall"): "commercial.mall",
+    ("shop", "department_store"): "commercial.department_store",
+    ("shop", "convenience"): "commercial.convenience",
+    ("shop", "kiosk"): "commercial.kiosk",
+    ("shop", "chemist"): "commercial.chemist",
+    ("shop", "optician"): "commercial.optometrist",
+    ("amenity", "marketplace"): "commercial.market",
+    ("shop", "furniture"): "commercial.furniture",
+    ("shop", "electronics"): "commercial.electronics",
+    ("shop", "hardware"): "commercial.hardware",
+    ("shop", "doityourself"): "commercial.hardware",
+    ("shop", "clothes"): "commercial.clothing",
+    ("shop", "tailor"): "commercial.tailor",
+    ("craft", "tailor"): "commercial.tailor",
+    ("shop", "beauty"): "commercial.beauty_salon",
+    ("shop", "hairdresser"): "commercial.beauty_salon",
+    ("shop", "laundry"): "commercial.laundry",
+    ("shop", "dry_cleaning"): "commercial.laundry",
+    ("shop", "copyshop"): "commercial.print_shop",
+    ("shop", "mobile_phone"): "commercial.mobile_phone",
+    ("shop", "computer"): "commercial.computer",
+    ("shop", "pawnbroker"): "commercial.pawn_shop",
+    ("amenity", "fuel"): "commercial.petrol_station",
+    ("shop", "car"): "commercial.car_dealer",
+    ("shop", "frozen_food"): "commercial.cold_room",
+    ("amenity", "cinema"): "entertainment.cinema",
+    ("amenity", "nightclub"): "entertainment.nightclub",
+    ("amenity", "theatre"): "entertainment.theatre",
+    ("amenity", "casino"): "entertainment.casino",
+    ("leisure", "amusement_arcade"): "entertainment.amusement_arcade",
+    ("leisure", "bowling_alley"): "entertainment.bowling_alley",
+    ("amenity", "karaoke_box"): "entertainment.karaoke",
+    ("leisure", "escape_game"): "entertainment.escape_game",
+    ("amenity", "events_venue"): "entertainment.event_venue",
+    ("tourism", "viewpoint"): "entertainment.viewpoint",
+    ("amenity", "hospital"): "healthcare.hospital",
+    ("healthcare", "hospital"): "healthcare.hospital",
+    ("amenity", "pharmacy"): "healthcare.pharmacy",
+    ("healthcare", "pharmacy"): "healthcare.pharmacy",
+    ("amenity", "clinic"): "healthcare.clinic",
+    ("healthcare", "clinic"): "healthcare.clinic",
+    ("amenity", "dentist"): "healthcare.dentist",
+    ("healthcare", "dentist"): "healthcare.dentist",
+    ("amenity", "doctors"): "healthcare.doctors",
+    ("healthcare", "doctor"): "healthcare.doctors",
+    ("amenity", "veterinary"): "healthcare.veterinary",
+    ("healthcare", "physiotherapist"): "healthcare.physiotherapist",
+    ("healthcare", "laboratory"): "healthcare.laboratory",
+    ("healthcare", "birthing_centre"): "healthcare.maternity_clinic",
+    ("healthcare", "optometrist"): "healthcare.optical",
+    ("healthcare", "psychotherapist"): "healthcare.psychologist",
+    ("healthcare", "alternative"): "healthcare.traditional",
+    ("healthcare", "midwife"): "healthcare.midwife",
+    ("leisure", "park"): "leisure.park",
+    ("leisure", "sports_centre"): "leisure.sports_centre",
+    ("leisure", "fitness_centre"): "leisure.sports_centre",
+    ("leisure", "swimming_pool"): "leisure.swimming_pool",
+    ("leisure", "golf_course"): "leisure.golf_course",
+    ("leisure", "stadium"): "leisure.stadium",
+    ("amenity", "place_of_worship"): "religion.place_of_worship",
+    ("building", "church"): "religion.church",
+    ("building", "mosque"): "religion.mosque",
+    ("building", "temple"): "religion.temple",
+    ("building", "synagogue"): "religion.synagogue",
+    ("historic", "wayside_shrine"): "religion.shrine",
+    ("amenity", "monastery"): "religion.monastery",
+    ("landuse", "cemetery"): "religion.cemetery",
+    ("amenity", "grave_yard"): "religion.graveyard",
+    ("aeroway", "aerodrome"): "transportation.airport",
+    ("amenity", "bus_station"): "transportation.bus_station",
+    ("amenity", "car_rental"): "transportation.car_rental",
+    ("amenity", "parking"): "transportation.parking",
+    ("amenity", "taxi"): "transportation.taxi",
+    ("amenity", "bicycle_rental"): "transportation.bicycle_rental",
+    ("amenity", "motorcycle_rental"): "transportation.motorcycle_rental",
+    ("amenity", "ferry_terminal"): "transportation.ferry_terminal",
+    ("highway", "traffic_signals"): "transportation.traffic_light",
+    ("amenity", "charging_station"): "transportation.charging_station",
+    ("highway", "bus_stop"): "transportation.bus_stop",
+    ("amenity", "school"): "education.school",
+    ("amenity", "university"): "education.university",
+    ("amenity", "library"): "education.library",
+    ("amenity", "college"): "education.college",
+    ("amenity", "kindergarten"): "education.kindergarten",
+    ("amenity", "driving_school"): "education.driving_school",
+    ("amenity", "music_school"): "education.music_school",
+    ("amenity", "language_school"): "education.language_school",
+    ("amenity", "prep_school"): "education.tutoring_center",
+    ("tourism", "attraction"): "tourism.attraction",
+    ("tourism", "museum"): "tourism.museum",
+    ("tourism", "zoo"): "tourism.zoo",
+    ("tourism", "aquarium"): "tourism.aquarium",
+    ("tourism", "gallery"): "tourism.gallery",
+    ("tourism", "theme_park"): "tourism.theme_park",
+    ("historic", "monument"): "tourism.monument",
+    ("historic", "memorial"): "tourism.monument",
+    ("amenity", "arts_centre"): "tourism.cultural_center",
+    ("natural", "beach"): "tourism.beach",
+    ("waterway", "waterfall"): "tourism.waterfall",
+    ("leisure", "nature_reserve"): "tourism.nature_reserve",
+    ("amenity", "police"): "government.police",
+    ("amenity", "post_office"): "government.post_office",
+    ("amenity", "fire_station"): "government.fire_station",
+    ("amenity", "courthouse"): "government.courthouse",
+    ("office", "diplomatic"): "government.embassy",
+    ("landuse", "military"): "government.military",
+    ("amenity", "prison"): "government.prison",
+    ("amenity", "townhall"): "government.townhall",
+    ("amenity", "customs"): "government.customs",
+    ("amenity", "car_wash"): "service.vehicle.car_wash",
+    ("shop", "car_repair"): "service.vehicle.repair",
+    ("shop", "tyres"): "service.vehicle.repair",
+    ("shop", "car_parts"): "service.vehicle.parts",
+    ("amenity", "vehicle_inspection"): "service.vehicle.inspection",
+    ("craft", "electrician"): "service.electrician",
+    ("craft", "plumber"): "service.plumber",
+    ("shop", "locksmith"): "service.locksmith",
+    ("craft", "locksmith"): "service.locksmith",
+    ("shop", "funeral_directors"): "service.funeral_services",
+    ("craft", "photographer"): "service.photographer",
+    ("amenity", "internet_cafe"): "service.cyber_cafe",
+    ("man_made", "works"): "industrial.factory",
+    ("building", "warehouse"): "industrial.warehouse",
+    ("landuse", "construction"): "industrial.construction",
+    ("landuse", "farmland"): "industrial.farm",
+    ("landuse", "quarry"): "industrial.quarry",
+    ("power", "plant"): "industrial.energy",
+}
+
+# Tags with no specific mapping above still land in their top-level category
+OSM_KEY_CATEGORIES = {
+    "shop": "commercial",
+    "tourism": "tourism",
+    "healthcare": "healthcare",
+    "craft": "service",
+}
+
+_KNOWN_CATEGORIES = frozenset(GEOAPIFY_CATEGORIES)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS poi (
+    id INTEGER PRIMARY KEY,
+    source_id TEXT NOT NULL UNIQUE,
+    name TEXT,
+    address TEXT,
+    lat REAL NOT NULL,
+    lon REAL NOT NULL,
+    phone TEXT,
+    email TEXT,
+    website TEXT,
+    categories TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS poi_category (
+    poi_id INTEGER NOT NULL,
+    category TEXT NOT NULL,
+    PRIMARY KEY (poi_id, category)
+) WITHOUT ROWID;
+CREATE VIRTUAL TABLE IF NOT EXISTS poi_rtree USING rtree(id, min_lat, max_lat, min_lon, max_lon);
+CREATE TABLE IF NOT EXISTS region (
+    name TEXT PRIMARY KEY,
+    min_lat REAL, max_lat REAL, min_lon REAL, max_lon REAL,
+    source TEXT,
+    pois INTEGER,
+    imported_at REAL
+);
+"""
+
+
+def with_parents(category: str) -> List[str]:
+    """
+    A category and every known ancestor, so parent searches ("catering") find leaf places.
+
+    Args:
+        category (str): e.g. "service.vehicle.repair".
+
+    Returns:
+        list: e.g. ["service.vehicle.repair", "service.vehicle", "service"] (unknown names dropped).
+    """
+    parts = category.split(".")
+    return [name for name in (".".join(parts[:i]) for i in range(len(parts), 0, -1)) if name in _KNOWN_CATEGORIES]
+
+
+def categories_from_tags(tags: dict) -> List[str]:
+    """
+    Map OpenStreetMap tags to categories.
+
+    Args:
+        tags (dict): OSM tags, e.g. {"amenity": "pharmacy", "name": "..."}.
+
+    Returns:
+        list: Matching categories (most specific first for each tag), empty if none apply.
+    """
+    categories = []
+    for key, value in tags.items():
+        category = OSM_TAG_CATEGORIES.get((key, value)) or OSM_KEY_CATEGORIES.get(key)
+        if category:
+            categories.append(category)
+    # Religion refines the generic place of worship
+    if tags.get("amenity") == "place_of_worship":
+        categories.append({"christian": "religion.church", "muslim": "religion.mosque",
+                           "jewish": "religion.synagogue"}.get(tags.get("religion"), "religion.place_of_worship"))
+    return list(dict.fromkeys(categories))
+
+
+# Every category an import can store, with its ancestors (religion.* comes from the place_of_worship rule)
+_MAPPED_CATEGORIES = frozenset(
+    name
+    for category in (*OSM_TAG_CATEGORIES.values(), *OSM_KEY_CATEGORIES.values(), "religion.church",
+                     "religion.mosque", "religion.synagogue", "religion.place_of_worship")
+    for name in with_parents(category)
+)
+
+
+def is_mapped_category(category: str) -> bool:
+    """
+    Whether OSM imports hold every place of a category, so a local search can be complete.
+
+    A category qualifies if imports store it and each of its known subcategories, or if it is a
+    catch-all from OSM_KEY_CATEGORIES (every shop=* lands in "commercial"). "catering" does not,
+    since bukas and suya spots have no OSM tag.
+
+    Args:
+        category (str): Category, or several separated by commas (all must qualify).
+
+    Returns:
+        bool: True if the local index can answer searches for it.
+    """
+    for name in (part.strip() for part in category.split(",")):
+        if name in OSM_KEY_CATEGORIES.values():
+            continue
+        if name not in _MAPPED_CATEGORIES or any(known not in _MAPPED_CATEGORIES for known in _KNOWN_CATEGORIES
+                                                 if known.startswith(name + ".")):
+            return False
+    return True
+
+
+def address_from_tags(tags: dict) -> str | None:
+    """Build a one-line address from OSM addr:* tags."""
+    street = " ".join(filter(None, (tags.get("addr:housenumber"), tags.get("addr:street"))))
+    parts = [street, tags.get("addr:suburb"), tags.get("addr:city"), tags.get("addr:state")]
+    return ", ".join(part for part in parts if part) or None
+
+
+def record_from_tags(source_id: str, lat: float, lon: float, tags: dict) -> dict | None:
+    """A POI record from OSM tags, or None if the tags map to no category."""
+    categories = categories_from_tags(tags)
+    if not categories:
+        return None
+    return {
+        "source_id": source_id,
+        "name": tags.get("name") or tags.get("brand"),
+        "address": address_from_tags(tags),
+        "lat": lat,
+        "lon": lon,
+        "phone": tags.get("phone") or tags.get("contact:phone"),
+        "email": tags.get("email") or tags.get("contact:email"),
+        "website": tags.get("website") or tags.get("contact:website"),
+        "categories": categories,
+    }
+
+
+def _geometry_point(geometry: dict) -> Tuple[float, float] | None:
+    """(lat, lon) of a GeoJSON geometry: the point itself, or the mean of a line/polygon's vertices."""
+    if not geometry:
+        return None
+    coordinates = geometry.get("coordinates")
+    kind = geometry.get("type")
+    if kind == "Point":
+        return coordinates[1], coordinates[0]
+    if kind in ("LineString", "MultiPoint"):
+        points = coordinates
+    elif kind in ("Polygon", "MultiLineString"):
+        points = coordinates[0]
+    elif kind == "MultiPolygon":
+        points = coordinates[0][0]
+    else:
+        return None
+    if not points:
+        return None
+    return sum(p[1] for p in points) / len(points), sum(p[0] for p in points) / len(points)
+
+
+def iter_geojson(path: str) -> Iterator[dict]:
+    """
+    POI records from a GeoJSON FeatureCollection.
+
+    Features may carry Geoapify-style properties ("categories", "formatted", "contact") or
+    OSM tags (flat in the properties, as osmtogeojson writes them, or under "tags").
+
+    Args:
+        path (str): GeoJSON file.
+
+    Yields:
+        dict: POI records.
+    """
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+
+    for i, feature in enumerate(data.get("features", [])):
+        point = _geometry_point(feature.get("geometry"))
+        if point is None:
+            continue
+        properties = feature.get("properties") or {}
+        source_id = str(properties.get("place_id") or feature.get("id") or properties.get("@id")
+                        or properties.get("osm_id") or f"{os.path.basename(path)}:{i}")
+
+        known = [c for c in properties.get("categories") or [] if c in _KNOWN_CATEGORIES]
+        if known:
+            contact = properties.get("contact") or {}
+            record = {
+                "source_id": source_id,
+                "name": properties.get("name"),
+                "address": properties.get("formatted"),
+                "lat": point[0],
+                "lon": point[1],
+                "phone": contact.get("phone"),
+                "email": contact.get("email"),
+                "website": contact.get("website") or properties.get("website"),
+                "categories": known,
+            }
+        else:
+            tags = properties.get("tags") if isinstance(properties.get("tags"), dict) else properties
+            record = record_from_tags(source_id, point[0], point[1], tags)
+        if record:
+            yield record
+
+
+class POIIndex:
+    """
+    On-disk spatial index of points of interest for offline searches.
+
+    POIs live in SQLite: an R*Tree over their positions, and a (poi, category) table that
+    holds every category and its parents, so "catering" finds restaurants. A radius query
+    reads the R*Tree rows in the circle's bounding box that have the category, then measures
+    them exactly (vectorized) and keeps the ones inside the circle. Results come back as
+    Geoapify-style features, so BusinessFinder.parse_results turns them into the same
+    Business objects as a live search.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Open (or create) the index.
+
+        Args:
+            path (str): SQLite file path, or ":memory:".
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory and path != ":memory:":
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def insert(self, records: Iterable[dict], batch_size: int = 5000) -> int:
+        """
+        Add or replace POIs (matched by source_id).
+
+        Args:
+            records (iterable): POI records with source_id, name, address, lat, lon, phone,
+                email, website and categories.
+            batch_size (int): Records written per transaction.
+
+        Returns:
+            int: Records written.
+        """
+        count, batch = 0, []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                count += self._insert_batch(batch)
+                batch = []
+        if batch:
+            count += self._insert_batch(batch)
+        return count
+
+    def _insert_batch(self, records: List[dict]) -> int:
+        with self._lock, self._conn:
+            for record in records:
+                row = self._conn.execute("SELECT id FROM poi WHERE source_id = ?", (record["source_id"],)).fetchone()
+                if row:
+                    self._conn.execute("DELETE FROM poi_rtree WHERE id = ?", row)
+                    self._conn.execute("DELETE FROM poi_category WHERE poi_id = ?", row)
+
+                cursor = self._conn.execute(
+                    "INSERT OR REPLACE INTO poi (id, source_id, name, address, lat, lon, phone, email, website, categories) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (row[0] if row else None, record["source_id"], record.get("name"), record.get("address"),
+                     record["lat"], record["lon"], record.get("phone"), record.get("email"), record.get("website"),
+                     json.dumps(record["categories"]))
+                )
+                poi_id = cursor.lastrowid
+                self._conn.execute("INSERT INTO poi_rtree VALUES (?, ?, ?, ?, ?)",
+                                   (poi_id, record["lat"], record["lat"], record["lon"], record["lon"]))
+                expanded = {parent for category in record["categories"] for parent in with_parents(category)}
+                self._conn.executemany("INSERT OR IGNORE INTO poi_category VALUES (?, ?)",
+                                       [(poi_id, category) for category in expanded])
+        return len(records)
+
+    def import_file(self, path: str, region: str | None = None) -> int:
+        """
+        Import an OSM XML (.osm / .xml) or GeoJSON (.geojson / .json) extract.
+
+        The bounding box of the imported POIs is recorded as a region, which covers() uses
+        to decide whether the index can answer a search.
+
+        Args:
+            path (str): Extract file.
+            region (str, optional): Region name (default: the file name).
+
+        Returns:
+            int: POIs imported.
+
+        Raises:
+            ValueError: For other file types (e.g. .pbf, which needs converting first).
+        """
+        lower = path.lower()
+        if lower.endswith((".osm", ".xml")):
+            records = self._iter_osm_xml(path)
+        elif lower.endswith((".geojson", ".json")):
+            records = iter_geojson(path)
+        else:
+            raise ValueError(f"Unsupported extract format: {path} (use .osm or .geojson)")
+
+        bounds = [math.inf, -math.inf, math.inf, -math.inf]  # min_lat, max_lat, min_lon, max_lon
+
+        def tracked(records: Iterator[dict]) -> Iterator[dict]:
+            for record in records:
+                bounds[:] = [min(bounds[0], record["lat"]), max(bounds[1], record["lat"]),
+                             min(bounds[2], record["lon"]), max(bounds[3], record["lon"])]
+                yield record
+
+        try:
+            count = self.insert(tracked(records))
+        finally:
+            with self._lock, self._conn:
+                self._conn.execute("DROP TABLE IF EXISTS temp.osm_node")
+
+        if count:
+            with self._lock, self._conn:
+                self._conn.execute("INSERT OR REPLACE INTO region VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                                   (region or os.path.basename(path), *bounds, path, count, time.time()))
+        logging.info(f"Imported {count} POIs from {path} into {self.path}")
+        return count
+
+    def _iter_osm_xml(self, path: str) -> Iterator[dict]:
+        """
+        Stream an OSM XML extract: tagged nodes become POIs, tagged ways become POIs at the
+        mean of their nodes. Node positions are kept in a temporary table, not in memory.
+        Relations (multipolygons) are skipped.
+        """
+        with self._lock, self._conn:
+            self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS osm_node (id INTEGER PRIMARY KEY, lat REAL, lon REAL)")
+            self._conn.execute("DELETE FROM osm_node")
+
+        nodes = []
+        for _, element in ET.iterparse(path, events=("end",)):
+            if element.tag == "node":
+                node_id, lat, lon = int(element.get("id")), float(element.get("lat")), float(element.get("lon"))
+                nodes.append((node_id, lat, lon))
+                tags = {tag.get("k"): tag.get("v") for tag in element.iter("tag")}
+                element.clear()
+                record = record_from_tags(f"osm:node/{node_id}", lat, lon, tags) if tags else None
+                if record:
+                    yield record
+                if len(nodes) >= 50000:
+                    self._store_nodes(nodes)
+                    nodes = []
+            elif element.tag == "way":
+                if nodes:
+                    self._store_nodes(nodes)  # Ways come after all nodes in an OSM file
+                    nodes = []
+                way_id = element.get("id")
+                tags = {tag.get("k"): tag.get("v") for tag in element.iter("tag")}
+                refs = [int(nd.get("ref")) for nd in element.iter("nd")]
+                element.clear()
+                if not refs or not categories_from_tags(tags):
+                    continue
+                center = self._mean_position(refs)
+                record = record_from_tags(f"osm:way/{way_id}", *center, tags) if center else None
+                if record:
+                    yield record
+            elif element.tag == "relation":
+                element.clear()
+
+    def _store_nodes(self, nodes: List[tuple]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO osm_node VALUES (?, ?, ?)", nodes)
+
+    def _mean_position(self, refs: List[int]) -> Tuple[float, float] | None:
+        with self._lock:
+            placeholders = ",".join("?" * len(refs))
+            row = self._conn.execute(f"SELECT avg(lat), avg(lon) FROM osm_node WHERE id IN ({placeholders})",
+                                     refs).fetchone()
+        return (row[0], row[1]) if row and row[0] is not None else None
+
+    def covers(self, center: Tuple[float, float], radius: float) -> bool:
+        """
+        Whether an imported region contains the whole search circle.
+
+        Args:
+            center (tuple): (latitude, longitude).
+            radius (float): Radius in meters.
+
+        Returns:
+            bool: True if some region's bounding box contains the circle's.
+        """
+        min_lat, max_lat, min_lon, max_lon = self.bounding_box(center, radius)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM region WHERE min_lat <= ? AND max_lat >= ? AND min_lon <= ? AND max_lon >= ? LIMIT 1",
+                (min_lat, max_lat, min_lon, max_lon)
+            ).fetchone()
+        return row is not None
+
+    @staticmethod
+    def bounding_box(center: Tuple[float, float], radius: float) -> Tuple[float, float, float, float]:
+        """(min_lat, max_lat, min_lon, max_lon) of the circle around center."""
+        lat, lon = center
+        dlat = math.degrees(radius / EARTH_RADIUS_M)
+        dlon = dlat / max(math.cos(math.radians(lat)), 1e-6)
+        return lat - dlat, lat + dlat, lon - dlon, lon + dlon
+
+    def search(self, category: str, center: Tuple[float, float], radius: float,
+               limit: int | None = None) -> List[dict]:
+        """
+        POIs of a category within radius meters of center, nearest first.
+
+        Args:
+            category (str): Category, or several separated by commas (as Geoapify accepts).
+            center (tuple): (latitude, longitude).
+            radius (float): Radius in meters.
+            limit (int, optional): Maximum results.
+
+        Returns:
+            list: Geoapify-style features with a "distance" property.
+        """
+        with get_metrics().timer("poi_index.search"):
+            rows = self._query_box(category, self.bounding_box(center, radius))
+            return self._features_within(rows, center, radius, limit)
+
+    def nearest(self, category: str, center: Tuple[float, float], k: int = 10,
+                max_radius: float = 50000) -> List[dict]:
+        """
+        The k nearest POIs of a category, searching outwards up to max_radius meters.
+
+        Args:
+            category (str): Category, or several separated by commas.
+            center (tuple): (latitude, longitude).
+            k (int): Number of POIs wanted.
+            max_radius (float): Give up widening the search beyond this distance.
+
+        Returns:
+            list: Up to k Geoapify-style features, nearest first.
+        """
+        with get_metrics().timer("poi_index.nearest"):
+            radius = 500.0
+            while True:
+                radius = min(radius, max_radius)
+                rows = self._query_box(category, self.bounding_box(center, radius))
+                features = self._features_within(rows, center, radius, k)
+                # Everything inside the circle is known, so k hits there are the true k nearest
+                if len(features) >= k or radius >= max_radius:
+                    return features
+                radius *= 4
+
+    def _query_box(self, category: str, box: Tuple[float, float, float, float]) -> List[tuple]:
+        categories = [c.strip() for c in category.split(",") if c.strip()]
+        if not categories:
+            return []
+        min_lat, max_lat, min_lon, max_lon = box
+        placeholders = ",".join("?" * len(categories))
+        with self._lock:
+            return self._conn.execute(
+                "SELECT p.source_id, p.name, p.address, p.lat, p.lon, p.phone, p.email, p.website, p.categories "
+                "FROM poi_rtree r JOIN poi p ON p.id = r.id "
+                "WHERE r.max_lat >= ? AND r.min_lat <= ? AND r.max_lon >= ? AND r.min_lon <= ? "
+                f"AND EXISTS (SELECT 1 FROM poi_category c WHERE c.poi_id = r.id AND c.category IN ({placeholders}))",
+                (min_lat, max_lat, min_lon, max_lon, *categories)
+            ).fetchall()
+
+    @staticmethod
+    def _features_within(rows: List[tuple], center: Tuple[float, float], radius: float,
+                         limit: int | None) -> List[dict]:
+        """Measure rows exactly (one NumPy pass), keep those inside the circle, nearest first."""
+        if not rows:
+            return []
+        distances = distances_from(center, [row[3] for row in rows], [row[4] for row in rows])
+        inside = sorted((float(d), row) for d, row in zip(distances, rows) if d <= radius)
+        return [POIIndex.to_feature(row, distance) for distance, row in inside[:limit]]
+
+    @staticmethod
+    def to_feature(row: tuple, distance: float) -> dict:
+        """A stored POI as a Geoapify Places feature (what Business.from_geoapify reads)."""
+        source_id, name, address, lat, lon, phone, email, website, categories = row
+        contact = {key: value for key, value in (("phone", phone), ("email", email), ("website", website)) if value}
+        return {
+            "type": "Feature",
+            "properties": {
+                "name": name or "Unnamed Business",
+                "formatted": address or "No address",
+                "lat": lat,
+                "lon": lon,
+                "distance": round(distance),
+                "categories": json.loads(categories),
+                "contact": contact,
+                "place_id": f"local:{source_id}",
+            },
+            "geometry": {"type": "Point", "coordinates": [lon, lat]},
+        }
+
+    def stats(self) -> dict:
+        """Number of POIs and the imported regions."""
+        with self._lock:
+            count = self._conn.execute("SELECT count(*) FROM poi").fetchone()[0]
+            regions = [dict(zip(("name", "min_lat", "max_lat", "min_lon", "max_lon", "pois"), row))
+                       for row in self._conn.execute("SELECT name, min_lat, max_lat, min_lon, max_lon, pois FROM region")]
+        return {"pois": count, "regions": regions}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+# Shared index for the whole process, opened on first use
+_poi_index = None
+_poi_index_lock = threading.Lock()
+
+
+def get_poi_index() -> POIIndex:
+    """
+    Return the process-wide POI index, opening it at the Config path (POI_INDEX) on first use.
+
+    Returns:
+        POIIndex: Shared index (empty until an extract is imported).
+    """
+    global _poi_index
+    if _poi_index is None:
+        with _poi_index_lock:
+            if _poi_index is None:
+                _poi_index = POIIndex(get_config().poi_index_path)
+    return _poi_index
@@ -0,0 +1,191 @@
+# core/query_planner.py
+import math
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import List, NamedTuple, Tuple
+
+from haversine import haversine
+
+from config.utils import log_error
+from core.business import Business
+from core.business_finder import BusinessFinder
+
+METERS_PER_DEGREE_LAT = 111_320  # Roughly constant everywhere on Earth
+
+
+class Tile(NamedTuple):
+    """A rectangular search area in degrees, plus how many times it has been split."""
+    south: float
+    west: float
+    north: float
+    east: float
+    depth: int = 0
+
+    def area_filter(self) -> str:
+        """Geoapify 'rect' filter for this tile (lon1,lat1,lon2,lat2)."""
+        return f"rect:{self.west},{self.south},{self.east},{self.north}"
+
+    def split(self) -> List["Tile"]:
+        """Split the tile into four equal quadrants one level deeper."""
+        mid_lat = (self.south + self.north) / 2
+        mid_lon = (self.west + self.east) / 2
+        depth = self.depth + 1
+        return [
+            Tile(self.south, self.west, mid_lat, mid_lon, depth),
+            Tile(self.south, mid_lon, mid_lat, self.east, depth),
+            Tile(mid_lat, self.west, self.north, mid_lon, depth),
+            Tile(mid_lat, mid_lon, self.north, self.east, depth),
+        ]
+
+
+class TiledSearchPlanner:
+    """
+    Harvests every business of a category over a large area by splitting it into tiles.
+
+    A single Geoapify request returns at most `page_limit` places, so a big circle around a
+    city centre gets truncated. The planner covers the area with a grid of tiles, fetches them
+    in parallel and splits any tile that comes back full ("saturated") into four smaller ones.
+    """
+
+    def __init__(self, finder: BusinessFinder, tile_size_m: float = 2000, page_limit: int = 100,
+                 max_workers: int = 6, max_depth: int = 4) -> None:
+        """
+        Initialize the planner.
+
+        Args:
+            finder (BusinessFinder): Finder used to fetch each tile.
+            tile_size_m (float): Side length in meters of the initial grid tiles.
+            page_limit (int): Results requested per tile; a tile returning this many is treated as saturated.
+            max_workers (int): Maximum tile requests in flight at once.
+            max_depth (int): How many times a saturated tile may be split.
+        """
+        self.finder = finder
+        self.tile_size_m = tile_size_m
+        self.page_limit = page_limit
+        self.max_workers = max_workers
+        self.max_depth = max_depth
+
+        # Filled in by each harvest so callers can see what it cost
+        self.last_stats = {}
+
+    def plan_bbox(self, south: float, west: float, north: float, east: float) -> List[Tile]:
+        """
+        Cover a bounding box with a grid of roughly tile_size_m square tiles.
+
+        Args:
+            south, west, north, east (float): Bounding box in degrees.
+
+        Returns:
+            list: Tiles covering the box.
+        """
+        mid_lat = (south + north) / 2
+        lat_step = self.tile_size_m / METERS_PER_DEGREE_LAT
+        lon_step = self.tile_size_m / (METERS_PER_DEGREE_LAT * max(math.cos(math.radians(mid_lat)), 0.01))
+
+        rows = max(1, math.ceil((north - south) / lat_step))
+        cols = max(1, math.ceil((east - west) / lon_step))
+        lat_step = (north - south) / rows
+        lon_step = (east - west) / cols
+
+        return [
+            Tile(south + r * lat_step, west + c * lon_step, south + (r + 1) * lat_step, west + (c + 1) * lon_step)
+            for r in range(rows)
+            for c in range(cols)
+        ]
+
+    def plan_circle(self, center: Tuple[float, float], radius_m: float) -> List[Tile]:
+        """
+        Cover a circle with grid tiles, dropping tiles that lie completely outside it.
+
+        Args:
+            center (tuple): (latitude, longitude) of the circle centre.
+            radius_m (float): Circle radius in meters.
+
+        Returns:
+            list: Tiles intersecting the circle.
+        """
+        lat, lon = center
+        dlat = radius_m / METERS_PER_DEGREE_LAT
+        dlon = radius_m / (METERS_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 0.01))
+        tiles = self.plan_bbox(lat - dlat, lon - dlon, lat + dlat, lon + dlon)
+        return [tile for tile in tiles if self._tile_intersects_circle(tile, center, radius_m)]
+
+    def harvest_circle(self, center: Tuple[float, float], business_type: str, radius_m: float) -> List[Business]:
+        """
+        Fetch all businesses of a category inside a circle, however dense the area is.
+
+        Args:
+            center (tuple): (latitude, longitude) of the circle centre (also used for distances).
+            business_type (str): Geoapify category.
+            radius_m (float): Circle radius in meters.
+
+        Returns:
+            list: Deduplicated Business objects inside the circle, nearest first.
+        """
+        businesses = self._harvest(self.plan_circle(center, radius_m), business_type, center)
+
+        # Tiles overlap the circle's edge, so drop anything outside it (one vectorized pass)
+        businesses = BusinessFinder.rerank_by_distance(businesses, center)
+        return [b for b in businesses if b.distance_m <= radius_m]
+
+    def harvest_bbox(self, bbox: Tuple[float, float, float, float], business_type: str,
+                     user_coords: Tuple[float, float] | None = None) -> List[Business]:
+        """
+        Fetch all businesses of a category inside a bounding box.
+
+        Args:
+            bbox (tuple): (south, west, north, east) in degrees.
+            business_type (str): Geoapify category.
+            user_coords (tuple, optional): (lat, lon) used to compute distances.
+
+        Returns:
+            list: Deduplicated Business objects.
+        """
+        return self._harvest(self.plan_bbox(*bbox), business_type, user_coords)
+
+    def _harvest(self, tiles: List[Tile], business_type: str,
+                 user_coords: Tuple[float, float] | None) -> List[Business]:
+        """Fetch tiles in parallel, splitting saturated ones, and merge the results by place identity."""
+        found = {}
+        stats = {"tiles_planned": len(tiles), "requests": 0, "splits": 0, "saturated_leaves": 0, "failed": 0}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tile-harvest") as executor:
+            pending = {executor.submit(self._fetch_tile, tile, business_type): tile for tile in tiles}
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    tile = pending.pop(future)
+                    stats["requests"] += 1
+                    try:
+                        features = future.result()
+                    except Exception as e:
+                        stats["failed"] += 1
+                        log_error(e, f"Failed to fetch tile {tile.area_filter()}")
+                        continue
+
+                    for business in self.finder.parse_results({"features": features}, user_coords):
+                        found.setdefault(business.place_key(), business)
+
+                    if len(features) >= self.page_limit:
+                        if tile.depth < self.max_depth:
+                            # Saturated: this tile may hold more places than one request returns
+                            stats["splits"] += 1
+                            for child in tile.split():
+                                pending[executor.submit(self._fetch_tile, child, business_type)] = child
+                        else:
+                            stats["saturated_leaves"] += 1
+
+        stats["businesses"] = len(found)
+        self.last_stats = stats
+        return list(found.values())
+
+    def _fetch_tile(self, tile: Tile, business_type: str) -> list:
+        """Fetch the raw features for one tile."""
+        return self.finder.fetch_places_page(business_type, tile.area_filter(), limit=self.page_limit)
+
+    @staticmethod
+    def _tile_intersects_circle(tile: Tile, center: Tuple[float, float], radius_m: float) -> bool:
+        """True if the point of the tile nearest to the centre lies within the circle."""
+        nearest_lat = min(max(center[0], tile.south), tile.north)
+        nearest_lon = min(max(center[1], tile.west), tile.east)
+        return haversine(center, (nearest_lat, nearest_lon)) * 1000 <= radius_m
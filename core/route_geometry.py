@@ -0,0 +1,158 @@
+# core/route_geometry.py
+import math
+from typing import List, NamedTuple, Tuple
+
+import numpy as np
+
+from core.geo import EARTH_RADIUS_M
+
+
+class RouteGeometry(NamedTuple):
+    """A route polyline as flat coordinate arrays."""
+    lats: np.ndarray
+    lons: np.ndarray
+    leg_offsets: List[int]  # Index of the first point of each leg (one leg for a LineString)
+
+
+class SimplifiedPath(NamedTuple):
+    """A polyline ready for folium, with how much simplification removed."""
+    path: List[List[float]]  # [[lat, lon], ...]
+    original_points: int
+    kept_points: int
+    tolerance_m: float
+
+    @property
+    def reduction(self) -> float:
+        """Fraction of points removed (0-1)."""
+        return 1 - self.kept_points / self.original_points if self.original_points else 0.0
+
+
+def decode_geometry(geometry: dict) -> RouteGeometry:
+    """
+    Decode a GeoJSON LineString or MultiLineString into (lats, lons) arrays in one pass.
+
+    Args:
+        geometry (dict): GeoJSON geometry from a Geoapify route feature ([lon, lat] order).
+
+    Returns:
+        RouteGeometry: Latitudes, longitudes and the start index of each leg.
+    """
+    geometry = geometry or {}
+    coordinates = geometry.get("coordinates") or []
+    legs = [coordinates] if geometry.get("type") == "LineString" else coordinates
+
+    leg_offsets, arrays, total = [], [], 0
+    for leg in legs:
+        leg_offsets.append(total)
+        if not leg:
+            continue
+        array = np.asarray(leg, dtype=np.float64)[:, :2]
+        arrays.append(array)
+        total += len(array)
+
+    points = np.concatenate(arrays) if arrays else np.empty((0, 2))
+    return RouteGeometry(points[:, 1], points[:, 0], leg_offsets)
+
+
+def project_local(lats, lons, origin: Tuple[float, float]) -> np.ndarray:
+    """
+    Project degrees to (x, y) meters on a plane around origin (equirectangular).
+
+    Accurate to well under a meter over the few kilometers a city route covers.
+
+    Args:
+        lats (array-like): Latitudes in degrees.
+        lons (array-like): Longitudes in degrees.
+        origin (tuple): (latitude, longitude) mapped to (0, 0).
+
+    Returns:
+        np.ndarray: Array of shape (N, 2).
+    """
+    lat0, lon0 = math.radians(origin[0]), math.radians(origin[1])
+    x = (np.radians(np.asarray(lons, dtype=np.float64)) - lon0) * math.cos(lat0) * EARTH_RADIUS_M
+    y = (np.radians(np.asarray(lats, dtype=np.float64)) - lat0) * EARTH_RADIUS_M
+    return np.column_stack((x, y))
+
+
+def douglas_peucker(points: np.ndarray, tolerance: float) -> np.ndarray:
+    """
+    Douglas-Peucker simplification (iterative, so long routes cannot hit the recursion limit).
+
+    Args:
+        points (np.ndarray): (N, 2) projected points in meters.
+        tolerance (float): Maximum distance a removed point may be from the simplified line.
+
+    Returns:
+        np.ndarray: Boolean mask of the points to keep (always keeps both ends).
+    """
+    count = len(points)
+    keep = np.zeros(count, dtype=bool)
+    if count <= 2 or tolerance <= 0:
+        keep[:] = True
+        return keep
+
+    keep[0] = keep[-1] = True
+    stack = [(0, count - 1)]
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+
+        start, end = points[first], points[last]
+        inner = points[first + 1:last]
+        direction = end - start
+        length = math.hypot(direction[0], direction[1])
+        if length == 0:
+            distances = np.hypot(inner[:, 0] - start[0], inner[:, 1] - start[1])
+        else:
+            # Perpendicular distance of every inner point to the chord, in one pass
+            distances = np.abs(direction[0] * (inner[:, 1] - start[1]) - direction[1] * (inner[:, 0] - start[0])) / length
+
+        index = int(np.argmax(distances))
+        if distances[index] > tolerance:
+            split = first + 1 + index
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+    return keep
+
+
+def tolerance_for_zoom(zoom: int, latitude: float, pixels: float = 1.0) -> float:
+    """
+    Simplification tolerance in meters matching `pixels` screen pixels at a web-map zoom level.
+
+    Args:
+        zoom (int): Web-map zoom level (e.g. folium zoom_start).
+        latitude (float): Latitude the map is centered on.
+        pixels (float): Allowed error in screen pixels.
+
+    Returns:
+        float: Tolerance in meters.
+    """
+    meters_per_pixel = 156543.03392 * math.cos(math.radians(latitude)) / (2 ** zoom)
+    return pixels * meters_per_pixel
+
+
+def simplify_route(geometry: dict, zoom: int = 13, pixels: float = 1.0) -> SimplifiedPath:
+    """
+    Decode a route geometry and drop the points that would not be visible at this zoom.
+
+    Args:
+        geometry (dict): GeoJSON geometry from a Geoapify route feature.
+        zoom (int): Zoom level the route will be shown at.
+        pixels (float): Allowed error in screen pixels.
+
+    Returns:
+        SimplifiedPath: [[lat, lon], ...] for folium.PolyLine, with before/after point counts.
+    """
+    route = decode_geometry(geometry)
+    count = len(route.lats)
+    if count == 0:
+        return SimplifiedPath([], 0, 0, 0.0)
+
+    origin = (float(route.lats[0]), float(route.lons[0]))
+    tolerance = tolerance_for_zoom(zoom, origin[0], pixels)
+    keep = douglas_peucker(project_local(route.lats, route.lons, origin), tolerance)
+
+    path = np.column_stack((route.lats[keep], route.lons[keep])).tolist()
+    return SimplifiedPath(path, count, len(path), tolerance)
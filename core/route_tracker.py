@@ -0,0 +1,125 @@
+# core/route_tracker.py
+import math
+from typing import List, NamedTuple, Tuple
+
+import numpy as np
+
+from core.route_geometry import decode_geometry, project_local
+
+
+class TrackingState(NamedTuple):
+    """Where the user is along the route after one position update."""
+    snapped: Tuple[float, float]  # Closest point on the route (latitude, longitude)
+    off_route_m: float  # Distance from the user to that point
+    off_route: bool  # True when off_route_m is above the tracker's threshold
+    travelled_m: float  # Distance along the route up to the snapped point
+    remaining_m: float  # Distance left to the destination
+    step_index: int  # Index of the current step in `steps`
+    instruction: str  # Instruction text of the current step
+    arrived: bool  # True within arrival_m of the destination
+
+
+class RouteTracker:
+    """
+    Follows the user along a fetched route without any network calls.
+
+    The route polyline is projected once into local meters and stored as segment arrays
+    (start points, direction vectors, squared lengths and cumulative distances), so snapping
+    a position is one vectorized point-to-segment pass. Updates first search a window just
+    ahead of the last snapped segment and fall back to the whole route only when needed.
+    Re-routing is left to the caller: it should fetch a new route when `off_route` is True.
+    """
+
+    def __init__(self, feature: dict, off_route_threshold_m: float = 40.0, arrival_m: float = 20.0,
+                 window: int = 60) -> None:
+        """
+        Args:
+            feature (dict): Geoapify route feature (geometry + properties with legs/steps).
+            off_route_threshold_m (float): Distance from the route that counts as off route.
+            arrival_m (float): Remaining distance that counts as arrived.
+            window (int): Segments searched ahead of the last position before a full scan.
+        """
+        self.off_route_threshold_m = off_route_threshold_m
+        self.arrival_m = arrival_m
+        self.window = window
+
+        lats, lons, leg_offsets = decode_geometry(feature.get("geometry"))
+        if len(lats) < 2:
+            raise ValueError("Route geometry needs at least two points")
+        self.lats, self.lons = lats, lons
+
+        # Local meters around the route start
+        self._origin = (float(lats[0]), float(lons[0]))
+        points = project_local(lats, lons, self._origin)
+
+        self._starts = points[:-1]
+        self._vectors = points[1:] - points[:-1]
+        self._lengths_sq = np.einsum("ij,ij->i", self._vectors, self._vectors)
+        lengths = np.sqrt(self._lengths_sq)
+        self._cumulative = np.concatenate(([0.0], np.cumsum(lengths)))  # Route distance at each vertex
+        self.length_m = float(self._cumulative[-1])
+
+        self.steps, self._step_starts = self._index_steps(feature.get("properties") or {}, leg_offsets)
+        self._segment = 0  # Last snapped segment
+
+    @staticmethod
+    def _index_steps(properties: dict, leg_offsets: List[int]) -> Tuple[List[dict], np.ndarray]:
+        """Steps of every leg, with the route vertex each one starts at."""
+        steps, starts = [], []
+        for leg, offset in zip(properties.get("legs") or [], leg_offsets):
+            for step in leg.get("steps") or []:
+                steps.append(step)
+                starts.append(offset + int(step.get("from_index", 0)))
+        if not steps:
+            steps, starts = [{"instruction": {"text": "Continue to the destination"}}], [0]
+        return steps, np.asarray(starts, dtype=np.int64)
+
+    def _snap(self, point: np.ndarray, first: int, last: int) -> Tuple[int, float, float]:
+        """Closest segment in [first, last): (segment index, position along it 0-1, distance in meters)."""
+        starts = self._starts[first:last]
+        vectors = self._vectors[first:last]
+        lengths_sq = self._lengths_sq[first:last]
+
+        offsets = point - starts
+        with np.errstate(invalid="ignore", divide="ignore"):
+            t = np.clip(np.einsum("ij,ij->i", offsets, vectors) / lengths_sq, 0.0, 1.0)
+        t = np.nan_to_num(t)  # Zero-length segments
+        gaps = offsets - vectors * t[:, np.newaxis]
+        distances = np.einsum("ij,ij->i", gaps, gaps)
+
+        best = int(np.argmin(distances))
+        return first + best, float(t[best]), math.sqrt(float(distances[best]))
+
+    def update(self, position: Tuple[float, float]) -> TrackingState:
+        """
+        Snap a new position onto the route and advance progress.
+
+        Args:
+            position (tuple): User's (latitude, longitude).
+
+        Returns:
+            TrackingState: Snapped point, distance off route, progress and current step.
+        """
+        point = project_local([position[0]], [position[1]], self._origin)[0]
+        segments = len(self._starts)
+
+        # Usually the user is just ahead of where they were last time
+        first = max(0, self._segment - 2)
+        segment, t, off_m = self._snap(point, first, min(segments, self._segment + self.window))
+        if off_m > self.off_route_threshold_m and (first > 0 or segments > self._segment + self.window):
+            segment, t, off_m = self._snap(point, 0, segments)
+
+        off_route = off_m > self.off_route_threshold_m
+        if not off_route:
+            self._segment = segment
+
+        travelled = float(self._cumulative[segment] + t * (self._cumulative[segment + 1] - self._cumulative[segment]))
+        remaining = max(0.0, self.length_m - travelled)
+        step_index = max(0, int(np.searchsorted(self._step_starts, segment, side="right")) - 1)
+
+        snapped_lat = self.lats[segment] + t * (self.lats[segment + 1] - self.lats[segment])
+        snapped_lon = self.lons[segment] + t * (self.lons[segment + 1] - self.lons[segment])
+        instruction = self.steps[step_index].get("instruction", {}).get("text", "Continue")
+
+        return TrackingState((float(snapped_lat), float(snapped_lon)), off_m, off_route, travelled, remaining,
+                             step_index, instruction, remaining <= self.arrival_m)
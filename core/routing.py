@@ -0,0 +1,137 @@
+# core/routing.py
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Tuple
+
+from config.cache import MISS, SQLiteTTLCache
+from config.config import get_config
+from config.metrics import get_metrics
+from config.utils import log_error, make_api_request
+
+ROUTING_ENDPOINT = get_config().get_endpoint("geoapify", "/v1/routing")
+
+# Shared route cache, created on first use (see get_route_cache)
+_route_cache = None
+_route_cache_lock = threading.Lock()
+
+
+def get_route_cache() -> SQLiteTTLCache:
+    """
+    Return the process-wide route cache, creating it from the Config settings on first use.
+
+    Returns:
+        SQLiteTTLCache: Cache of route key -> Geoapify route feature.
+    """
+    global _route_cache
+    if _route_cache is None:
+        with _route_cache_lock:
+            if _route_cache is None:
+                _route_cache = SQLiteTTLCache(**get_config().get_cache_settings("routes"))
+    return _route_cache
+
+
+def snap(coords: Tuple[float, float], precision: int = 4) -> str:
+    """
+    Round coordinates so that nearby positions share a cache key (4 decimals is about 11 m).
+
+    Args:
+        coords (tuple): (latitude, longitude).
+        precision (int): Decimal places to keep.
+
+    Returns:
+        str: "lat,lon" with the given precision.
+    """
+    return f"{coords[0]:.{precision}f},{coords[1]:.{precision}f}"
+
+
+def route_key(start: Tuple[float, float], end: Tuple[float, float], mode: str) -> str:
+    """Cache key for a route: travel mode plus snapped origin and destination."""
+    return f"{mode}:{snap(start)}|{snap(end)}"
+
+
+def route_params(start: Tuple[float, float], end: Tuple[float, float], mode: str, api_key: str) -> dict:
+    """Query parameters for a Geoapify routing request (shared by the sync and async clients)."""
+    return {
+        "waypoints": f"{start[0]},{start[1]}|{end[0]},{end[1]}",
+        "mode": mode,
+        "apiKey": api_key
+    }
+
+
+def fetch_route(start: Tuple[float, float], end: Tuple[float, float], mode: str, api_key: str) -> dict | None:
+    """
+    Get the route between two points, from the route cache when possible.
+
+    Args:
+        start (tuple): Origin (latitude, longitude).
+        end (tuple): Destination (latitude, longitude).
+        mode (str): Travel mode ('walk', 'drive', 'bike').
+        api_key (str): Geoapify API key.
+
+    Returns:
+        dict or None: The Geoapify route feature (geometry + properties with legs/steps),
+        or None if Geoapify found no route (that answer is cached briefly too).
+
+    Raises:
+        requests.exceptions.RequestException: On network or HTTP errors (never cached).
+    """
+    def load():
+        response = make_api_request(ROUTING_ENDPOINT, route_params(start, end, mode, api_key))
+        response.raise_for_status()
+        features = response.json().get("features") or []
+        return features[0] if features else None
+
+    return get_route_cache().get_or_load(route_key(start, end, mode), load)
+
+
+class RoutePrefetcher:
+    """
+    Computes routes for the nearest results in the background, so "Get Directions" is instant.
+
+    Routes land in the shared route cache; nothing is returned to the caller directly.
+    """
+
+    def __init__(self, api_key: str, max_workers: int = 4) -> None:
+        """
+        Args:
+            api_key (str): Geoapify API key.
+            max_workers (int): Routes computed at the same time.
+        """
+        self.api_key = api_key
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="route-prefetch")
+
+    def prefetch(self, start: Tuple[float, float], businesses: List, nearest: int = 5,
+                 modes: Tuple[str, ...] = ("walk", "drive")) -> List[Future]:
+        """
+        Queue route computations from start to the nearest businesses for each travel mode.
+
+        Args:
+            start (tuple): User's (latitude, longitude).
+            businesses (list): Business objects, nearest first.
+            nearest (int): How many of the first businesses to prefetch.
+            modes (tuple): Travel modes to prefetch.
+
+        Returns:
+            list: Futures for the queued computations (routes already cached are skipped).
+        """
+        cache = get_route_cache()
+        prefetch_one = get_metrics().bind_trace(self._prefetch_one)
+        futures = []
+        for business in businesses[:nearest]:
+            end = (business.latitude, business.longitude)
+            for mode in modes:
+                if cache.get(route_key(start, end, mode)) is not MISS:
+                    continue # Already cached (or known to have no route)
+                futures.append(self._executor.submit(prefetch_one, start, end, mode))
+        return futures
+
+    def _prefetch_one(self, start: Tuple[float, float], end: Tuple[float, float], mode: str) -> None:
+        """Fetch one route into the cache, logging (not raising) failures."""
+        try:
+            fetch_route(start, end, mode, self.api_key)
+        except Exception as e:
+            log_error(e, f"Route prefetch failed ({mode} {snap(start)} -> {snap(end)})")
+
+    def shutdown(self) -> None:
+        """Stop the worker pool (queued prefetches are cancelled)."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,146 @@
+# core/travel_matrix.py
+import threading
+from typing import List, Sequence, Tuple
+
+from config.cache import MISS, SQLiteTTLCache
+from config.config import get_config
+from config.utils import make_api_post_request
+from core.geo import coords_to_arrays, distances_from
+from core.routing import route_key
+
+MATRIX_ENDPOINT = get_config().get_endpoint("geoapify", "/v1/routematrix")
+
+# Shared matrix cache, created on first use (see get_matrix_cache)
+_matrix_cache = None
+_matrix_cache_lock = threading.Lock()
+
+
+def get_matrix_cache() -> SQLiteTTLCache:
+    """
+    Return the process-wide travel-time cache, creating it from the Config settings on first use.
+
+    Returns:
+        SQLiteTTLCache: Cache of (mode, origin, target) -> {"time_s": ..., "distance_m": ...}.
+    """
+    global _matrix_cache
+    if _matrix_cache is None:
+        with _matrix_cache_lock:
+            if _matrix_cache is None:
+                _matrix_cache = SQLiteTTLCache(**get_config().get_cache_settings("matrix"))
+    return _matrix_cache
+
+
+class TravelTimeMatrix:
+    """
+    Travel time and road distance from one origin to many targets, in one batched request.
+
+    Backed by the Geoapify Route Matrix API. Each (mode, origin, target) cell is cached on
+    its own, so a later search only asks the API for the targets it has not seen yet.
+    """
+
+    max_targets = 500 # Targets per request (Geoapify limits sources x targets per call)
+
+    def __init__(self, api_key: str | None = None, cache: SQLiteTTLCache | None = None,
+                 use_cache: bool = True) -> None:
+        """
+        Args:
+            api_key (str): Geoapify API key.
+            cache (SQLiteTTLCache, optional): Cell cache; defaults to the shared matrix cache.
+            use_cache (bool): Set to False to always recompute.
+        """
+        self.api_key = api_key
+        self.cache = (cache if cache is not None else get_matrix_cache()) if use_cache else None
+        self.requests_made = 0
+
+    def travel_times(self, origin: Tuple[float, float], targets: Sequence[Tuple[float, float]],
+                     mode: str = "drive") -> List[dict | None]:
+        """
+        Travel time and distance from origin to every target.
+
+        Args:
+            origin (tuple): (latitude, longitude) of the user.
+            targets (sequence): (latitude, longitude) of each destination.
+            mode (str): Travel mode ('walk', 'drive', 'bike').
+
+        Returns:
+            list: One {"time_s": float, "distance_m": float} per target, in input order,
+            or None where the target cannot be reached.
+
+        Raises:
+            requests.exceptions.RequestException: If the matrix request fails (nothing is cached).
+        """
+        results = [None] * len(targets)
+        missing = []
+        for i, target in enumerate(targets):
+            cached = self.cache.get(route_key(origin, target, mode)) if self.cache is not None else MISS
+            if cached is MISS:
+                missing.append(i)
+            else:
+                results[i] = cached
+
+        for start in range(0, len(missing), self.max_targets):
+            chunk = missing[start:start + self.max_targets]
+            cells = self._fetch(origin, [targets[i] for i in chunk], mode)
+            for i, cell in zip(chunk, cells):
+                results[i] = cell
+                if self.cache is not None:
+                    self.cache.set(route_key(origin, targets[i], mode), cell, negative=cell is None)
+        return results
+
+    def _fetch(self, origin: Tuple[float, float], targets: List[Tuple[float, float]], mode: str) -> List[dict | None]:
+        """Ask Geoapify for one row of the matrix (one origin, many targets)."""
+        payload = {
+            "mode": mode,
+            "sources": [{"location": [origin[1], origin[0]]}], # Geoapify wants [lon, lat]
+            "targets": [{"location": [lon, lat]} for lat, lon in targets],
+        }
+        response = make_api_post_request(MATRIX_ENDPOINT, {"apiKey": self.api_key}, payload)
+        response.raise_for_status()
+        self.requests_made += 1
+
+        row = (response.json().get("sources_to_targets") or [[]])[0]
+        cells = [None] * len(targets)
+        for entry in row:
+            if not entry or entry.get("time") is None:
+                continue # Unreachable target
+            cells[entry.get("target_index", 0)] = {"time_s": float(entry["time"]),
+                                                   "distance_m": float(entry.get("distance") or 0.0)}
+        return cells
+
+
+class LocalTravelTimeMatrix(TravelTimeMatrix):
+    """
+    Offline stand-in for the Route Matrix API, for tests and for running without an API key.
+
+    Estimates road distance as straight-line distance times a detour factor, and time from a
+    typical city speed for the travel mode. Uncached by default since it costs no requests.
+    """
+
+    detour_factor = 1.3 # Roads are rarely straight
+    speeds_mps = {"walk": 1.4, "bike": 4.2, "drive": 8.3} # ~5, ~15 and ~30 km/h
+
+    def __init__(self, cache: SQLiteTTLCache | None = None, use_cache: bool = False) -> None:
+        super().__init__(None, cache, use_cache)
+
+    def _fetch(self, origin: Tuple[float, float], targets: List[Tuple[float, float]], mode: str) -> List[dict | None]:
+        """Estimate one row of the matrix from great-circle distances."""
+        self.requests_made += 1
+        speed = self.speeds_mps.get(mode, self.speeds_mps["drive"])
+        lats, lons = coords_to_arrays(targets)
+        distances = distances_from(origin, lats, lons) * self.detour_factor
+        return [{"time_s": float(d / speed), "distance_m": float(d)} for d in distances]
+
+
+def create_travel_matrix(api_key: str | None) -> TravelTimeMatrix:
+    """
+    Build the travel-time matrix selected in Config (TRAVEL_MATRIX=geoapify or local).
+
+    Args:
+        api_key (str): Geoapify API key (unused by the local matrix).
+
+    Returns:
+        TravelTimeMatrix: Geoapify-backed matrix, or the local stand-in.
+    """
+    if get_config().travel_matrix_provider == "local" or not api_key:
+        return LocalTravelTimeMatrix()
+    return TravelTimeMatrix(api_key)
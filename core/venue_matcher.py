@@ -0,0 +1,152 @@
+# core/venue_matcher.py
+import difflib
+import math
+import re
+import unicodedata
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from core.route_geometry import project_local
+
+# Words that say nothing about which place it is ("Shoprite Ltd" is "Shoprite")
+GENERIC_NAME_TOKENS = frozenset({
+    "the", "and", "ltd", "limited", "plc", "co", "company", "nig", "nigeria", "enterprise", "enterprises",
+    "ventures", "intl", "international", "global", "services", "store", "shop",
+})
+
+
+def normalize_name(name: str) -> str:
+    """
+    Reduce a business name to comparable words: ASCII, lower-case, no punctuation, no generic words.
+
+    Args:
+        name (str): Name as either provider spells it.
+
+    Returns:
+        str: e.g. "Mega Plaza Ltd." -> "mega plaza".
+    """
+    text = unicodedata.normalize("NFKD", name or "").encode("ascii", "ignore").decode().casefold()
+    text = re.sub(r"[^a-z0-9\s]", " ", text.replace("&", " and "))
+    return " ".join(token for token in text.split() if token not in GENERIC_NAME_TOKENS)
+
+
+def _trigrams(text: str) -> set:
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)} if len(padded) > 3 else {padded}
+
+
+def name_similarity(a: str, b: str) -> float:
+    """
+    Similarity (0-1) of two normalized names.
+
+    Trigram overlap rejects unrelated names cheaply. Close ones are re-scored with the difflib
+    ratio and with word containment, so "shoprite" matches "shoprite jabi lake".
+
+    Args:
+        a (str): Normalized name.
+        b (str): Normalized name.
+
+    Returns:
+        float: 1.0 for identical names, 0.0 for nothing in common.
+    """
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    grams_a, grams_b = _trigrams(a), _trigrams(b)
+    dice = 2 * len(grams_a & grams_b) / (len(grams_a) + len(grams_b))
+    if dice < 0.2:
+        return dice
+
+    tokens_a, tokens_b = set(a.split()), set(b.split())
+    containment = len(tokens_a & tokens_b) / min(len(tokens_a), len(tokens_b))
+    return max(dice, difflib.SequenceMatcher(None, a, b, autojunk=False).ratio(), 0.9 * containment)
+
+
+def venue_position(venue: dict) -> Tuple[float, float] | None:
+    """(lat, lon) of a Foursquare venue, or None if it has no main geocode."""
+    main = (venue.get("geocodes") or {}).get("main") or {}
+    if main.get("latitude") is None or main.get("longitude") is None:
+        return None
+    return main["latitude"], main["longitude"]
+
+
+class VenueGrid:
+    """
+    Spatial blocking index: venues bucketed into square cells of cell_m meters.
+
+    A point's candidates are the venues in its own cell and the eight around it, which
+    includes every venue within cell_m of the point.
+    """
+
+    def __init__(self, points, cell_m: float) -> None:
+        """
+        Args:
+            points (np.ndarray): (N, 2) venue positions in local meters (see project_local).
+            cell_m (float): Cell size; use the largest match distance.
+        """
+        self.points = points
+        self.cell_m = cell_m
+        self._cells = defaultdict(list)
+        for index, (x, y) in enumerate(points):
+            self._cells[self._cell(x, y)].append(index)
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        return math.floor(x / self.cell_m), math.floor(y / self.cell_m)
+
+    def candidates(self, x: float, y: float) -> List[int]:
+        """Indexes of the venues in the 3x3 block of cells around (x, y)."""
+        cx, cy = self._cell(x, y)
+        return [index for dx in (-1, 0, 1) for dy in (-1, 0, 1) for index in self._cells.get((cx + dx, cy + dy), ())]
+
+
+def match_venues(businesses: List, venues: List[dict], max_distance_m: float = 150.0,
+                 min_similarity: float = 0.6, near_distance_m: float = 30.0,
+                 near_similarity: float = 0.4) -> Dict[int, dict]:
+    """
+    Match businesses to Foursquare venues by position and name, one venue per business at most.
+
+    Each business is compared only with the venues in its grid block. A pair qualifies if the
+    venue is within max_distance_m and the names are at least min_similarity alike (or, within
+    near_distance_m, near_similarity alike, since spellings drift between providers). Pairs are
+    then taken best first, so two businesses never claim the same venue.
+
+    Args:
+        businesses (list): Business objects.
+        venues (list): Foursquare venues (results of a Places search).
+        max_distance_m (float): Furthest a venue can be from the business.
+        min_similarity (float): Name similarity needed at any qualifying distance.
+        near_distance_m (float): Distance below which near_similarity is enough.
+        near_similarity (float): Name similarity needed for very close venues.
+
+    Returns:
+        dict: {index in businesses: matched venue}.
+    """
+    positioned = [(venue, position) for venue in venues if (position := venue_position(venue))]
+    if not businesses or not positioned:
+        return {}
+
+    origin = (businesses[0].latitude, businesses[0].longitude)
+    venue_points = project_local([p[0] for _, p in positioned], [p[1] for _, p in positioned], origin)
+    business_points = project_local([b.latitude for b in businesses], [b.longitude for b in businesses], origin)
+    grid = VenueGrid(venue_points, max_distance_m)
+    venue_names = [normalize_name(venue.get("name")) for venue, _ in positioned]
+
+    pairs = []
+    for i, (business, (x, y)) in enumerate(zip(businesses, business_points)):
+        name = normalize_name(business.name)
+        for j in grid.candidates(x, y):
+            distance = math.hypot(venue_points[j][0] - x, venue_points[j][1] - y)
+            if distance > max_distance_m:
+                continue
+            similarity = name_similarity(name, venue_names[j])
+            if similarity >= min_similarity or (distance <= near_distance_m and similarity >= near_similarity):
+                # Names decide; distance breaks near-ties
+                pairs.append((similarity - 0.2 * distance / max_distance_m, i, j))
+
+    matches, used = {}, set()
+    for _, i, j in sorted(pairs, reverse=True):
+        if i not in matches and j not in used:
+            matches[i] = positioned[j][0]
+            used.add(j)
+    return matches
@@ -1,5 +1,123 @@
-from core.gui_manager import GUIManager
+import argparse
+import sys
+import time
+
+
+def run_batch(argv: list) -> int:
+    """
+    Headless sweep: `python main.py batch locations.csv --categories hotel clinic -o results.jsonl`.
+
+    Args:
+        argv (list): Command-line arguments after "batch".
+
+    Returns:
+        int: Exit code (1 if any task failed).
+    """
+    # Imported here so the GUI path does not pay for it (and the batch path never imports Streamlit)
+    from config.config import get_config
+    from core.batch import BatchRunner, read_tasks
+
+    parser = argparse.ArgumentParser(prog="main.py batch", description="Run location x category searches without the GUI.")
+    parser.add_argument("input", help="CSV or JSONL with a location (or lat/lon) and optional category/categories per row")
+    parser.add_argument("-c", "--categories", nargs="*", default=[], help="Categories to search at every location")
+    parser.add_argument("-o", "--output", default="batch_results.jsonl", help="Output file (.jsonl or .csv), appended to")
+    parser.add_argument("--checkpoint", help="Checkpoint file for resuming (default: <output>.checkpoint)")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="Searches running at the same time")
+    parser.add_argument("--radius", type=int, help="Search radius in meters")
+    parser.add_argument("--max-results", type=int, help="Businesses per search")
+    parser.add_argument("--no-ratings", action="store_true", help="Skip Foursquare rating enrichment")
+    args = parser.parse_args(argv)
+
+    tasks = read_tasks(args.input, args.categories)
+    if not tasks:
+        print("No tasks found in the input.")
+        return 1
+
+    config = get_config()
+    runner = BatchRunner(
+        config.get_api_key("geoapify"),
+        config.foursquare_key,
+        workers=args.workers,
+        radius=args.radius,
+        max_results=args.max_results,
+        ratings=not args.no_ratings
+    )
+    stats = runner.run(tasks, args.output, args.checkpoint or f"{args.output}.checkpoint")
+    print(f"Done: {stats['completed']} completed, {stats['failed']} failed, {stats['skipped']} skipped "
+          f"(already done), {stats['businesses']} businesses written to {args.output}")
+    return 1 if stats["failed"] else 0
+
+
+def run_import_poi(argv: list) -> int:
+    """
+    Offline POI index: `python main.py import-poi abuja.osm --region abuja` loads an extract.
+
+    Args:
+        argv (list): Command-line arguments after "import-poi".
+
+    Returns:
+        int: Exit code (1 if nothing was imported).
+    """
+    from config.config import get_config
+    from core.poi_index import POIIndex
+
+    parser = argparse.ArgumentParser(prog="main.py import-poi",
+                                     description="Import an OSM XML or GeoJSON extract into the offline POI index.")
+    parser.add_argument("extracts", nargs="+", help=".osm or .geojson files")
+    parser.add_argument("--region", help="Region name (default: the file name)")
+    parser.add_argument("--index", default=get_config().poi_index_path, help="Index file (default: POI_INDEX)")
+    args = parser.parse_args(argv)
+
+    index = POIIndex(args.index)
+    total = 0
+    for path in args.extracts:
+        start = time.perf_counter()
+        count = index.import_file(path, args.region if len(args.extracts) == 1 else None)
+        total += count
+        print(f"{path}: {count} POIs in {time.perf_counter() - start:.1f}s")
+    stats = index.stats()
+    index.close()
+    print(f"{args.index}: {stats['pois']} POIs in {len(stats['regions'])} region(s). "
+          f"Search it with PLACES_BACKEND=local (offline only) or auto.")
+    return 0 if total else 1
+
+
+def run_profile(argv: list) -> int:
+    """
+    Startup profile: `python main.py profile-startup` reports import and initialization cost.
+
+    Args:
+        argv (list): Command-line arguments after "profile-startup".
+
+    Returns:
+        int: Exit code.
+    """
+    from config.profiling import format_report, profile_startup
+
+    parser = argparse.ArgumentParser(prog="main.py profile-startup", description="Report app import and init cost.")
+    parser.add_argument("--top", type=int, default=15, help="Packages and modules to list")
+    args = parser.parse_args(argv)
+
+    print(format_report(profile_startup(top=args.top)))
+    return 0
+
 
 if __name__ == "__main__":
-    app = GUIManager()
-    app.run_app()
\ No newline at end of file
+    if len(sys.argv) > 1 and sys.argv[1] == "batch":
+        sys.exit(run_batch(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "import-poi":
+        sys.exit(run_import_poi(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "profile-startup":
+        sys.exit(run_profile(sys.argv[2:]))
+
+    # Streamlit re-executes this script on every interaction; the imported modules and the
+    # GUI manager (with its config, finder and thread pools) are built once per process
+    first_run = "core.gui_manager" not in sys.modules
+    start = time.perf_counter()
+    from core.gui_manager import get_gui_manager
+
+    app = get_gui_manager()
+    if first_run:
+        from config.metrics import get_metrics
+        get_metrics().observe_stage("startup", time.perf_counter() - start)
+    app.run_app()